@@ -1,15 +1,31 @@
 # app.py
 from src.utils.pdf_exporter import generate_portfolio_pdf
-from src.models.vector_store import build_vector_store_from_docs
+from src.models.vector_store import build_vector_store_from_dataframe
 from src.models.llm_chain import get_llm_chain
+from src.scrapers.fetch_engine import fetch_sources
+from src.scrapers.coinmarketcap import CoinMarketCapScraper
+from src.scrapers.coingecko import CoinGeckoScraper
+from src.scrapers.cryptocompare import CryptoCompareScraper
+from src.scrapers.blog_crawler import BlogCrawler
+from src.scrapers.blog_scrapers import crawl_binance_blog, crawl_kraken_blog, scrape_binance_blog, scrape_kraken_blog
+from src.analysis.sentiment import SentimentCache, SentimentScorer
+from src.scrapers.columnar import MARKET_SCHEMA, rows_to_table
+from src.scrapers.live_quotes import LiveQuoteFeed
+from src.analysis.market_analyzer import MarketAnalyzer
+from src.analysis.trend_aggregator import TrendAggregator
+from src.analysis.reconciliation import AssetIndex, DEFAULT_ASSET_INDEX_PATH
+from src.storage.snapshot_store import SnapshotStore
+from src.utils.data_processing import write_session_snapshot
 from langchain_community.vectorstores import FAISS
 import streamlit as st
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import requests
 from bs4 import BeautifulSoup
 import time
 import random
+import uuid
 from langchain.chains import LLMChain
 from langchain_community.embeddings import OpenAIEmbeddings  # ✅ (only if used elsewhere)
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -33,6 +49,16 @@ if 'crypto_data' not in st.session_state:
     st.session_state.crypto_data = None
 if 'analysis_results' not in st.session_state:
     st.session_state.analysis_results = None
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if 'market_analyzer' not in st.session_state:
+    # Kept per session so its score cache survives reruns (sidebar changes)
+    st.session_state.market_analyzer = MarketAnalyzer(
+        asset_index=AssetIndex(os.getenv("ASSET_INDEX_PATH", DEFAULT_ASSET_INDEX_PATH))
+    )
+if 'quote_feed' not in st.session_state:
+    st.session_state.quote_feed = None
+    st.session_state.quote_version = 0
 
 # Header
 st.title("Crypto Investment Advisor 💰")
@@ -67,10 +93,24 @@ with st.sidebar:
 
     data_refresh = st.button("Refresh Market Data")
 
+    st.divider()
+
+    st.subheader("Live Prices")
+    # SSE ticker feed; prices stream in without re-downloading the market
+    live_feed_url = os.getenv("LIVE_QUOTES_URL")
+    live_prices = st.toggle(
+        "Stream live prices",
+        value=False,
+        disabled=not live_feed_url,
+        help="Set LIVE_QUOTES_URL to a server-sent-events ticker feed to enable"
+    )
+
 
 # Function to scrape crypto data from websites
 def scrape_crypto_data(sources):
-    combined_data = []
+    tables = []
+    # Tables recorded from the providers (sample rows are not kept as snapshots)
+    scraped_tables = []
     
     st.info("Collecting crypto market data... This may take a moment.")
     progress_bar = st.progress(0)
@@ -78,37 +118,48 @@ def scrape_crypto_data(sources):
     # Add a placeholder for scraped data
     data_placeholder = st.empty()
     
-    for i, source in enumerate(sources):
+    # Query every selected source concurrently; results arrive in completion order
+    fetchers = {source: SOURCE_FETCHERS[source] for source in sources if source in SOURCE_FETCHERS}
+    
+    for i, (source, data, error) in enumerate(fetch_sources(fetchers, timeout=SOURCE_TIMEOUT, timeouts=SOURCE_TIMEOUTS)):
         # Update progress bar
-        progress = (i + 1) / len(sources)
+        progress = (i + 1) / len(fetchers)
         progress_bar.progress(progress)
         
-        # In a real app, we would scrape actual websites
-        # For demo purposes, we're using simulated data
-        if source == "CoinMarketCap":
-            data = simulate_coinmarketcap_data()
-        elif source == "CoinGecko":
-            data = simulate_coingecko_data()
-        elif source == "CryptoCompare":
-            data = simulate_cryptocompare_data()
-        elif source == "Binance Blog":
-            data = simulate_binance_blog_data()
-        elif source == "Kraken Blog":
-            data = simulate_kraken_blog_data()
-        
-        combined_data.extend(data)
+        if error is None:
+            # Market sources return MARKET_SCHEMA tables; blog sources return records
+            table = data if isinstance(data, pa.Table) else pa.Table.from_pylist(data)
+            scraped_tables.append(table)
+        elif SIMULATED_FALLBACK and source in SIMULATED_SOURCES:
+            st.warning(f"{source} data unavailable ({error}); showing sample data instead")
+            data = SIMULATED_SOURCES[source]()
+            table = data if isinstance(data, pa.Table) else pa.Table.from_pylist(data)
+        else:
+            st.warning(f"{source} data unavailable: {error}")
+            continue
         
-        # Show currently scraped data
-        df = pd.DataFrame(combined_data)
-        data_placeholder.dataframe(df, use_container_width=True)
+        tables.append(table)
         
-        # Simulate scraping delay
-        time.sleep(0.5)
+        # Show currently scraped data; concatenation only references the
+        # existing chunks, so nothing is re-converted per source
+        combined = pa.concat_tables(tables, promote_options="default")
+        data_placeholder.dataframe(combined, use_container_width=True)
     
     progress_bar.empty()
     data_placeholder.empty()
     
-    return pd.DataFrame(combined_data)
+    if not tables:
+        return pd.DataFrame()
+    
+    # Keep market snapshots beyond this session; blog rows have no market schema
+    market_tables = [table for table in scraped_tables if table.schema.equals(MARKET_SCHEMA)]
+    if market_tables:
+        try:
+            SNAPSHOT_STORE.append(pa.concat_tables(market_tables))
+        except Exception as e:
+            st.warning(f"Could not save market snapshot: {e}")
+    
+    return pa.concat_tables(tables, promote_options="default").to_pandas()
 
 # Simulate data from various sources for demo purposes
 def simulate_coinmarketcap_data():
@@ -160,6 +211,81 @@ def simulate_kraken_blog_data():
     ]
     return articles
 
+# Coins requested from each market data provider
+MARKET_COIN_LIMIT = 100
+
+def market_fetcher(source, scrape):
+    """Fetcher for a scraper's table method; an empty table (the scrapers' failure result) raises."""
+    def fetch():
+        table = scrape(MARKET_COIN_LIMIT)
+        if table.num_rows == 0:
+            raise RuntimeError(f"{source} returned no data")
+        return table
+    return fetch
+
+# Blog articles are crawled into the article store (only new or changed
+# pages are downloaded) and scored per coin by the lexicon model
+BLOG_CRAWLER = BlogCrawler()
+SENTIMENT_SCORER = SentimentScorer(cache=SentimentCache())
+
+def blog_fetcher(source, crawl, scrape):
+    """Fetcher that refreshes a blog's stored articles and returns its per-coin sentiment rows."""
+    def fetch():
+        # Failed articles are logged by the crawler; earlier crawls' copies still count
+        crawl(BLOG_CRAWLER)
+        rows = scrape(BLOG_CRAWLER.store, SENTIMENT_SCORER)
+        if not rows:
+            raise RuntimeError(f"No {source} articles mention a known coin")
+        return rows
+    return fetch
+
+# Every source calls the scrapers in src/scrapers (market API keys are optional)
+SOURCE_FETCHERS = {
+    "CoinMarketCap": market_fetcher(
+        "CoinMarketCap", CoinMarketCapScraper(api_key=os.getenv("COINMARKETCAP_API_KEY")).scrape_top_coins_table
+    ),
+    "CoinGecko": market_fetcher(
+        "CoinGecko", CoinGeckoScraper(api_key=os.getenv("COINGECKO_API_KEY")).scrape_top_coins_table
+    ),
+    "CryptoCompare": market_fetcher(
+        "CryptoCompare", CryptoCompareScraper(api_key=os.getenv("CRYPTOCOMPARE_API_KEY")).get_top_coins_table
+    ),
+    "Binance Blog": blog_fetcher("Binance Blog", crawl_binance_blog, scrape_binance_blog),
+    "Kraken Blog": blog_fetcher("Kraken Blog", crawl_kraken_blog, scrape_kraken_blog)
+}
+
+# Sample data shown in place of a source that fails or times out
+SIMULATED_SOURCES = {
+    "CoinMarketCap": lambda: rows_to_table(simulate_coinmarketcap_data()),
+    "CoinGecko": lambda: rows_to_table(simulate_coingecko_data()),
+    "CryptoCompare": lambda: rows_to_table(simulate_cryptocompare_data()),
+    "Binance Blog": simulate_binance_blog_data,
+    "Kraken Blog": simulate_kraken_blog_data
+}
+
+# Set SIMULATED_FALLBACK=0 to only show real provider data
+SIMULATED_FALLBACK = os.getenv("SIMULATED_FALLBACK", "1") != "0"
+
+# Seconds to wait for any single source before showing partial results
+SOURCE_TIMEOUT = 15
+
+# A blog's first crawl downloads every article; later crawls only check for changes
+SOURCE_TIMEOUTS = {"Binance Blog": 60, "Kraken Blog": 60}
+
+# Every scraped market snapshot is appended here (date/source partitioned Parquet)
+SNAPSHOT_STORE = SnapshotStore(os.getenv("SNAPSHOT_PATH", "data/snapshots"))
+
+# When set, the data each session analyzes is saved there as <session id>.arrow
+SESSION_SNAPSHOT_DIR = os.getenv("SESSION_SNAPSHOT_DIR")
+
+def split_sentiment_rows(data):
+    """Split scraped rows into market rows and blog sentiment rows (None without any)."""
+    if 'sentiment' not in data.columns:
+        return data, None
+    is_sentiment = data['sentiment'].notna()
+    sentiment_data = data[is_sentiment]
+    return data[~is_sentiment], (sentiment_data if not sentiment_data.empty else None)
+
 # Function to perform LLM-based analysis on the crypto data
 def analyze_crypto_data(data, investment_amount, risk_tolerance, investment_horizon):
     # Create a text summary of the data
@@ -218,13 +344,12 @@ def analyze_crypto_data(data, investment_amount, risk_tolerance, investment_hori
     # Create a simulated analysis based on the input parameters
     # analysis = simulate_llm_analysis(data, investment_amount, risk_tolerance, investment_horizon)
     
-    # Save data as temp file to feed into vector store
-    temp_path = "data/processed/temp_crypto_data.txt"
-    with open(temp_path, "w") as f:
-        f.write(data.to_string(index=False))
+    # Optionally keep this session's data on disk (one file per session)
+    if SESSION_SNAPSHOT_DIR:
+        write_session_snapshot(data, SESSION_SNAPSHOT_DIR, st.session_state.session_id)
 
-    # Build vector store from document
-    vector_store = build_vector_store_from_docs([temp_path])
+    # Build vector store straight from the rows, one document per coin row
+    vector_store = build_vector_store_from_dataframe(data)
     qa_chain = get_llm_chain(vector_store)
 
     query = f"""
@@ -234,6 +359,13 @@ def analyze_crypto_data(data, investment_amount, risk_tolerance, investment_hori
 
     response = qa_chain.run(query)
 
+    # Portfolio from the market analyzer; its scores are cached per data snapshot,
+    # so re-running with other sidebar options does not rescore the market
+    market_data, sentiment_data = split_sentiment_rows(data)
+    recommendation = st.session_state.market_analyzer.recommend_investments(
+        market_data, investment_amount, risk_tolerance, investment_horizon, sentiment_data
+    )
+
     # Optional: convert to JSON with eval or json.loads
     analysis = {
         "recommendations": [],
@@ -241,6 +373,10 @@ def analyze_crypto_data(data, investment_amount, risk_tolerance, investment_hori
         "risk_assessment": f"Risk profile: {risk_tolerance}.",
         "additional_advice": response
     }
+    if recommendation["status"] == "success":
+        analysis["recommendations"] = recommendation["recommendations"]
+        analysis["market_outlook"] = recommendation["market_outlook"]
+        analysis["risk_assessment"] = recommendation["risk_assessment"]
 
     
     return analysis
@@ -454,11 +590,56 @@ def simulate_llm_analysis(data, investment_amount, risk_tolerance, investment_ho
     
     return analysis
 
+# Start (or restart for a new symbol set) the live quote feed
+def ensure_quote_feed(symbols):
+    params = {"symbols": ",".join(symbols)}
+    feed = st.session_state.quote_feed
+    if feed is not None and feed.params == params and feed.running:
+        return feed
+    stop_quote_feed()
+    st.session_state.quote_feed = LiveQuoteFeed(live_feed_url, params=params).start()
+    st.session_state.quote_version = 0
+    return st.session_state.quote_feed
+
+def stop_quote_feed():
+    if st.session_state.quote_feed is not None:
+        st.session_state.quote_feed.stop()
+        st.session_state.quote_feed = None
+
+def show_price_data():
+    price_data = st.session_state.crypto_data[st.session_state.crypto_data.columns.intersection(['name', 'symbol', 'price', 'market_cap', 'volume_24h', 'change_24h', 'source'])]
+    price_data = price_data.dropna(subset=['price'], how='all')
+    if not price_data.empty:
+        st.dataframe(price_data, use_container_width=True)
+    else:
+        st.info("No price data available from selected sources.")
+
+# Re-renders just the price table every second with the quotes that changed
+@st.fragment(run_every=1.0)
+def show_live_price_data():
+    feed = st.session_state.quote_feed
+    version, quotes = feed.book.changes_since(st.session_state.quote_version)
+    if quotes:
+        st.session_state.crypto_data = st.session_state.market_analyzer.apply_live_quotes(st.session_state.crypto_data, quotes)
+        st.session_state.quote_version = version
+    # Trend statistics follow the quotes incrementally instead of rescanning the table
+    if st.session_state.get('trend_aggregator') is None:
+        st.session_state.trend_aggregator = TrendAggregator.from_frame(st.session_state.crypto_data)
+    elif quotes:
+        st.session_state.trend_aggregator.apply_quotes(quotes)
+    trends = st.session_state.trend_aggregator.summary()
+    st.caption(f"Live: {feed.events} updates received")
+    if trends["status"] == "success" and trends["avg_change_24h"] is not None:
+        st.caption(f"Market {trends['market_sentiment']}: average 24h change {trends['avg_change_24h']:.2f}%, "
+                   f"median {trends['median_change_24h']:.2f}%")
+    show_price_data()
+
 # Main application flow
 if data_refresh or st.session_state.crypto_data is None:
     if sources:
         crypto_data = scrape_crypto_data(sources)
         st.session_state.crypto_data = crypto_data
+        st.session_state.trend_aggregator = None
     else:
         st.warning("Please select at least one data source.")
 
@@ -469,12 +650,12 @@ if st.session_state.crypto_data is not None:
     tab1, tab2 = st.tabs(["Price Data", "News & Sentiment"])
     
     with tab1:
-        price_data = st.session_state.crypto_data[st.session_state.crypto_data.columns.intersection(['name', 'symbol', 'price', 'market_cap', 'volume_24h', 'change_24h', 'source'])]
-        price_data = price_data.dropna(subset=['price'], how='all')
-        if not price_data.empty:
-            st.dataframe(price_data, use_container_width=True)
+        if live_prices and 'symbol' in st.session_state.crypto_data.columns:
+            ensure_quote_feed(sorted(st.session_state.crypto_data['symbol'].dropna().unique()))
+            show_live_price_data()
         else:
-            st.info("No price data available from selected sources.")
+            stop_quote_feed()
+            show_price_data()
     
     with tab2:
         columns = st.session_state.crypto_data.columns
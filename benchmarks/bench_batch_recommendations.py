@@ -0,0 +1,52 @@
+# benchmarks/bench_batch_recommendations.py
+# python -m benchmarks.bench_batch_recommendations --coins 5000 --profiles 1000
+"""
+Compare batch recommendations with one recommend_investments() call per profile.
+
+Profiles cycle through every risk tolerance and horizon with varying
+amounts; both paths are checked to return identical results.
+"""
+import argparse
+import itertools
+import time
+
+import pandas as pd
+
+from src.analysis.market_analyzer import HORIZON_WEIGHTS, RISK_WEIGHTS, MarketAnalyzer
+from tests.test_analysis import random_market
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--coins", type=int, default=5000)
+    parser.add_argument("--sources", type=int, default=3, help="rows per coin")
+    parser.add_argument("--profiles", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    market = random_market(args.coins)
+    data = pd.concat([market] * args.sources, ignore_index=True)
+    combinations = itertools.cycle(itertools.product(RISK_WEIGHTS, HORIZON_WEIGHTS))
+    profiles = [
+        {"investment_amount": 100.0 + 37 * i, "risk_tolerance": risk, "investment_horizon": horizon}
+        for i, (risk, horizon) in zip(range(args.profiles), combinations)
+    ]
+    analyzer = MarketAnalyzer()
+
+    start = time.perf_counter()
+    batch = analyzer.recommend_investments_batch(data, profiles)
+    batch_time = time.perf_counter() - start
+
+    # The per-profile loop is timed on a sample and extrapolated
+    sample = profiles[:min(len(profiles), 100)]
+    start = time.perf_counter()
+    single = [analyzer.recommend_investments(data, **profile) for profile in sample]
+    loop_time = (time.perf_counter() - start) / len(sample) * len(profiles)
+    assert single == batch[:len(sample)]
+
+    print(f"{len(data)} rows ({args.coins} coins), {len(profiles)} profiles")
+    print(f"per-profile calls  {loop_time:8.2f} s  ({len(profiles) / loop_time:8.0f} profiles/s, extrapolated)")
+    print(f"batch              {batch_time:8.2f} s  ({len(profiles) / batch_time:8.0f} profiles/s)")
+
+
+if __name__ == "__main__":
+    main()
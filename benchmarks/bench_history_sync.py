@@ -0,0 +1,55 @@
+# benchmarks/bench_history_sync.py
+# python -m benchmarks.bench_history_sync --symbols 500 --latency 0.05
+"""
+Time the nightly OHLCV sync against the local provider stand-in.
+
+Backfills every symbol once, then runs the incremental sync that a nightly
+job would perform and reports its wall time and request count. Pass
+--plan to apply that CryptoCompare plan's real rate limit budget.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src.scrapers.cryptocompare import CryptoCompareScraper
+from src.scrapers.http_client import HttpClient
+from src.scrapers.rate_limiter import RateLimiter
+from src.storage.history_ingester import HistoryIngester
+from src.storage.ohlcv_store import OHLCVStore
+from tests.stand_in_server import StandInServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency in seconds")
+    parser.add_argument("--backfill-days", type=int, default=365)
+    parser.add_argument("--backfill-hours", type=int, default=24 * 7)
+    parser.add_argument("--plan", choices=["free", "pro"], help="apply this plan's rate limit")
+    args = parser.parse_args(argv)
+
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    with tempfile.TemporaryDirectory() as tmp, StandInServer(latency=args.latency) as server:
+        rate_limiter = None
+        if args.plan:
+            rate_limiter = RateLimiter(state_path=os.path.join(tmp, "rate_limits.sqlite"))
+        client = HttpClient(default_pool_size=args.workers, cache=None, rate_limiter=rate_limiter)
+        scraper = CryptoCompareScraper(api_key="stand-in" if args.plan == "pro" else None, client=client)
+        server.point_scrapers(scraper)
+        ingester = HistoryIngester(scraper, OHLCVStore(os.path.join(tmp, "ohlcv.sqlite")),
+                                   backfill={"day": args.backfill_days, "hour": args.backfill_hours})
+
+        for label in ("backfill", "nightly sync"):
+            requests_before = server.stats["requests"]
+            start = time.perf_counter()
+            written, failures = ingester.sync(symbols, max_workers=args.workers)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<13} {elapsed:7.2f} s  {server.stats['requests'] - requests_before:6d} requests  "
+                  f"{sum(written.values()):8d} candles  {len(failures)} failures")
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
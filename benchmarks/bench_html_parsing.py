@@ -0,0 +1,85 @@
+# benchmarks/bench_html_parsing.py
+# python -m benchmarks.bench_html_parsing
+"""
+Compare HTML parser backends for the CoinGecko and CoinMarketCap web fallbacks.
+
+Each backend runs over the saved pages in tests/fixtures and must produce
+exactly the same rows as the original BeautifulSoup/select_one code path.
+"""
+import os
+import time
+from bs4 import BeautifulSoup
+
+from src.scrapers import coingecko, coinmarketcap
+from src.scrapers.html_parsing import available_backends, extract_table_rows
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures")
+
+PAGES = {
+    "CoinGecko": ("coingecko_coins.html", coingecko.WEB_TABLE_COLUMNS, "sort"),
+    "CoinMarketCap": ("coinmarketcap_home.html", coinmarketcap.WEB_TABLE_COLUMNS, None),
+}
+
+# The per-row CSS queries the scrapers used before the backend switch
+LEGACY_SELECTORS = {
+    "CoinGecko": ("table.sort tbody tr", {
+        "name": "td:nth-child(3) .tw-hidden",
+        "symbol": "td:nth-child(3) .d-lg-inline",
+        "price": "td:nth-child(4) span",
+        "change_24h": "td:nth-child(6) span",
+        "market_cap": "td:nth-child(7) span",
+        "volume_24h": "td:nth-child(8) span",
+    }),
+    "CoinMarketCap": ("table tbody tr", {
+        "name": ".cmc-link",
+        "symbol": ".coin-item-symbol",
+        "price": "td:nth-child(4)",
+        "change_24h": "td:nth-child(5)",
+        "market_cap": "td:nth-child(7)",
+        "volume_24h": "td:nth-child(8)",
+    }),
+}
+
+
+def legacy_extract(html, page):
+    """Reference implementation: html.parser plus one select_one per column."""
+    row_selector, selectors = LEGACY_SELECTORS[page]
+    rows = []
+    for row in BeautifulSoup(html, "html.parser").select(row_selector):
+        values = {}
+        for field, selector in selectors.items():
+            elem = row.select_one(selector)
+            values[field] = elem.text.strip() if elem is not None else None
+        rows.append(values)
+    return rows
+
+
+def best_time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(repeat=5):
+    for page, (filename, columns, table_class) in PAGES.items():
+        with open(os.path.join(FIXTURES_DIR, filename), encoding="utf-8") as f:
+            html = f.read()
+
+        expected = legacy_extract(html, page)
+        baseline = best_time(lambda: legacy_extract(html, page), repeat)
+        print(f"\n{page} ({len(expected)} rows)")
+        print(f"  {'legacy select_one':<20} {baseline * 1000:8.2f} ms")
+
+        for backend in available_backends():
+            rows = extract_table_rows(html, columns, table_class=table_class, backend=backend)
+            if rows != expected:
+                raise AssertionError(f"{backend} output differs from the legacy parser on {filename}")
+            elapsed = best_time(lambda: extract_table_rows(html, columns, table_class=table_class, backend=backend), repeat)
+            print(f"  {backend:<20} {elapsed * 1000:8.2f} ms  ({baseline / elapsed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
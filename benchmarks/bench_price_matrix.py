@@ -0,0 +1,59 @@
+# benchmarks/bench_price_matrix.py
+# python -m benchmarks.bench_price_matrix --coins 5000 --days 2000
+"""
+Time universe-wide analytics on a memory-mapped price matrix.
+
+Writes a synthetic [coin x day] random-walk matrix, reopens it read-only
+and times a window slice, realized volatility, max drawdown, a 30-day
+rolling volatility and a 500-coin correlation matrix.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.analysis.price_analytics import correlation_matrix, log_returns, max_drawdown, realized_volatility, \
+    rolling_volatility
+from src.storage.price_matrix import PriceMatrix
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--coins", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        symbols = [f"SYM{i}" for i in range(args.coins)]
+        matrix = PriceMatrix.create(os.path.join(tmp, "day"), symbols, 1_500_000_000, 86400, args.days, ["close"])
+        close = matrix.field("close")
+        for start in range(0, args.coins, 1000):
+            block = np.exp(np.cumsum(rng.normal(0, 0.04, (min(1000, args.coins - start), args.days)), axis=1))
+            # Coins listed at different times
+            block[np.arange(args.days) < rng.integers(0, args.days // 2, len(block))[:, None]] = np.nan
+            close[start:start + len(block)] = block
+        matrix.flush()
+        del matrix, close
+        print(f"{args.coins} coins x {args.days} days = {args.coins * args.days * 4 / 2**20:.0f} MiB float32")
+
+        matrix = timed("open", lambda: PriceMatrix(os.path.join(tmp, "day")))
+        last_year = timed("slice last 365 days", lambda: matrix.window("close", start=matrix.times[-365]))
+        timed("realized volatility (all)", lambda: realized_volatility(matrix.field("close")))
+        timed("realized volatility (1y)", lambda: realized_volatility(last_year))
+        timed("max drawdown (all)", lambda: max_drawdown(matrix.field("close")))
+        timed("rolling 30d vol (1000 coins)", lambda: rolling_volatility(last_year[:1000], 30))
+        timed("correlation (500 coins, 1y)", lambda: correlation_matrix(log_returns(last_year[:500])))
+
+
+if __name__ == "__main__":
+    main()
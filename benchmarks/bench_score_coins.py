@@ -0,0 +1,44 @@
+# benchmarks/bench_score_coins.py
+# python -m benchmarks.bench_score_coins --rows 1000 10000 50000
+"""
+Compare MarketAnalyzer's array scoring against the original row-wise scoring.
+
+Both run on the same synthetic universe; the scores are checked to be
+identical before the timings are printed.
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from src.analysis.market_analyzer import MarketAnalyzer
+from tests.test_analysis import random_market, reference_score_coins, score_frame
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    analyzer = MarketAnalyzer()
+    print(f"{'rows':>8} {'row-wise':>10} {'vectorized':>11} {'speedup':>8}")
+    for rows in args.rows:
+        data = random_market(rows)
+        old, expected = best_of(lambda: reference_score_coins(data, "Low", "Medium-term (3-12 months)"), args.repeat)
+        new, scored = best_of(lambda: score_frame(analyzer, data, "Low", "Medium-term (3-12 months)"), args.repeat)
+        pd.testing.assert_frame_equal(scored, expected, check_exact=True)
+        print(f"{rows:8d} {old * 1000:8.1f}ms {new * 1000:9.1f}ms {old / new:7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
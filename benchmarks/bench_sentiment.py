@@ -0,0 +1,51 @@
+# benchmarks/bench_sentiment.py
+# python -m benchmarks.bench_sentiment --articles 10000
+"""
+Measure sentiment scoring throughput on a synthetic article backlog.
+
+Articles are shuffled sentences of the stand-in blog posts, about 600 words
+each. Reports a cold pass (everything scored) and a warm pass (everything
+served from the cache by article hash).
+"""
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+
+from src.analysis.sentiment import SentimentCache, SentimentScorer
+from tests.stand_in_server import BLOG_POSTS
+
+
+def make_articles(count, sentences_per_article, seed=7):
+    sentences = [s for _, _, _, text in BLOG_POSTS for s in re.split(r"(?<=\.)\s+", text)]
+    rng = random.Random(seed)
+    return [
+        {"source": "Benchmark", "text": " ".join(rng.choices(sentences, k=sentences_per_article))}
+        for _ in range(count)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--sentences", type=int, default=30, help="sentences per article")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    articles = make_articles(args.articles, args.sentences)
+    words = sum(len(article["text"].split()) for article in articles)
+    with tempfile.TemporaryDirectory() as tmp:
+        scorer = SentimentScorer(cache=SentimentCache(os.path.join(tmp, "sentiment.sqlite")),
+                                 batch_size=args.batch_size)
+        for label in ("cold", "cached"):
+            start = time.perf_counter()
+            rows = scorer.coin_sentiment(articles)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<7} {elapsed:7.2f} s  {len(articles) / elapsed:9.0f} articles/s  "
+                  f"{words / elapsed / 1e6:6.2f} M words/s  {len(rows)} coin rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_top_k.py
+# python -m benchmarks.bench_top_k --rows 1000 10000 100000
+"""
+Compare top_k_indices against the pandas nlargest / nsmallest path.
+
+Times the three selections the analyzer makes: the top 10 scores of a
+profile and the top / bottom 5 24h changes with their name and symbol.
+Both paths are checked to select the same rows.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.analysis.market_analyzer import MarketAnalyzer
+from src.analysis.ranking import top_k_indices
+from tests.test_analysis import random_market, score_frame
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def pandas_path(scored):
+    top_coins = scored.nlargest(10, 'score')
+    gainers = scored.nlargest(5, 'change_24h')[['name', 'symbol', 'change_24h']]
+    losers = scored.nsmallest(5, 'change_24h')[['name', 'symbol', 'change_24h']]
+    return top_coins.index, gainers.index, losers.index
+
+
+def array_path(scored, scores, changes):
+    top_coins = top_k_indices(scores, 10)
+    gainers = scored.iloc[top_k_indices(changes, 5)][['name', 'symbol', 'change_24h']]
+    losers = scored.iloc[top_k_indices(changes, 5, largest=False)][['name', 'symbol', 'change_24h']]
+    return scored.index[top_coins], gainers.index, losers.index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    analyzer = MarketAnalyzer()
+    print(f"{'rows':>8} {'pandas':>10} {'argpartition':>13} {'speedup':>8}")
+    for rows in args.rows:
+        scored = score_frame(analyzer, random_market(rows), "Medium", "Medium-term (3-12 months)")
+        old, expected = best_of(lambda: pandas_path(scored), args.repeat)
+        # The analyzer holds the score and change arrays already
+        scores = scored['score'].to_numpy()
+        changes = scored['change_24h'].to_numpy()
+        new, selected = best_of(lambda: array_path(scored, scores, changes), args.repeat)
+        for got, want in zip(selected, expected):
+            np.testing.assert_array_equal(got, want)
+        print(f"{rows:8d} {old * 1000:8.2f}ms {new * 1000:11.2f}ms {old / new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/load_test.py
+# python -m benchmarks.load_test --calls 200 --concurrency 8 --latency 0.02 --error-rate 0.05
+"""
+Load-test the market scrapers against the local provider stand-in.
+
+Every call goes through a real HttpClient (pooling and retries enabled,
+response cache off) to tests/stand_in_server.py, which replays the recorded
+fixtures with the requested latency and fault injection. Reports throughput
+and p50/p99 call latency per scraper.
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.scrapers.coingecko import CoinGeckoScraper
+from src.scrapers.coinmarketcap import CoinMarketCapScraper
+from src.scrapers.cryptocompare import CryptoCompareScraper
+from src.scrapers.http_client import HttpClient
+from src.scrapers.rate_limiter import PROVIDER_LIMITS, RateLimiter
+from tests.stand_in_server import StandInServer
+
+SCENARIOS = {
+    "coingecko": lambda client: (CoinGeckoScraper(client=client), "scrape_top_coins"),
+    "coingecko-table": lambda client: (CoinGeckoScraper(client=client), "scrape_top_coins_table"),
+    "coinmarketcap": lambda client: (CoinMarketCapScraper(api_key="stand-in", client=client), "scrape_top_coins"),
+    "coinmarketcap-web": lambda client: (CoinMarketCapScraper(client=client), "scrape_top_coins"),
+    "cryptocompare": lambda client: (CryptoCompareScraper(client=client), "get_top_coins"),
+}
+
+
+def run_scenario(server, name, calls, concurrency, limit, rate_limited, backoff_factor):
+    with tempfile.TemporaryDirectory() as state_dir:
+        # Provider budgets are far below what a load test needs, so unless
+        # --rate-limited is given the buckets never run dry and the limiter
+        # only reacts to 429 replies
+        limits = None if rate_limited else {
+            provider: {plan: (1e9, 1e9) for plan in plans} for provider, plans in PROVIDER_LIMITS.items()
+        }
+        rate_limiter = RateLimiter(state_path=os.path.join(state_dir, "rate_limits.sqlite"), limits=limits)
+        client = HttpClient(default_pool_size=concurrency, backoff_factor=backoff_factor,
+                            rate_limiter=rate_limiter, cache=None)
+        scraper, method = SCENARIOS[name](client)
+        server.point_scrapers(scraper)
+        fetch = getattr(scraper, method)
+
+        def timed_call(_):
+            start = time.perf_counter()
+            result = fetch(limit)
+            return time.perf_counter() - start, len(result) if result is not None else 0
+
+        requests_before = server.stats["requests"]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(timed_call, range(calls)))
+        elapsed = time.perf_counter() - start
+        client.close()
+
+    latencies = np.array([latency for latency, _ in results])
+    empty = sum(1 for _, count in results if count == 0)
+    return {
+        "calls": calls,
+        "throughput": calls / elapsed,
+        "p50_ms": np.percentile(latencies, 50) * 1000,
+        "p99_ms": np.percentile(latencies, 99) * 1000,
+        "http_requests": server.stats["requests"] - requests_before,
+        "empty_results": empty,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--calls", type=int, default=200, help="scraper calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=100, help="coins requested per call")
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP 500 replies")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of HTTP 429 replies")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--backoff-factor", type=float, default=0.05)
+    parser.add_argument("--rate-limited", action="store_true", help="apply the real provider budgets")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with StandInServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                       rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, seed=args.seed) as server:
+        print(f"{'scenario':<20} {'calls/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'http reqs':>10} {'empty':>6}")
+        for name in args.scenarios:
+            report = run_scenario(server, name, args.calls, args.concurrency, args.limit,
+                                  args.rate_limited, args.backoff_factor)
+            print(f"{name:<20} {report['throughput']:9.1f} {report['p50_ms']:9.2f} {report['p99_ms']:9.2f} "
+                  f"{report['http_requests']:10d} {report['empty_results']:6d}")
+        injected = {str(code): server.stats[code] for code in (429, 500) if server.stats[code]}
+        if injected:
+            print(f"\ninjected faults: {injected}")
+
+
+if __name__ == "__main__":
+    main()
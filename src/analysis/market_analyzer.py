@@ -1,19 +1,207 @@
 # src/analysis/market_analyzer.py
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Tuple, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterable, Sequence, Tuple, Optional
+import hashlib
 import logging
+import threading
+import warnings
+
+from .ranking import top_k_indices
+from .reconciliation import AssetIndex, reconcile_sources
 
 logger = logging.getLogger(__name__)
 
+# Weight of the market cap score per risk tolerance (larger coins favored at low risk)
+RISK_WEIGHTS = {
+    "Very Low": 3.0,
+    "Low": 2.0,
+    "Medium": 1.0,
+    "High": 0.5,
+    "Very High": 0.2
+}
+
+# Weight of the 24h change score per investment horizon
+HORIZON_WEIGHTS = {
+    "Short-term (0-3 months)": 2.0,
+    "Medium-term (3-12 months)": 1.0,
+    "Long-term (1+ years)": 0.5
+}
+
+# Score multipliers by coin name: ({risk tolerance: multiplier}, multiplier for other risk tolerances)
+COIN_BIAS = {
+    "Bitcoin": ({"Very Low": 1.5, "Low": 1.5}, 0.8),
+    "Ethereum": ({"Low": 1.3, "Medium": 1.3}, 0.9),
+}
+
+# Market snapshots whose precomputed score grid is kept (least recently used dropped first)
+SCORE_CACHE_SIZE = 8
+
+# Recommendations draw on the top coins of a ranking
+TOP_COINS = 10
+
+# Entries per recommendation
+RECOMMENDED_COINS = 3
+
+# Base risk of a coin (1 = very low .. 5 = very high); other coins are mid-caps / new projects
+CONSERVATIVE_COINS = ("Bitcoin", "Ethereum")
+AGGRESSIVE_COINS = ("Dogecoin", "Shiba Inu", "Pepe")
+BASE_RISK = {"conservative": 1, "other": 2, "aggressive": 4}
+
+# Shift of a coin's base risk per user risk tolerance (unknown tolerances shift by 1)
+RISK_OFFSETS = {
+    "Very Low": -1,
+    "Low": 0,
+    "Medium": 1,
+    "High": 2,
+    "Very High": 3
+}
+
+RISK_LABELS = {
+    1: "Very Low",
+    2: "Low",
+    3: "Medium",
+    4: "High",
+    5: "Very High"
+}
+
+# Holding period by investment horizon: ({risk tolerance: period}, period for other risk tolerances)
+HOLDING_PERIODS = {
+    "Short-term (0-3 months)": ({"Low": "1-3 months", "Medium": "1-3 months"}, "2-6 weeks"),
+    "Medium-term (3-12 months)": ({"Very Low": "6-9 months", "Low": "6-9 months", "Medium": "4-6 months"}, "3-5 months"),
+    "Long-term (1+ years)": ({"Medium": "1-2 years", "High": "1-2 years"}, "2-3 years")
+}
+
+# CONSERVATIVE_COINS are held for the long run on a long horizon, whatever the risk tolerance
+CONSERVATIVE_HOLDING_PERIODS = {**HOLDING_PERIODS, "Long-term (1+ years)": ({}, "2+ years")}
+
+DEFAULT_HOLDING_PERIOD = "6 months (default)"
+
+# Potential return range by coin risk level and investment horizon
+POTENTIAL_RETURNS = {
+    "Very Low": {
+        "Short-term (0-3 months)": "2-5%",
+        "Medium-term (3-12 months)": "5-10%",
+        "Long-term (1+ years)": "10-20%"
+    },
+    "Low": {
+        "Short-term (0-3 months)": "3-7%",
+        "Medium-term (3-12 months)": "7-15%",
+        "Long-term (1+ years)": "15-30%"
+    },
+    "Medium": {
+        "Short-term (0-3 months)": "5-15%",
+        "Medium-term (3-12 months)": "10-25%",
+        "Long-term (1+ years)": "25-50%"
+    },
+    "High": {
+        "Short-term (0-3 months)": "10-25%",
+        "Medium-term (3-12 months)": "20-50%",
+        "Long-term (1+ years)": "40-80%"
+    },
+    "Very High": {
+        "Short-term (0-3 months)": "15-40%",
+        "Medium-term (3-12 months)": "30-70%",
+        "Long-term (1+ years)": "60-150%"
+    }
+}
+
+RISK_ASSESSMENTS = {
+    "Very Low": (
+        "You prefer minimal risk and capital preservation. "
+        "The portfolio emphasizes large-cap, stable assets like Bitcoin and Ethereum."
+    ),
+    "Low": (
+        "You are cautious but open to moderate growth. "
+        "The portfolio contains a balance of stability and carefully selected growth assets."
+    ),
+    "Medium": (
+        "You have a balanced risk appetite. "
+        "This portfolio mixes well-established coins with mid-cap options for better upside."
+    ),
+    "High": (
+        "You're comfortable with volatility and seeking higher returns. "
+        "This portfolio includes emerging coins with strong potential."
+    ),
+    "Very High": (
+        "You are aggressive and aiming for maximum returns. "
+        "The portfolio leans into high-risk, high-reward assets with growth upside."
+    )
+}
+
+ADDITIONAL_ADVICE = (
+    "Remember to practice proper risk management by not investing more than you can afford to lose. "
+    "Consider dollar-cost averaging instead of lump-sum investing to reduce timing risk. "
+    "Regularly review your portfolio and adjust allocations as market conditions change."
+)
+
+# Rationale sentences by market cap bucket (none, > $100B, > $10B, other),
+# 24h change bucket (none, > 5%, < -5%, other) and whether the score is above 2
+RATIONALE_MARKET_CAP = (
+    None,
+    "It has a very large market capitalization, indicating stability and broad adoption.",
+    "It has a solid market cap, making it relatively stable in the market.",
+    "It is a mid-cap coin, which may offer growth potential but with more volatility."
+)
+RATIONALE_CHANGE = (
+    None,
+    "The asset showed strong recent gains in the last 24 hours.",
+    "The asset had a recent dip, which could present a buying opportunity.",
+    "The asset had modest price movement recently, suggesting relative stability."
+)
+RATIONALE_SCORE = (None, "Its overall analysis score suggests a favorable investment outlook.")
+
+# Everything after the opening sentence, for every combination of the buckets above
+RATIONALE_SUFFIXES = np.array([
+    [[
+        "".join(" " + part for part in (cap, change, score) if part)
+        for score in RATIONALE_SCORE
+    ] for change in RATIONALE_CHANGE]
+    for cap in RATIONALE_MARKET_CAP
+], dtype=object)
+
+def market_sentiment(avg_change_24h: Optional[float]) -> str:
+    """Label the market from the average 24h change of its coins."""
+    if avg_change_24h is None:
+        return "neutral"
+    if avg_change_24h > 3:
+        return "strongly bullish"
+    elif avg_change_24h > 0:
+        return "mildly bullish"
+    elif avg_change_24h > -3:
+        return "mildly bearish"
+    else:
+        return "strongly bearish"
+
 class MarketAnalyzer:
     """
     Analyzes cryptocurrency market data to identify investment opportunities.
     """
     
-    def __init__(self):
-        """Initialize the market analyzer."""
-        pass
+    def __init__(
+        self,
+        coin_bias: Optional[Dict[str, Tuple[Dict[str, float], float]]] = None,
+        cache_size: int = SCORE_CACHE_SIZE,
+        asset_index: Optional[AssetIndex] = None
+    ):
+        """
+        Initialize the market analyzer.
+
+        Args:
+            coin_bias: Score multipliers by coin name (defaults to COIN_BIAS)
+            cache_size: Number of market snapshots whose score grid is cached
+                (0 disables the cache)
+            asset_index: Index merging provider symbols and names into assets
+                (defaults to an in-memory index of the known coins)
+        """
+        self.coin_bias = COIN_BIAS if coin_bias is None else coin_bias
+        self.asset_index = AssetIndex(path=None) if asset_index is None else asset_index
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._score_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def analyze_market_trends(self, data: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -49,22 +237,14 @@ class MarketAnalyzer:
                 positive_ratio = None
             
             # Determine market sentiment
-            if avg_change_24h is not None:
-                if avg_change_24h > 3:
-                    sentiment = "strongly bullish"
-                elif avg_change_24h > 0:
-                    sentiment = "mildly bullish"
-                elif avg_change_24h > -3:
-                    sentiment = "mildly bearish"
-                else:
-                    sentiment = "strongly bearish"
-            else:
-                sentiment = "neutral"
+            sentiment = market_sentiment(avg_change_24h)
             
             # Identify top gainers and losers
             if 'change_24h' in data.columns:
-                top_gainers = data.nlargest(5, 'change_24h')[['name', 'symbol', 'change_24h']]
-                top_losers = data.nsmallest(5, 'change_24h')[['name', 'symbol', 'change_24h']]
+                # Only the selected rows are copied
+                changes = data['change_24h'].to_numpy(dtype=np.float64, na_value=np.nan)
+                top_gainers = data.iloc[top_k_indices(changes, 5)][['name', 'symbol', 'change_24h']]
+                top_losers = data.iloc[top_k_indices(changes, 5, largest=False)][['name', 'symbol', 'change_24h']]
             else:
                 top_gainers = pd.DataFrame()
                 top_losers = pd.DataFrame()
@@ -89,8 +269,38 @@ class MarketAnalyzer:
             logger.error(f"Error analyzing market trends: {e}")
             return {"status": "error", "message": str(e)}
     
+    def apply_live_quotes(self, data: pd.DataFrame, quotes: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Overlay streamed quote updates on a market snapshot.
+
+        Only rows that already carry a value for a field are updated, so
+        sentiment-only rows from blog sources stay price-less.
+
+        Args:
+            data: DataFrame containing cryptocurrency market data
+            quotes: Latest quotes keyed by symbol (e.g. QuoteBook.changes_since)
+
+        Returns:
+            Updated copy of the data
+        """
+        if data.empty or not quotes or 'symbol' not in data.columns:
+            return data
+
+        live = pd.DataFrame.from_dict(quotes, orient='index')
+        updated = data.copy()
+        symbols = updated['symbol'].str.upper()
+
+        for field in ('price', 'change_24h', 'volume_24h'):
+            if field not in live.columns or field not in updated.columns:
+                continue
+            values = symbols.map(live[field])
+            mask = values.notna() & updated[field].notna()
+            updated.loc[mask, field] = values[mask]
+
+        return updated
+
     def recommend_investments(
-        self, 
+        self,
         data: pd.DataFrame, 
         investment_amount: float,
         risk_tolerance: str,
@@ -115,354 +325,484 @@ class MarketAnalyzer:
             if data.empty:
                 return {"status": "error", "message": "No data available for recommendations"}
             
-            # Remove duplicates by taking the mean of metrics for each coin
-            if 'name' in data.columns:
-                # Group by coin name and aggregate
-                grouped_data = data.groupby('name').agg({
-                    'symbol': 'first',
-                    'price': 'mean',
-                    'market_cap': 'mean',
-                    'volume_24h': 'mean',
-                    'change_24h': 'mean'
-                }).reset_index()
-            else:
-                grouped_data = data.copy()
-            
-            # Score coins based on risk tolerance and investment horizon
-            scored_coins = self._score_coins(grouped_data, risk_tolerance, investment_horizon)
-            
-            # Incorporate sentiment data if available
-            if sentiment_data is not None and not sentiment_data.empty:
-                scored_coins = self._incorporate_sentiment(scored_coins, sentiment_data)
-            
-            # Select top performing coins based on score
-            top_coins = scored_coins.nlargest(10, 'score')
-            
-            # Determine allocation percentages
-            allocations = self._calculate_allocations(top_coins, investment_amount, risk_tolerance)
-            
-            # Generate recommendations
-            recommendations = []
-            for _, row in allocations.iterrows():
-                coin_name = row['name']
-                symbol = row['symbol']
-                allocation_percentage = row['allocation_percentage']
-                allocation_amount = row['allocation_amount']
-                
-                # Generate rationale based on coin attributes
-                rationale = self._generate_rationale(
-                    coin_name, 
-                    row['score'], 
-                    row['market_cap'] if 'market_cap' in row else None,
-                    row['change_24h'] if 'change_24h' in row else None
-                )
-                
-                # Determine holding period based on investment horizon and risk
-                holding_period = self._recommend_holding_period(coin_name, investment_horizon, risk_tolerance)
-                
-                # Determine risk level for this specific coin
-                risk_level = self._determine_coin_risk_level(coin_name, risk_tolerance)
-                
-                # Calculate potential return range
-                potential_return = self._estimate_potential_return(coin_name, risk_level, investment_horizon)
-                
-                recommendation = {
-                    "coin": f"{coin_name} ({symbol})",
-                    "allocation_percentage": allocation_percentage,
-                    "allocation_amount": allocation_amount,
-                    "rationale": rationale,
-                    "holding_period": holding_period,
-                    "risk_level": risk_level,
-                    "potential_return": potential_return
-                }
-                
-                recommendations.append(recommendation)
-            
-            # Generate market outlook based on data
-            market_outlook = self._generate_market_outlook(grouped_data)
-            
-            # Generate risk assessment based on risk tolerance
-            risk_assessment = self._generate_risk_assessment(risk_tolerance)
-            
-            # Generate additional advice
-            additional_advice = (
-                "Remember to practice proper risk management by not investing more than you can afford to lose. "
-                "Consider dollar-cost averaging instead of lump-sum investing to reduce timing risk. "
-                "Regularly review your portfolio and adjust allocations as market conditions change."
-            )
-            
-            # Construct the recommendation result
-            result = {
-                "status": "success",
-                "recommendations": recommendations[:3],  # Limit to top 3
-                "market_outlook": market_outlook,
-                "risk_assessment": risk_assessment,
-                "additional_advice": additional_advice
-            }
-            
-            return result
+            # Scores of every sidebar profile are computed once per snapshot
+            grid = self._score_grid(data, sentiment_data)
+            return self._grid_recommendations(grid, (risk_tolerance, investment_horizon), investment_amount)
             
         except Exception as e:
             logger.error(f"Error generating investment recommendations: {e}")
             return {"status": "error", "message": str(e)}
     
-    def _score_coins(
-        self, 
-        data: pd.DataFrame, 
-        risk_tolerance: str,
-        investment_horizon: str
-    ) -> pd.DataFrame:
-        """Score coins based on various metrics."""
-        if data is None or data.empty:
-            return pd.DataFrame()
-
-        # Create a copy to avoid modifying the original data
-        scored_data = data.copy()
-        scored_data['score'] = 0.0
-
-        # Score based on market cap
-        if 'market_cap' in scored_data.columns:
-            max_market_cap = scored_data['market_cap'].max()
-            scored_data['market_cap_score'] = np.log1p(scored_data['market_cap']) / np.log1p(max_market_cap)
-            risk_weights = {
-                "Very Low": 3.0,
-                "Low": 2.0,
-                "Medium": 1.0,
-                "High": 0.5,
-                "Very High": 0.2
-            }
-            scored_data['score'] += scored_data['market_cap_score'] * risk_weights.get(risk_tolerance, 1.0)
-
-        # Score based on 24h change
-        if 'change_24h' in scored_data.columns:
-            scored_data['change_score'] = ((scored_data['change_24h'] + 10) / 20).clip(0, 1)
-            horizon_weights = {
-                "Short-term (0-3 months)": 2.0,
-                "Medium-term (3-12 months)": 1.0,
-                "Long-term (1+ years)": 0.5
-            }
-            scored_data['score'] += scored_data['change_score'] * horizon_weights.get(investment_horizon, 1.0)
+    def recommend_investments_batch(
+        self,
+        data: pd.DataFrame,
+        profiles: Sequence[Dict[str, Any]],
+        sentiment_data: Optional[pd.DataFrame] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate recommendations for many user profiles against one market snapshot.
 
-        # Score based on volume
-        if 'volume_24h' in scored_data.columns and 'market_cap' in scored_data.columns:
-            scored_data['volume_to_cap'] = scored_data['volume_24h'] / scored_data['market_cap']
-            max_ratio = scored_data['volume_to_cap'].quantile(0.95)
-            scored_data['volume_score'] = (scored_data['volume_to_cap'] / max_ratio).clip(0, 1)
-            scored_data['score'] += scored_data['volume_score'] * 0.5
+        The snapshot's score grid (see _score_grid) is computed at most once,
+        so profiles only differ in how their amounts are split. Each result is
+        identical to what recommend_investments() returns for that profile.
 
-        # Add custom bias for BTC / ETH (optional)
-        def btc_eth_bias(row):
-            if row['name'] == 'Bitcoin':
-                return 1.5 if risk_tolerance in ['Very Low', 'Low'] else 0.8
-            if row['name'] == 'Ethereum':
-                return 1.3 if risk_tolerance in ['Low', 'Medium'] else 0.9
-            return 1.0
+        Args:
+            data: DataFrame containing cryptocurrency market data
+            profiles: Dictionaries with investment_amount, risk_tolerance and
+                investment_horizon
+            sentiment_data: Optional DataFrame with sentiment data
 
-        scored_data['score'] *= scored_data.apply(btc_eth_bias, axis=1)
+        Returns:
+            One recommendation dictionary per profile, in order
+        """
+        try:
+            if data.empty:
+                return [{"status": "error", "message": "No data available for recommendations"} for _ in profiles]
+            if not profiles:
+                return []
+
+            grid = self._score_grid(data, sentiment_data)
+            pairs = [(profile["risk_tolerance"], profile["investment_horizon"]) for profile in profiles]
+            # Profiles sharing a pair share everything but the amounts
+            templates = {pair: self._grid_template(grid, pair) for pair in dict.fromkeys(pairs)}
+        except Exception as e:
+            logger.error(f"Error generating investment recommendations: {e}")
+            return [{"status": "error", "message": str(e)} for _ in profiles]
+
+        results = []
+        for profile, pair in zip(profiles, pairs):
+            try:
+                template = templates[pair]
+                amounts = np.round(template["percentages"] / 100 * profile["investment_amount"], 2)
+                results.append(self._recommendation_result(
+                    self._allocate_entries(template["entries"], template["percentages"], amounts),
+                    grid["market_outlook"],
+                    pair[0]
+                ))
+            except Exception as e:
+                logger.error(f"Error generating investment recommendations: {e}")
+                results.append({"status": "error", "message": str(e)})
+        return results
+
+    def clear_score_cache(self):
+        """Drop all cached score grids."""
+        with self._cache_lock:
+            self._score_cache.clear()
+
+    def _fingerprint(self, data: pd.DataFrame, sentiment_data: Optional[pd.DataFrame] = None) -> Optional[str]:
+        """
+        Content hash of a market snapshot (and its sentiment data).
 
-        return scored_data
+        Returns:
+            Hex digest, or None if the frames hold values that cannot be
+            hashed (such snapshots are scored without caching)
+        """
+        digest = hashlib.sha256()
+        # New aliases can regroup the same rows
+        digest.update(str(self.asset_index.version).encode("utf-8"))
+        try:
+            for frame in (data, sentiment_data):
+                if frame is None:
+                    digest.update(b"\0")
+                    continue
+                digest.update(repr([(column, str(dtype)) for column, dtype in frame.dtypes.items()]).encode("utf-8"))
+                digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+        except TypeError as e:
+            logger.debug(f"Market data cannot be fingerprinted: {e}")
+            return None
+        return digest.hexdigest()
+
+    def _score_grid(self, data: pd.DataFrame, sentiment_data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Return the score grid of a snapshot, from the cache when the data is unchanged.
 
-    def _calculate_allocations(
-        self,
-        top_coins: pd.DataFrame,
-        investment_amount: float,
-        risk_tolerance: str
-    ) -> pd.DataFrame:
+        The cache is keyed by the content fingerprint, so any change to the
+        data (e.g. a live quote) gets a new grid, and holds the cache_size
+        most recently used snapshots.
+        """
+        key = self._fingerprint(data, sentiment_data) if self.cache_size > 0 else None
+        if key is not None:
+            with self._cache_lock:
+                grid = self._score_cache.get(key)
+                if grid is not None:
+                    self._score_cache.move_to_end(key)
+                    self.cache_hits += 1
+                    return grid
+
+        grid = self._build_score_grid(data, sentiment_data)
+        if key is not None:
+            with self._cache_lock:
+                self.cache_misses += 1
+                self._score_cache[key] = grid
+                while len(self._score_cache) > self.cache_size:
+                    self._score_cache.popitem(last=False)
+        return grid
+
+    def _build_score_grid(self, data: pd.DataFrame, sentiment_data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """
-        Allocate investment across top coins based on score proportionally.
+        Score and rank every sidebar profile of a snapshot.
 
-        Args:
-            top_coins: DataFrame with scored coins
-            investment_amount: Total investment in USD
-            risk_tolerance: User risk level (affects weighting logic if needed)
+        The data is grouped and the profile-independent components computed
+        once; the scores of all RISK_WEIGHTS x HORIZON_WEIGHTS pairs are then
+        a single [pair x coin] array operation.
 
         Returns:
-            DataFrame with allocation percentages and USD values
+            Dictionary with the grouped data, its components and sentiment
+            factor, the ranking of each pair, the market outlook and the
+            columns recommendations are built from
         """
-        if top_coins.empty or "score" not in top_coins.columns:
-            return pd.DataFrame()
+        grouped_data = self._group_market_data(data)
+        if grouped_data.empty:
+            raise ValueError("No coins to score")
+
+        components = self._score_components(grouped_data)
+        factor = None
+        if sentiment_data is not None and not sentiment_data.empty:
+            factor = self._sentiment_factor(grouped_data, sentiment_data)
+
+        pairs = [(risk, horizon) for risk in RISK_WEIGHTS for horizon in HORIZON_WEIGHTS]
+        scores = self._profile_scores(
+            grouped_data, components, [risk for risk, _ in pairs], [horizon for _, horizon in pairs]
+        )
+        if factor is not None:
+            scores *= factor
+
+        return {
+            "grouped_data": grouped_data,
+            "components": components,
+            "sentiment_factor": factor,
+            "rankings": {pair: self._rank_scores(pair_scores) for pair, pair_scores in zip(pairs, scores)},
+            # Recommendation templates, filled in per pair on first use
+            "templates": {},
+            "market_outlook": self._generate_market_outlook(grouped_data),
+            "columns": [
+                grouped_data[column].to_numpy() if column in grouped_data.columns else np.full(len(grouped_data), None)
+                for column in ('name', 'symbol', 'market_cap', 'change_24h')
+            ]
+        }
 
-        total_score = top_coins["score"].sum()
-        if total_score == 0:
-            return pd.DataFrame()
+    def _rank_scores(self, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+        """Top coin rows of one profile with their scores and the scores' total."""
+        # Same selection as nlargest(10, 'score'): NaN excluded, ties in row order
+        top = top_k_indices(scores, TOP_COINS)
+        return top, scores[top], scores[top].sum()
+
+    def _grid_ranking(self, grid: Dict[str, Any], pair: Tuple[str, str]) -> Tuple[np.ndarray, np.ndarray, float]:
+        """Ranking of a (risk tolerance, horizon) pair; pairs outside the grid are scored on demand."""
+        ranking = grid["rankings"].get(pair)
+        if ranking is None:
+            scores = self._profile_scores(grid["grouped_data"], grid["components"], [pair[0]], [pair[1]])[0]
+            if grid["sentiment_factor"] is not None:
+                scores *= grid["sentiment_factor"]
+            ranking = self._rank_scores(scores)
+        return ranking
+
+    def _grid_template(self, grid: Dict[str, Any], pair: Tuple[str, str]) -> Dict[str, Any]:
+        """Recommendation template of a (risk tolerance, horizon) pair, kept in the grid for sidebar pairs."""
+        template = grid["templates"].get(pair)
+        if template is None:
+            template = self._recommendation_template(grid, self._grid_ranking(grid, pair), *pair)
+            if pair in grid["rankings"]:
+                grid["templates"][pair] = template
+        return template
+
+    def _recommendation_template(
+        self,
+        grid: Dict[str, Any],
+        ranking: Tuple[np.ndarray, np.ndarray, float],
+        risk_tolerance: str,
+        investment_horizon: str
+    ) -> Dict[str, Any]:
+        """
+        Everything about a profile's recommendations except the amounts.
 
-        top_coins["allocation_percentage"] = (top_coins["score"] / total_score * 100).round(2)
-        top_coins["allocation_amount"] = (top_coins["allocation_percentage"] / 100 * investment_amount).round(2)
-        
-        return top_coins
+        Returns:
+            Dictionary with the recommendation entries (no allocation yet)
+            and their allocation percentages
+        """
+        top, top_scores, total_score = ranking
+        if not len(top) or total_score == 0:
+            return {"entries": [], "percentages": np.empty(0)}
+
+        top, top_scores = top[:RECOMMENDED_COINS], top_scores[:RECOMMENDED_COINS]
+        names, symbols, market_caps, changes = (column[top] for column in grid["columns"])
+        return {
+            "entries": self._assemble_recommendations(
+                names, symbols, market_caps, changes, top_scores, risk_tolerance, investment_horizon
+            ),
+            "percentages": np.round(top_scores / total_score * 100, 2)
+        }
 
-    def _generate_rationale(
+    def _grid_recommendations(
         self,
-        coin_name: str,
-        score: float,
-        market_cap: Optional[float],
-        change_24h: Optional[float]
-    ) -> str:
+        grid: Dict[str, Any],
+        pair: Tuple[str, str],
+        investment_amount: float
+    ) -> Dict[str, Any]:
+        """Allocate an investment for a (risk tolerance, horizon) pair and build the recommendation result."""
+        template = self._grid_template(grid, pair)
+        amounts = np.round(template["percentages"] / 100 * investment_amount, 2)
+        return self._recommendation_result(
+            self._allocate_entries(template["entries"], template["percentages"], amounts),
+            grid["market_outlook"],
+            pair[0]
+        )
+
+    def _allocate_entries(
+        self,
+        entries: List[Dict[str, Any]],
+        percentages: Iterable[float],
+        amounts: Iterable[float]
+    ) -> List[Dict[str, Any]]:
+        """Complete recommendation entries with their allocation percentage and amount."""
+        return [
+            {
+                "coin": entry["coin"],
+                "allocation_percentage": percentage,
+                "allocation_amount": amount,
+                "rationale": entry["rationale"],
+                "holding_period": entry["holding_period"],
+                "risk_level": entry["risk_level"],
+                "potential_return": entry["potential_return"]
+            }
+            for entry, percentage, amount in zip(entries, percentages, amounts)
+        ]
+    
+    def _group_market_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Merge the rows of coins reported by several sources (one row per canonical asset)."""
+        if 'name' in data.columns or 'symbol' in data.columns:
+            # Provider symbols and names are resolved to assets, fresher rows weigh more
+            return reconcile_sources(data, self.asset_index)
+        return data.copy()
+    
+    def _score_components(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
         """
-        Generate a human-readable rationale for why a coin is recommended.
-
-        Args:
-            coin_name: Name of the cryptocurrency
-            score: The score it received during analysis
-            market_cap: Market cap in USD
-            change_24h: 24h change percentage
+        Compute the profile-independent score columns.
 
         Returns:
-            A string explanation
+            Dictionary with market_cap_score, change_score, volume_to_cap and
+            volume_score arrays (only those the available columns allow)
         """
-        rationale_parts = [f"{coin_name} was selected due to its strong performance indicators."]
+        components = {}
+        has_market_cap = 'market_cap' in data.columns
 
-        if market_cap:
-            if market_cap > 1e11:
-                rationale_parts.append("It has a very large market capitalization, indicating stability and broad adoption.")
-            elif market_cap > 1e10:
-                rationale_parts.append("It has a solid market cap, making it relatively stable in the market.")
-            else:
-                rationale_parts.append("It is a mid-cap coin, which may offer growth potential but with more volatility.")
+        with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+            # All-NaN columns yield NaN scores, as the pandas reductions did
+            warnings.simplefilter('ignore', RuntimeWarning)
 
-        if change_24h:
-            if change_24h > 5:
-                rationale_parts.append("The asset showed strong recent gains in the last 24 hours.")
-            elif change_24h < -5:
-                rationale_parts.append("The asset had a recent dip, which could present a buying opportunity.")
-            else:
-                rationale_parts.append("The asset had modest price movement recently, suggesting relative stability.")
+            # Score based on market cap
+            if has_market_cap:
+                market_cap = data['market_cap'].to_numpy(dtype=np.float64)
+                components['market_cap_score'] = np.log1p(market_cap) / np.log1p(np.nanmax(market_cap))
 
-        if score > 2:
-            rationale_parts.append("Its overall analysis score suggests a favorable investment outlook.")
+            # Score based on 24h change
+            if 'change_24h' in data.columns:
+                components['change_score'] = np.clip((data['change_24h'].to_numpy(dtype=np.float64) + 10) / 20, 0, 1)
 
-        return " ".join(rationale_parts)
+            # Score based on volume
+            if 'volume_24h' in data.columns and has_market_cap:
+                volume_to_cap = data['volume_24h'].to_numpy(dtype=np.float64) / market_cap
+                max_ratio = np.nanquantile(volume_to_cap, 0.95)
+                components['volume_to_cap'] = volume_to_cap
+                components['volume_score'] = np.clip(volume_to_cap / max_ratio, 0, 1)
 
-    def _recommend_holding_period(
+        return components
+    
+    def _profile_scores(
         self,
-        coin_name: str,
-        investment_horizon: str,
-        risk_tolerance: str
-    ) -> str:
+        data: pd.DataFrame,
+        components: Dict[str, np.ndarray],
+        risk_tolerances: Sequence[str],
+        investment_horizons: Sequence[str]
+    ) -> np.ndarray:
         """
-        Recommend how long to hold the coin based on risk and horizon.
+        Combine score components into a [profile x coin] score matrix.
 
-        Args:
-            coin_name: Name of the cryptocurrency
-            investment_horizon: User's horizon (Short-term, Medium-term, Long-term)
-            risk_tolerance: User's risk tolerance level
-
-        Returns:
-            Suggested holding period as a string
+        The terms are added in a fixed order, so a profile's scores are the
+        same whether it is scored alone or in a batch.
         """
-        if investment_horizon == "Short-term (0-3 months)":
-            return "1-3 months" if risk_tolerance in ["Low", "Medium"] else "2-6 weeks"
-
-        elif investment_horizon == "Medium-term (3-12 months)":
-            if risk_tolerance in ["Very Low", "Low"]:
-                return "6-9 months"
-            elif risk_tolerance == "Medium":
-                return "4-6 months"
-            else:
-                return "3-5 months"
-
-        elif investment_horizon == "Long-term (1+ years)":
-            if coin_name in ["Bitcoin", "Ethereum"]:
-                return "2+ years"
-            else:
-                return "1-2 years" if risk_tolerance in ["Medium", "High"] else "2-3 years"
-
-        return "6 months (default)"
+        scores = np.zeros((len(risk_tolerances), len(data)))
+        if 'market_cap_score' in components:
+            weights = np.array([RISK_WEIGHTS.get(risk, 1.0) for risk in risk_tolerances])
+            scores += components['market_cap_score'][None, :] * weights[:, None]
+        if 'change_score' in components:
+            weights = np.array([HORIZON_WEIGHTS.get(horizon, 1.0) for horizon in investment_horizons])
+            scores += components['change_score'][None, :] * weights[:, None]
+        if 'volume_score' in components:
+            scores += components['volume_score'][None, :] * 0.5
+
+        # Per-coin multipliers (e.g. the BTC / ETH bias), one row per distinct risk tolerance
+        if 'name' in data.columns and self.coin_bias:
+            distinct, inverse = np.unique(np.asarray(risk_tolerances, dtype=object), return_inverse=True)
+            multipliers = np.stack([
+                data['name'].map({
+                    name: by_risk.get(risk, default) for name, (by_risk, default) in self.coin_bias.items()
+                }).fillna(1.0).to_numpy(dtype=np.float64)
+                for risk in distinct
+            ])
+            scores *= multipliers[inverse.reshape(-1)]
+        return scores
+    
+    def _sentiment_factor(self, scored_coins: pd.DataFrame, sentiment_data: pd.DataFrame) -> Optional[np.ndarray]:
+        """Score multiplier per coin row from its average sentiment (None if sentiment cannot be matched)."""
+        sentiment = self._coin_sentiment(scored_coins, sentiment_data)
+        if sentiment is None:
+            return None
+        return 0.75 + 0.5 * sentiment.fillna(0.5).to_numpy(dtype=np.float64)
+
+    def _coin_sentiment(self, scored_coins: pd.DataFrame, sentiment_data: pd.DataFrame) -> Optional[pd.Series]:
+        """Average sentiment (0..1) of each coin row, matched by symbol or name (None if unmatched)."""
+        if scored_coins.empty or 'sentiment' not in sentiment_data.columns:
+            return None
+
+        key = 'symbol' if 'symbol' in sentiment_data.columns and 'symbol' in scored_coins.columns else 'name'
+        if key not in sentiment_data.columns or key not in scored_coins.columns:
+            return None
+
+        if key == 'symbol':
+            # Compare canonical symbols, so e.g. a POL post counts for MATIC
+            sentiment_data = sentiment_data.assign(
+                symbol=self.asset_index.symbols(self.asset_index.resolve(sentiment_data))
+            )
+        average = sentiment_data.dropna(subset=[key, 'sentiment']).groupby(key)['sentiment'].mean()
+        return scored_coins[key].map(average)
 
-    def _determine_coin_risk_level(
+    def _assemble_recommendations(
         self,
-        coin_name: str,
-        user_risk_tolerance: str
-    ) -> str:
+        names: Sequence[Any],
+        symbols: Sequence[Any],
+        market_caps: Sequence[Optional[float]],
+        changes_24h: Sequence[Optional[float]],
+        scores: Sequence[float],
+        risk_tolerance: str,
+        investment_horizon: str
+    ) -> List[Dict[str, Any]]:
         """
-        Determine risk level of a coin adjusted by user's tolerance.
+        Build recommendation entries (without allocations) column-wise.
 
-        Args:
-            coin_name: Name of the cryptocurrency
-            user_risk_tolerance: User-defined risk tolerance
+        A profile gives every coin of the same category (conservative,
+        aggressive, other) the same holding period, risk level and
+        potential return, so those are looked up once per category and
+        mapped onto the coins.
 
         Returns:
-            Risk level label as a string
+            List of dictionaries with coin, rationale, holding_period,
+            risk_level and potential_return, in input order
         """
-        # Base risk category by coin
-        conservative = ["Bitcoin", "Ethereum"]
-        aggressive = ["Dogecoin", "Shiba Inu", "Pepe"]
+        if not len(names):
+            return []
+
+        rationales = self._generate_rationales(names, scores, market_caps, changes_24h)
+
+        coin_names = pd.Series(names, dtype=object)
+        conservative = coin_names.isin(CONSERVATIVE_COINS).to_numpy()
+        categories = np.select(
+            [conservative, coin_names.isin(AGGRESSIVE_COINS).to_numpy()], ["conservative", "aggressive"], "other"
+        )
+        offset = RISK_OFFSETS.get(risk_tolerance, 1)
+        risk_levels = {
+            category: RISK_LABELS[max(1, min(5, base_risk + offset))] for category, base_risk in BASE_RISK.items()
+        }
+        returns = {
+            category: POTENTIAL_RETURNS.get(level, {}).get(investment_horizon, "10-30%")
+            for category, level in risk_levels.items()
+        }
+        # The holding period only singles out the conservative coins
+        holding_periods = np.where(
+            conservative,
+            self._recommend_holding_period(True, investment_horizon, risk_tolerance),
+            self._recommend_holding_period(False, investment_horizon, risk_tolerance)
+        )
+
+        return [
+            {
+                "coin": f"{name} ({symbol})",
+                "rationale": rationale,
+                "holding_period": holding_period,
+                "risk_level": risk_levels[category],
+                "potential_return": returns[category]
+            }
+            for name, symbol, rationale, holding_period, category
+            in zip(names, symbols, rationales, holding_periods.tolist(), categories.tolist())
+        ]
 
-        if coin_name in conservative:
-            base_risk = 1
-        elif coin_name in aggressive:
-            base_risk = 4
-        else:
-            base_risk = 2  # mid-cap, new projects
-
-        # Adjust based on user risk tolerance
-        risk_map = {
-            "Very Low": -1,
-            "Low": 0,
-            "Medium": 1,
-            "High": 2,
-            "Very High": 3
+    def _recommendation_result(
+        self,
+        recommendations: List[Dict[str, Any]],
+        market_outlook: str,
+        risk_tolerance: str
+    ) -> Dict[str, Any]:
+        """Wrap recommendation entries with the outlook, risk assessment and general advice."""
+        return {
+            "status": "success",
+            "recommendations": recommendations,
+            "market_outlook": market_outlook,
+            "risk_assessment": self._generate_risk_assessment(risk_tolerance),
+            "additional_advice": ADDITIONAL_ADVICE
         }
 
-        risk_index = max(1, min(5, base_risk + risk_map.get(user_risk_tolerance, 1)))
+    def _generate_rationales(
+        self,
+        coin_names: Sequence[Any],
+        scores: Sequence[float],
+        market_caps: Sequence[Optional[float]],
+        changes_24h: Sequence[Optional[float]]
+    ) -> List[str]:
+        """
+        Generate human-readable rationales for why coins are recommended.
 
-        label_map = {
-            1: "Very Low",
-            2: "Low",
-            3: "Medium",
-            4: "High",
-            5: "Very High"
-        }
+        The market cap, 24h change and score are bucketed column-wise and
+        the sentences looked up in RATIONALE_SUFFIXES.
 
-        return label_map[risk_index]
+        Args:
+            coin_names: Names of the cryptocurrencies
+            scores: The scores they received during analysis
+            market_caps: Market caps in USD
+            changes_24h: 24h change percentages
 
-    def _estimate_potential_return(
+        Returns:
+            One rationale string per coin
+        """
+        def numbers(values):
+            # Missing (None) and zero values get no sentence; NaN falls through
+            # to the last case, as with the truthiness checks this replaces
+            values = np.asarray(values, dtype=object)
+            absent = np.equal(values, None)
+            values = np.where(absent, 0.0, values).astype(np.float64)
+            return values, absent | (values == 0)
+
+        caps, no_cap = numbers(market_caps)
+        cap_buckets = np.select([no_cap, caps > 1e11, caps > 1e10], [0, 1, 2], default=3)
+        changes, no_change = numbers(changes_24h)
+        change_buckets = np.select([no_change, changes > 5, changes < -5], [0, 1, 2], default=3)
+        score_buckets = (np.asarray(scores, dtype=np.float64) > 2).astype(np.int64)
+
+        suffixes = RATIONALE_SUFFIXES[cap_buckets, change_buckets, score_buckets]
+        return [
+            f"{coin_name} was selected due to its strong performance indicators.{suffix}"
+            for coin_name, suffix in zip(coin_names, suffixes)
+        ]
+
+    def _recommend_holding_period(
         self,
-        coin_name: str,
-        risk_level: str,
-        investment_horizon: str
+        conservative: bool,
+        investment_horizon: str,
+        risk_tolerance: str
     ) -> str:
         """
-        Estimate potential return range for a coin based on risk and horizon.
+        Recommend how long to hold a coin based on risk and horizon.
 
         Args:
-            coin_name: Name of the coin
-            risk_level: Computed risk level for the coin
-            investment_horizon: User's investment horizon
+            conservative: Whether the coin is one of the CONSERVATIVE_COINS
+            investment_horizon: User's horizon (Short-term, Medium-term, Long-term)
+            risk_tolerance: User's risk tolerance level
 
         Returns:
-            A string representing expected return range
-        """
-        return_table = {
-            "Very Low": {
-                "Short-term (0-3 months)": "2-5%",
-                "Medium-term (3-12 months)": "5-10%",
-                "Long-term (1+ years)": "10-20%"
-            },
-            "Low": {
-                "Short-term (0-3 months)": "3-7%",
-                "Medium-term (3-12 months)": "7-15%",
-                "Long-term (1+ years)": "15-30%"
-            },
-            "Medium": {
-                "Short-term (0-3 months)": "5-15%",
-                "Medium-term (3-12 months)": "10-25%",
-                "Long-term (1+ years)": "25-50%"
-            },
-            "High": {
-                "Short-term (0-3 months)": "10-25%",
-                "Medium-term (3-12 months)": "20-50%",
-                "Long-term (1+ years)": "40-80%"
-            },
-            "Very High": {
-                "Short-term (0-3 months)": "15-40%",
-                "Medium-term (3-12 months)": "30-70%",
-                "Long-term (1+ years)": "60-150%"
-            }
-        }
-
-        return return_table.get(risk_level, {}).get(investment_horizon, "10-30%")
-
+            Suggested holding period as a string
+        """
+        table = CONSERVATIVE_HOLDING_PERIODS if conservative else HOLDING_PERIODS
+        periods, default = table.get(investment_horizon, ({}, DEFAULT_HOLDING_PERIOD))
+        return periods.get(risk_tolerance, default)
 
     def _generate_market_outlook(self, data: pd.DataFrame) -> str:
         """
@@ -499,27 +839,4 @@ class MarketAnalyzer:
         Returns:
             A summary string explaining risk profile
         """
-        profiles = {
-            "Very Low": (
-                "You prefer minimal risk and capital preservation. "
-                "The portfolio emphasizes large-cap, stable assets like Bitcoin and Ethereum."
-            ),
-            "Low": (
-                "You are cautious but open to moderate growth. "
-                "The portfolio contains a balance of stability and carefully selected growth assets."
-            ),
-            "Medium": (
-                "You have a balanced risk appetite. "
-                "This portfolio mixes well-established coins with mid-cap options for better upside."
-            ),
-            "High": (
-                "You're comfortable with volatility and seeking higher returns. "
-                "This portfolio includes emerging coins with strong potential."
-            ),
-            "Very High": (
-                "You are aggressive and aiming for maximum returns. "
-                "The portfolio leans into high-risk, high-reward assets with growth upside."
-            )
-        }
-
-        return profiles.get(risk_tolerance, "Custom risk profile not recognized.")
+        return RISK_ASSESSMENTS.get(risk_tolerance, "Custom risk profile not recognized.")
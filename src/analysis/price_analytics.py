@@ -0,0 +1,171 @@
+# src/analysis/price_analytics.py
+import logging
+from typing import Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rows processed at a time by the universe-wide reductions, which bounds
+# how much of a memory-mapped matrix is resident at once
+DEFAULT_CHUNK_ROWS = 1024
+
+# Candles per year, for annualizing volatility
+PERIODS_PER_YEAR = {
+    "day": 365,
+    "hour": 365 * 24,
+}
+
+
+def _by_chunks(prices: np.ndarray, reduce: Callable[[np.ndarray], np.ndarray], chunk_rows: int) -> np.ndarray:
+    """Apply a per-row reduction to row blocks of a (possibly memory-mapped) matrix."""
+    return np.concatenate([
+        reduce(np.asarray(prices[start:start + chunk_rows], dtype=np.float64))
+        for start in range(0, prices.shape[0], chunk_rows)
+    ]) if prices.shape[0] else np.empty(0)
+
+
+def log_returns(prices: np.ndarray) -> np.ndarray:
+    """
+    Period log returns of a [coin x timestamp] price matrix.
+
+    Args:
+        prices: Price matrix (NaN for missing candles)
+
+    Returns:
+        [coin x timestamp - 1] matrix; NaN where either price is missing
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(prices), axis=1)
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+
+def realized_volatility(
+    prices: np.ndarray,
+    periods_per_year: int = PERIODS_PER_YEAR["day"],
+    min_periods: int = 2,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> np.ndarray:
+    """
+    Annualized volatility (standard deviation of log returns) per coin.
+
+    Args:
+        prices: [coin x timestamp] price matrix, e.g. PriceMatrix.window()
+        periods_per_year: Candles per year (see PERIODS_PER_YEAR)
+        min_periods: Minimum number of returns for a result
+        chunk_rows: Coins processed at a time
+
+    Returns:
+        Array with one volatility per coin (NaN with too little history)
+    """
+    def reduce(block):
+        returns = log_returns(block)
+        counts = np.sum(~np.isnan(returns), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(returns, axis=1) / counts
+            variance = np.nansum((returns - mean[:, None]) ** 2, axis=1) / (counts - 1)
+        volatility = np.sqrt(variance * periods_per_year)
+        volatility[counts < max(min_periods, 2)] = np.nan
+        return volatility
+
+    return _by_chunks(prices, reduce, chunk_rows)
+
+
+def rolling_volatility(
+    prices: np.ndarray,
+    window: int,
+    periods_per_year: int = PERIODS_PER_YEAR["day"],
+    min_periods: Optional[int] = None
+) -> np.ndarray:
+    """
+    Annualized rolling volatility over the last `window` returns.
+
+    Uses running sums of returns and squared returns, so the cost does not
+    depend on the window length.
+
+    Args:
+        prices: [coin x timestamp] price matrix
+        window: Number of returns per window
+        periods_per_year: Candles per year
+        min_periods: Minimum non-missing returns per window (defaults to window)
+
+    Returns:
+        [coin x timestamp - 1] matrix aligned with log_returns(); NaN until a
+        window has enough returns
+    """
+    min_periods = window if min_periods is None else min_periods
+    returns = log_returns(prices)
+    present = ~np.isnan(returns)
+    values = np.where(present, returns, 0.0)
+
+    def window_sum(array):
+        cumulative = np.cumsum(array, axis=1)
+        cumulative[:, window:] = cumulative[:, window:] - cumulative[:, :-window]
+        return cumulative
+
+    counts = window_sum(present.astype(np.float64))
+    sums = window_sum(values)
+    squares = window_sum(values * values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (squares - sums * sums / counts) / (counts - 1)
+    # Running sums can leave tiny negative rounding residues
+    volatility = np.sqrt(np.clip(variance, 0.0, None) * periods_per_year)
+    volatility[counts < max(min_periods, 2)] = np.nan
+    return volatility
+
+
+def max_drawdown(prices: np.ndarray, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> np.ndarray:
+    """
+    Largest peak-to-trough decline per coin, as a negative fraction.
+
+    Args:
+        prices: [coin x timestamp] price matrix
+        chunk_rows: Coins processed at a time
+
+    Returns:
+        Array with one drawdown per coin (0 for a coin that never fell,
+        NaN for a coin without prices)
+    """
+    def reduce(block):
+        peaks = np.fmax.accumulate(np.where(np.isnan(block), -np.inf, block), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            drawdowns = block / peaks - 1.0
+        drawdowns[~np.isfinite(drawdowns)] = np.nan
+        result = np.full(block.shape[0], np.nan)
+        has_prices = ~np.all(np.isnan(drawdowns), axis=1)
+        result[has_prices] = np.nanmin(drawdowns[has_prices], axis=1)
+        return result
+
+    return _by_chunks(prices, reduce, chunk_rows)
+
+
+def correlation_matrix(returns: np.ndarray, min_periods: int = 2) -> np.ndarray:
+    """
+    Pairwise correlation of return series, using the periods both coins share.
+
+    Computed with a handful of matrix products instead of a loop over pairs.
+
+    Args:
+        returns: [coin x timestamp] return matrix (NaN for missing returns)
+        min_periods: Minimum shared periods for a result
+
+    Returns:
+        [coin x coin] correlation matrix (NaN where too few periods overlap)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    present = (~np.isnan(returns)).astype(np.float64)
+    values = np.where(present > 0, returns, 0.0)
+
+    counts = present @ present.T
+    sums = values @ present.T                 # sum of x_i over periods shared with j
+    squares = (values * values) @ present.T
+    products = values @ values.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = products - sums * sums.T / counts
+        # variance[i, j]: variance of coin i over the periods shared with j
+        variance = squares - sums * sums / counts
+        correlation = covariance / np.sqrt(variance * variance.T)
+    correlation[counts < max(min_periods, 2)] = np.nan
+    return np.clip(correlation, -1.0, 1.0)
@@ -0,0 +1,54 @@
+# src/analysis/ranking.py
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def top_k_indices(values: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+    """
+    Positions of the k largest (or smallest) values, best first.
+
+    Selects with numpy.argpartition in O(n) and only sorts the k winners, so
+    it is cheap on large universes. The result is the same as
+    Series.nlargest / nsmallest(k, keep='first') on the non-NaN values: NaN
+    is never selected (pandas appends it once k reaches the length), ties go
+    to the earlier position and are listed in position order.
+
+    Args:
+        values: 1-D array of numbers (e.g. scores or 24h changes)
+        k: Number of positions to return
+        largest: Largest values if True, smallest otherwise
+
+    Returns:
+        int64 array of at most k positions into values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 1:
+        raise ValueError(f"Expected a 1-D array, got shape {values.shape}")
+
+    positions = None
+    missing = np.isnan(values)
+    if missing.any():
+        positions = np.flatnonzero(~missing)
+        values = values[positions]
+
+    k = min(max(int(k), 0), len(values))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Ascending keys: the best values have the smallest keys
+    keys = -values if largest else values
+    if k < len(keys):
+        threshold = keys[np.argpartition(keys, k - 1)[k - 1]]
+        # Everything strictly better than the k-th key is in; equal keys fill
+        # the remaining places in position order
+        better = np.flatnonzero(keys < threshold)
+        ties = np.flatnonzero(keys == threshold)[:k - len(better)]
+        selected = np.sort(np.concatenate([better, ties]))
+    else:
+        selected = np.arange(len(keys))
+
+    selected = selected[np.argsort(keys[selected], kind='stable')]
+    return selected if positions is None else positions[selected]
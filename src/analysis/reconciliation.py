@@ -0,0 +1,435 @@
+# src/analysis/reconciliation.py
+import os
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .sentiment import KNOWN_COINS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ASSET_INDEX_PATH = "data/assets/assets.sqlite"
+
+# Provider names that differ from the KNOWN_COINS name and aliases, by canonical symbol
+NAME_ALIASES = {
+    "Polygon Ecosystem Token": "MATIC",
+    "Matic Network": "MATIC",
+    "BNB Coin": "BNB",
+    "Avalanche C-Chain": "AVAX",
+}
+
+# Seconds after which a row counts half as much as its asset's freshest row
+FRESHNESS_HALF_LIFE = 300.0
+
+# Columns averaged per asset
+METRIC_COLUMNS = ["price", "market_cap", "volume_24h", "change_24h"]
+
+# Separates the source from the alias in lookup keys ('' = any source)
+_KEY_SEPARATOR = "\x1f"
+
+
+def _normalize_symbol(symbol) -> Optional[str]:
+    """Upper-case ticker (None for missing or blank values)."""
+    return (symbol.strip().upper() or None) if isinstance(symbol, str) else None
+
+
+def _normalize_name(name) -> Optional[str]:
+    """Case- and whitespace-insensitive name (None for missing or blank values)."""
+    return (" ".join(name.split()).casefold() or None) if isinstance(name, str) else None
+
+
+def _factorize(data: pd.DataFrame, column: str, normalize) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Codes and normalized keys of a column, so each distinct value is normalized once.
+
+    Returns:
+        (code per row, -1 for missing values; array of distinct keys)
+    """
+    if column not in data.columns:
+        return np.full(len(data), -1, dtype=np.int64), np.empty(0, dtype=object)
+    codes, uniques = pd.factorize(data[column])
+    normalized = np.array([normalize(value) for value in uniques], dtype=object)
+    # Values that normalize to nothing (e.g. blanks) count as missing
+    key_codes, keys = pd.factorize(normalized)
+    if not len(key_codes):
+        return codes.astype(np.int64), np.empty(0, dtype=object)
+    codes = np.where(codes >= 0, key_codes[np.maximum(codes, 0)], -1)
+    return codes.astype(np.int64), keys.astype(object)
+
+
+class AssetIndex:
+    """
+    Persistent canonical asset index: every provider symbol and name maps to one asset id.
+
+    Assets and aliases live in SQLite and are mirrored in dictionaries; a
+    lookup turns whole columns into keys and resolves them with one hash
+    table probe per row (pandas.Index.get_indexer), so resolving a feed is
+    linear in its length. Aliases can be global or pinned to one source,
+    e.g. a provider that reuses another coin's ticker.
+
+    Rows resolve by symbol first (tickers are what providers agree on most)
+    and by name only when they have no symbol. Unknown symbols become new
+    assets on first sight.
+
+    Several indexes (e.g. one per app session) may share a file: SQLite
+    assigns the asset ids, new assets are registered in one transaction that
+    skips aliases another index registered first, and the mirror is then
+    reread from the file.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_ASSET_INDEX_PATH,
+        coins: Iterable[Tuple[str, str, Iterable[str]]] = KNOWN_COINS
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            path: SQLite file holding the index (None keeps it in memory only)
+            coins: (name, symbol, aliases) tuples seeded into a new index;
+                upper-case aliases are also taken as symbol aliases
+        """
+        self.path = path
+        self.coins = list(coins)
+        self.version = 0
+        self._size = 0
+        self._symbols: List[Optional[str]] = []
+        self._names: List[Optional[str]] = []
+        self._aliases: Dict[str, Dict[str, int]] = {"symbol": {}, "name": {}}
+        self._lookups: Dict[str, Tuple[pd.Index, np.ndarray]] = {}
+        self._scoped = False
+        self._loaded = False
+        self._initialized = False
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the index file, creating it on first use."""
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30)
+
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS assets ("
+                " asset_id INTEGER PRIMARY KEY,"
+                " symbol TEXT,"
+                " name TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS aliases ("
+                " kind TEXT NOT NULL,"
+                " alias TEXT NOT NULL,"
+                " source TEXT NOT NULL DEFAULT '',"
+                " asset_id INTEGER NOT NULL,"
+                " PRIMARY KEY (kind, alias, source))"
+            )
+            self._initialized = True
+        return conn
+
+    def _load(self):
+        """Read the index from disk, seeding it when it is new."""
+        if self._loaded:
+            return
+        if self.path is not None:
+            self._reload()
+        self._loaded = True
+        if not self._size:
+            self._seed()
+
+    def _reload(self):
+        """Replace the mirror with the assets and aliases on disk."""
+        conn = self._connect()
+        try:
+            assets = conn.execute("SELECT asset_id, symbol, name FROM assets").fetchall()
+            rows = conn.execute("SELECT kind, alias, source, asset_id FROM aliases").fetchall()
+        finally:
+            conn.close()
+
+        # Ids come from SQLite, so the lists are indexed by id and may have gaps
+        size = max((asset_id for asset_id, _, _ in assets), default=-1) + 1
+        self._symbols, self._names = [None] * size, [None] * size
+        for asset_id, symbol, name in assets:
+            self._symbols[asset_id] = symbol
+            self._names[asset_id] = name
+        self._size = len(assets)
+
+        aliases = {"symbol": {}, "name": {}}
+        for kind, alias, source, asset_id in rows:
+            aliases[kind][source + _KEY_SEPARATOR + alias] = asset_id
+        if self._loaded and self._remapped(aliases):
+            # Another index changed a mapping that cached results may rely on
+            self.version += 1
+        self._aliases = aliases
+        self._scoped = any(not key.startswith(_KEY_SEPARATOR) for keys in aliases.values() for key in keys)
+        self._lookups.clear()
+
+    def _remapped(self, aliases: Dict[str, Dict[str, int]]) -> bool:
+        """Whether aliases moves or drops a mirrored alias or adds a source-pinned one."""
+        for kind, keys in aliases.items():
+            mirrored = self._aliases[kind]
+            if len(mirrored.keys() - keys.keys()):
+                return True
+            for key, asset_id in keys.items():
+                if mirrored.get(key, asset_id) != asset_id:
+                    return True
+                if key not in mirrored and not key.startswith(_KEY_SEPARATOR):
+                    return True
+        return False
+
+    def _seed(self):
+        """Register the known coins with their names and aliases."""
+        coins = {}
+        for name, symbol, aliases in self.coins:
+            coins.setdefault(symbol.upper(), (name, tuple(aliases)))
+        extra_names = {}
+        for name, symbol in NAME_ALIASES.items():
+            extra_names.setdefault(symbol, []).append(name)
+
+        assets = []
+        for symbol, (name, extra) in coins.items():
+            aliases = [("symbol", symbol)]
+            aliases.extend(("symbol", alias) for alias in extra if alias.isupper())
+            aliases.extend(("name", _normalize_name(alias)) for alias in (name, symbol, *extra))
+            aliases.extend(("name", _normalize_name(alias)) for alias in extra_names.get(symbol, ()))
+            assets.append((symbol, name, aliases))
+        self._new_assets(assets)
+
+    def _new_assets(self, assets: List[Tuple[Optional[str], Optional[str], List[Tuple[str, str]]]]):
+        """
+        Register assets with their global (kind, key) aliases; later aliases win.
+
+        An asset whose first alias is already registered (by another index on
+        the same file) is skipped, and the mirror picks up that index's asset.
+        """
+        if self.path is None:
+            for symbol, name, aliases in assets:
+                asset_id = len(self._symbols)
+                self._symbols.append(symbol)
+                self._names.append(name)
+                for kind, key in aliases:
+                    self._aliases[kind][_KEY_SEPARATOR + key] = asset_id
+            self._size = len(self._symbols)
+            self._lookups.clear()
+            return
+
+        conn = self._connect()
+        try:
+            with conn:
+                # Take the write lock before checking, so two indexes can't
+                # both decide to create the same asset
+                conn.execute("BEGIN IMMEDIATE")
+                for symbol, name, aliases in assets:
+                    kind, key = aliases[0]
+                    taken = conn.execute(
+                        "SELECT 1 FROM aliases WHERE kind = ? AND alias = ? AND source = ''", (kind, key)
+                    ).fetchone()
+                    if taken:
+                        continue
+                    asset_id = conn.execute(
+                        "INSERT INTO assets (symbol, name) VALUES (?, ?)", (symbol, name)
+                    ).lastrowid
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO aliases (kind, alias, source, asset_id) VALUES (?, ?, '', ?)",
+                        [(kind, key, asset_id) for kind, key in aliases]
+                    )
+        finally:
+            conn.close()
+        self._reload()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return self._size
+
+    def add_alias(self, symbol: str, alias: str, kind: str = "symbol", source: Optional[str] = None):
+        """
+        Map a provider symbol or name to an existing asset.
+
+        Args:
+            symbol: Canonical symbol of the asset
+            alias: Provider symbol (kind='symbol') or name (kind='name')
+            kind: 'symbol' or 'name'
+            source: Only apply the alias to rows of this source (all if omitted)
+        """
+        if kind not in self._aliases:
+            raise ValueError(f"Unknown alias kind {kind!r}")
+        with self._lock:
+            self._load()
+            asset_id = self._aliases["symbol"].get(_KEY_SEPARATOR + symbol.upper())
+            if asset_id is None:
+                raise KeyError(f"Unknown asset {symbol!r}")
+            key = alias.strip().upper() if kind == "symbol" else _normalize_name(alias)
+            source = source or ""
+            if self.path is not None:
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO aliases (kind, alias, source, asset_id) VALUES (?, ?, ?, ?)",
+                            (kind, key, source, asset_id)
+                        )
+                finally:
+                    conn.close()
+            self._aliases[kind][source + _KEY_SEPARATOR + key] = asset_id
+            self._scoped = self._scoped or bool(source)
+            self._lookups.clear()
+            # Cached results that depended on the old mapping are stale now
+            self.version += 1
+
+    def _lookup(self, kind: str, keys: np.ndarray, sources: Optional[np.ndarray] = None) -> np.ndarray:
+        """Asset id per normalized key (-1 if unknown); with sources, only source-pinned aliases."""
+        if kind not in self._lookups:
+            aliases = self._aliases[kind]
+            self._lookups[kind] = (
+                pd.Index(list(aliases.keys())), np.fromiter(aliases.values(), dtype=np.int64, count=len(aliases))
+            )
+        index, ids = self._lookups[kind]
+        prefixes = [""] * len(keys) if sources is None else sources
+        positions = index.get_indexer([prefix + _KEY_SEPARATOR + key for prefix, key in zip(prefixes, keys)])
+        return np.where(positions >= 0, ids[positions], -1) if len(ids) else np.full(len(keys), -1)
+
+    def _match(self, kind: str, codes: np.ndarray, keys: np.ndarray, sources: Optional[np.ndarray]) -> np.ndarray:
+        """Asset id per row from factorized keys: each distinct key is looked up once."""
+        found = np.full(len(codes), -1, dtype=np.int64)
+        rows = codes >= 0
+        found[rows] = self._lookup(kind, keys)[codes[rows]]
+        if self._scoped and sources is not None and rows.any():
+            # Source-pinned aliases need the (source, key) pair of every row
+            pinned = self._lookup(kind, keys[codes[rows]], sources[rows])
+            found[rows] = np.where(pinned >= 0, pinned, found[rows])
+        return found
+
+    def resolve(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Resolve market rows to asset ids, registering unknown symbols.
+
+        Args:
+            data: DataFrame with symbol and/or name (and optionally source)
+
+        Returns:
+            int64 array with one asset id per row (-1 for rows with neither
+            a symbol nor a name)
+        """
+        symbol_codes, symbol_keys = _factorize(data, "symbol", _normalize_symbol)
+        no_symbol = symbol_codes < 0
+        # Names only matter for rows without a symbol
+        if no_symbol.any():
+            name_codes, name_keys = _factorize(data, "name", _normalize_name)
+        else:
+            name_codes, name_keys = np.full(len(data), -1, dtype=np.int64), np.empty(0, dtype=object)
+        sources = data["source"].fillna("").astype(str).to_numpy() if "source" in data.columns else None
+
+        with self._lock:
+            self._load()
+
+            def match():
+                ids = self._match("symbol", symbol_codes, symbol_keys, sources)
+                if no_symbol.any():
+                    ids[no_symbol] = self._match(
+                        "name", name_codes[no_symbol], name_keys, None if sources is None else sources[no_symbol]
+                    )
+                return ids
+
+            ids = match()
+            unknown = ids < 0
+            if not unknown.any():
+                return ids
+
+            # New coins: one asset per unknown symbol (or name, for symbol-less rows),
+            # named after the first row that has it
+            raw_names = data["name"].to_numpy(dtype=object) if "name" in data.columns else np.full(len(data), None)
+            new_assets = []
+            for kind, codes, keys in (("symbol", symbol_codes, symbol_keys), ("name", name_codes, name_keys)):
+                rows = unknown & (~no_symbol if kind == "symbol" else no_symbol) & (codes >= 0)
+                distinct, first = np.unique(codes[rows], return_index=True)
+                for code, row in zip(distinct, np.flatnonzero(rows)[first]):
+                    name = raw_names[row] if isinstance(raw_names[row], str) else None
+                    new_assets.append((keys[code] if kind == "symbol" else None, name, [(kind, keys[code])]))
+            if new_assets:
+                self._new_assets(new_assets)
+                logger.info(f"Registered {len(new_assets)} new assets")
+                ids = match()
+            return ids
+
+    def symbols(self, ids: np.ndarray) -> np.ndarray:
+        """Canonical symbol per asset id (None for -1)."""
+        with self._lock:
+            self._load()
+            return np.array(self._symbols + [None], dtype=object)[ids]
+
+    def names(self, ids: np.ndarray) -> np.ndarray:
+        """Canonical name per asset id (None for -1)."""
+        with self._lock:
+            self._load()
+            return np.array(self._names + [None], dtype=object)[ids]
+
+
+def reconcile_sources(
+    data: pd.DataFrame,
+    index: AssetIndex,
+    half_life: float = FRESHNESS_HALF_LIFE,
+    max_age: Optional[float] = None
+) -> pd.DataFrame:
+    """
+    Merge rows from several providers into one row per canonical asset.
+
+    Each metric is a freshness-weighted mean over the rows that have it: a
+    row's weight halves every half_life seconds it is older than the
+    freshest row of its asset, so rows fetched together are averaged
+    equally and a lagging feed fades out. Everything is a handful of
+    bincount passes over the rows.
+
+    Args:
+        data: Market rows with symbol and/or name, the METRIC_COLUMNS and
+            optionally source and fetched_at
+        index: Asset index resolving the rows
+        half_life: Seconds of staleness that halve a row's weight
+        max_age: Drop rows more than this many seconds older than their
+            asset's freshest row
+
+    Returns:
+        DataFrame with name, symbol and the available METRIC_COLUMNS, one
+        row per asset in name order (canonical name and symbol)
+    """
+    metrics = [column for column in METRIC_COLUMNS if column in data.columns]
+    ids = index.resolve(data) if not data.empty else np.empty(0, dtype=np.int64)
+    known = ids >= 0
+    codes, assets = pd.factorize(ids[known])
+    count = len(assets)
+
+    if "fetched_at" in data.columns and count:
+        fetched_at = pd.to_datetime(data["fetched_at"], utc=True)
+        seconds = (fetched_at - pd.Timestamp(0, tz="UTC")).dt.total_seconds().to_numpy()[known]
+        # Rows without a fetch time count as fresh
+        freshest = np.full(count, -np.inf)
+        np.maximum.at(freshest, codes, np.nan_to_num(seconds, nan=-np.inf))
+        age = np.where(np.isnan(seconds), 0.0, freshest[codes] - seconds)
+        age = np.where(np.isfinite(age), age, 0.0)
+        weights = 0.5 ** (age / half_life)
+        if max_age is not None:
+            weights[age > max_age] = 0.0
+    else:
+        weights = np.ones(len(codes))
+
+    merged = {"name": index.names(assets), "symbol": index.symbols(assets)}
+    for column in metrics:
+        values = pd.to_numeric(data[column], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)[known]
+        present = ~np.isnan(values)
+        totals = np.bincount(codes, weights=np.where(present, values, 0.0) * weights, minlength=count)
+        counts = np.bincount(codes, weights=present * weights, minlength=count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            merged[column] = np.where(counts > 0, totals / counts, np.nan)
+
+    merged = pd.DataFrame(merged)
+    # Name order, like the groupby('name') this replaces
+    order = np.argsort(merged["name"].fillna(merged["symbol"]).to_numpy(dtype=str), kind="stable")
+    return merged.iloc[order].reset_index(drop=True)
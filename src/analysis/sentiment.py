@@ -0,0 +1,430 @@
+# src/analysis/sentiment.py
+import re
+import json
+import os
+import sqlite3
+import hashlib
+import logging
+from itertools import chain
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..storage.article_store import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Bump when the lexicon or the scoring changes, so cached scores are recomputed
+LEXICON_VERSION = "1"
+
+# Word valences on a -3..3 scale, tuned for market commentary
+SENTIMENT_LEXICON: Dict[str, float] = {
+    # Positive
+    "bullish": 2.5, "rally": 2.0, "rallied": 2.0, "rallies": 2.0, "surge": 2.0, "surged": 2.0,
+    "soar": 2.5, "soared": 2.5, "gain": 1.5, "gains": 1.5, "gained": 1.5, "rise": 1.2, "rose": 1.2,
+    "climb": 1.2, "climbed": 1.2, "high": 0.8, "record": 1.0, "breakout": 1.8, "outperform": 1.8,
+    "outperformed": 1.8, "strong": 1.5, "strength": 1.5, "robust": 1.5, "growth": 1.5, "growing": 1.2,
+    "positive": 1.5, "optimism": 1.8, "optimistic": 1.8, "confidence": 1.2, "confident": 1.2,
+    "adoption": 1.2, "upgrade": 1.0, "launch": 0.8, "launched": 0.8, "approval": 1.5, "approved": 1.5,
+    "partnership": 1.0, "inflows": 1.2, "demand": 0.8, "recovery": 1.2, "recovering": 1.2,
+    "recovered": 1.2, "profit": 1.5, "profits": 1.5, "profitable": 1.5, "rewards": 1.0, "earn": 0.8,
+    "secure": 1.0, "securely": 1.0, "stable": 0.8, "success": 1.8, "successful": 1.8, "improve": 1.2,
+    "improved": 1.2, "improving": 1.2, "innovation": 1.0, "opportunity": 1.2, "support": 0.6,
+    "competitive": 0.8, "momentum": 1.0, "boost": 1.5, "boosted": 1.5, "upside": 1.5, "win": 1.5,
+    # Negative
+    "bearish": -2.5, "crash": -3.0, "crashed": -3.0, "plunge": -2.5, "plunged": -2.5, "dump": -2.0,
+    "dumped": -2.0, "fall": -1.2, "fell": -1.2, "falling": -1.2, "drop": -1.2, "dropped": -1.2,
+    "decline": -1.5, "declined": -1.5, "slump": -2.0, "slipped": -1.0, "selloff": -2.0, "loss": -1.5,
+    "losses": -1.5, "weak": -1.5, "weakness": -1.5, "negative": -1.5, "fear": -2.0, "fears": -2.0,
+    "panic": -2.5, "uncertainty": -1.5, "uncertain": -1.2, "concern": -1.2, "concerns": -1.2,
+    "risk": -0.8, "risks": -0.8, "risky": -1.2, "volatility": -0.6, "volatile": -0.8, "cautious": -0.8,
+    "outage": -2.0, "hack": -3.0, "hacked": -3.0, "exploit": -2.5, "exploited": -2.5, "scam": -3.0,
+    "fraud": -3.0, "lawsuit": -1.5, "ban": -2.0, "banned": -2.0, "crackdown": -2.0, "delay": -1.0,
+    "delayed": -1.0, "suffered": -1.5, "liquidation": -1.8, "liquidations": -1.8, "bankrupt": -3.0,
+    "bankruptcy": -3.0, "reversal": -1.0, "faded": -1.0, "fades": -1.0, "wiped": -1.8, "intense": -0.5,
+    "warn": -1.0, "warns": -1.0, "weighs": -1.0, "downturn": -2.0, "downside": -1.5, "collapse": -3.0,
+}
+
+# A lexicon word preceded (within NEGATION_WINDOW tokens of the same sentence) by one of these flips sign
+NEGATIONS = {"not", "no", "never", "without", "isn't", "wasn't", "aren't", "don't", "doesn't", "didn't", "cannot"}
+NEGATION_WINDOW = 2
+
+# Coins recognized in article text when no market data is supplied:
+# (name, symbol, extra aliases)
+KNOWN_COINS: List[Tuple[str, str, Tuple[str, ...]]] = [
+    ("Bitcoin", "BTC", ()),
+    ("Ethereum", "ETH", ("Ether",)),
+    ("Binance Coin", "BNB", ()),
+    ("Solana", "SOL", ()),
+    ("XRP", "XRP", ("Ripple",)),
+    ("Cardano", "ADA", ()),
+    ("Dogecoin", "DOGE", ()),
+    ("Polygon", "MATIC", ("POL",)),
+    ("Polkadot", "DOT", ()),
+    ("Avalanche", "AVAX", ()),
+    ("Chainlink", "LINK", ()),
+    ("Uniswap", "UNI", ()),
+    ("Litecoin", "LTC", ()),
+    ("Tron", "TRX", ()),
+    ("Toncoin", "TON", ()),
+    ("Shiba Inu", "SHIB", ()),
+    ("Arbitrum", "ARB", ()),
+    ("Optimism", "OP", ()),
+    ("Cosmos", "ATOM", ()),
+    ("Stellar", "XLM", ()),
+    ("Bitcoin Cash", "BCH", ()),
+    ("Tether", "USDT", ()),
+    ("USD Coin", "USDC", ()),
+]
+
+# Soft limit on the raw valence sum when squashing it to -1..1 (as in VADER)
+_NORMALIZATION_ALPHA = 15.0
+
+_TOKEN = re.compile(r"[A-Za-z][A-Za-z0-9']*|[.!?]+")
+
+
+def sentiment_trend(sentiment: float) -> str:
+    """Map a 0..1 sentiment score to the trend labels used by the blog sources."""
+    if sentiment >= 0.8:
+        return "very bullish"
+    if sentiment >= 0.6:
+        return "bullish"
+    if sentiment > 0.4:
+        return "neutral"
+    if sentiment > 0.2:
+        return "bearish"
+    return "very bearish"
+
+
+def _normalize(raw: np.ndarray) -> np.ndarray:
+    """Squash raw valence sums to a 0..1 score (0.5 is neutral)."""
+    compound = raw / np.sqrt(raw * raw + _NORMALIZATION_ALPHA)
+    return (compound + 1.0) / 2.0
+
+
+class MentionIndex:
+    """
+    Lookup from words in article text to coins.
+
+    Symbols only match as upper-case tokens (so "sol" or "op" in prose is not
+    a mention); names and aliases match case-insensitively and may span
+    several words ("Binance Coin", "Shiba Inu").
+    """
+
+    def __init__(self, coins: Iterable[Tuple[str, str, Iterable[str]]] = KNOWN_COINS):
+        """
+        Build the index.
+
+        Args:
+            coins: Tuples of (name, symbol, aliases)
+        """
+        self.coins: List[Tuple[str, str]] = []
+        self.symbols: Dict[str, int] = {}
+        self.words: Dict[str, int] = {}
+        self.phrases: Dict[str, List[Tuple[List[str], int]]] = {}
+
+        for name, symbol, aliases in coins:
+            symbol = symbol.upper()
+            if symbol in self.symbols:
+                continue
+            index = len(self.coins)
+            self.coins.append((name, symbol))
+            self.symbols[symbol] = index
+            for label in (name, *aliases):
+                words = label.lower().split()
+                if len(words) == 1:
+                    self.words.setdefault(words[0], index)
+                elif words:
+                    self.phrases.setdefault(words[0], []).append((words[1:], index))
+
+        # Longest phrase first, so "bitcoin cash" wins over "bitcoin"
+        for candidates in self.phrases.values():
+            candidates.sort(key=lambda candidate: -len(candidate[0]))
+
+        self.fingerprint = hashlib.sha256(
+            json.dumps([self.coins, sorted(self.words.items()), sorted(self.phrases)]).encode("utf-8")
+        ).hexdigest()[:12]
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> "MentionIndex":
+        """Build an index from market data with name and symbol columns, plus KNOWN_COINS."""
+        coins = [
+            (name, symbol, ())
+            for name, symbol in data[['name', 'symbol']].dropna().drop_duplicates('symbol').itertuples(index=False)
+        ]
+        return cls(coins + KNOWN_COINS)
+
+
+class SentimentCache:
+    """SQLite cache of article scores keyed by content hash and model version."""
+
+    def __init__(self, path: str = "data/cache/sentiment.sqlite"):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file holding the scores
+        """
+        self.path = path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache, creating it on first use."""
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment ("
+                " content_hash TEXT NOT NULL,"
+                " model TEXT NOT NULL,"
+                " result TEXT NOT NULL,"
+                " PRIMARY KEY (content_hash, model))"
+            )
+            self._initialized = True
+        return conn
+
+    def get_many(self, hashes: List[str], model: str) -> Dict[str, Dict[str, Any]]:
+        """Return the cached results for the given hashes, keyed by hash."""
+        if not hashes:
+            return {}
+        conn = self._connect()
+        try:
+            found = {}
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT content_hash, result FROM sentiment WHERE model = ?"
+                    f" AND content_hash IN ({','.join('?' * len(batch))})",
+                    [model, *batch]
+                ).fetchall()
+                found.update((key, json.loads(result)) for key, result in rows)
+        finally:
+            conn.close()
+        return found
+
+    def put_many(self, results: Dict[str, Dict[str, Any]], model: str):
+        """Store results keyed by content hash."""
+        if not results:
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sentiment (content_hash, model, result) VALUES (?, ?, ?)",
+                    [(key, model, json.dumps(result)) for key, result in results.items()]
+                )
+        finally:
+            conn.close()
+
+
+class SentimentScorer:
+    """
+    Batched lexicon sentiment scorer for blog articles.
+
+    A whole batch of articles is tokenized into one flat token array; the
+    vocabulary is looked up once per distinct word, and sentence, article
+    and per-coin scores are array reductions (np.bincount) over that batch.
+    A coin's score in an article comes from the sentences that mention it,
+    plus the article's sentences that mention no coin at all.
+    """
+
+    def __init__(
+        self,
+        lexicon: Optional[Dict[str, float]] = None,
+        mentions: Optional[MentionIndex] = None,
+        cache: Optional[SentimentCache] = None,
+        batch_size: int = 2000
+    ):
+        """
+        Initialize the scorer.
+
+        Args:
+            lexicon: Word valences (defaults to SENTIMENT_LEXICON)
+            mentions: Coin mention index (defaults to KNOWN_COINS)
+            cache: Optional cache of results by article hash
+            batch_size: Articles scored per batch
+        """
+        self.lexicon = lexicon if lexicon is not None else SENTIMENT_LEXICON
+        self.mentions = mentions or MentionIndex()
+        self.cache = cache
+        self.batch_size = batch_size
+
+        lexicon_hash = LEXICON_VERSION if lexicon is None else hashlib.sha256(
+            json.dumps(sorted(self.lexicon.items())).encode("utf-8")
+        ).hexdigest()[:12]
+        self.model = f"lexicon-{lexicon_hash}:{self.mentions.fingerprint}"
+
+    def score_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Score article texts (no caching).
+
+        Args:
+            texts: Article texts
+
+        Returns:
+            One dictionary per text with an overall 'sentiment' (0..1) and
+            'coins', mapping each mentioned symbol to its sentiment and
+            number of mentions
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(texts), self.batch_size):
+            results.extend(self._score_batch(texts[start:start + self.batch_size]))
+        return results
+
+    def _score_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        tokens_per_text = [_TOKEN.findall(text or "") for text in texts]
+        lengths = np.fromiter((len(tokens) for tokens in tokens_per_text), dtype=np.int64, count=len(texts))
+        results = [{"sentiment": 0.5, "coins": {}} for _ in texts]
+        if not lengths.sum():
+            return results
+
+        flat = list(chain.from_iterable(tokens_per_text))
+        doc = np.repeat(np.arange(len(texts)), lengths)
+
+        # Look each distinct token up once
+        codes, vocabulary = pd.factorize(np.array(flat, dtype=object))
+        lowered = [word.lower() for word in vocabulary]
+        valence = np.array([self.lexicon.get(word, 0.0) for word in lowered])[codes]
+        is_negation = np.array([word in NEGATIONS for word in lowered])[codes]
+        is_terminator = np.array([not word[0].isalpha() for word in vocabulary])[codes]
+
+        # Sentence ids run across the whole batch; a new article starts a new sentence
+        starts = np.zeros(len(flat), dtype=bool)
+        starts[(np.cumsum(lengths) - lengths)[lengths > 0]] = True
+        starts[1:] |= is_terminator[:-1]
+        sentence = np.cumsum(starts) - 1
+
+        negated = np.zeros(len(flat), dtype=bool)
+        for shift in range(1, NEGATION_WINDOW + 1):
+            negated[shift:] |= is_negation[:-shift] & (sentence[shift:] == sentence[:-shift])
+        valence = np.where(negated, -valence, valence)
+
+        n_sentences = sentence[-1] + 1
+        sentence_valence = np.bincount(sentence, weights=valence, minlength=n_sentences)
+        sentence_doc = np.zeros(n_sentences, dtype=np.int64)
+        sentence_doc[sentence] = doc
+        doc_valence = np.bincount(sentence_doc, weights=sentence_valence, minlength=len(texts))
+        for i, score in enumerate(_normalize(doc_valence)):
+            results[i]["sentiment"] = float(score)
+
+        coin_of = self._coin_codes(vocabulary, lowered)[codes]
+        self._resolve_phrases(flat, lowered, codes, coin_of)
+        positions = np.flatnonzero(coin_of >= 0)
+        if not len(positions):
+            return results
+
+        mentions = pd.DataFrame({
+            "doc": doc[positions],
+            "sentence": sentence[positions],
+            "coin": coin_of[positions],
+        })
+        # A sentence counts once per coin, however often the coin is named in it
+        per_sentence = mentions.drop_duplicates(["sentence", "coin"])
+        per_sentence = per_sentence.assign(valence=sentence_valence[per_sentence["sentence"].to_numpy()])
+        coin_valence = per_sentence.groupby(["doc", "coin"])["valence"].sum()
+
+        # Sentences without any coin mention describe the article's coins as a whole
+        mentioned = np.unique(mentions["sentence"].to_numpy())
+        context = doc_valence - np.bincount(sentence_doc[mentioned], weights=sentence_valence[mentioned],
+                                            minlength=len(texts))
+        coin_valence += context[coin_valence.index.get_level_values("doc")]
+        coin_sentiment = _normalize(coin_valence.to_numpy())
+        counts = mentions.groupby(["doc", "coin"]).size().reindex(coin_valence.index)
+
+        for (i, coin), score, count in zip(coin_valence.index, coin_sentiment, counts):
+            symbol = self.mentions.coins[coin][1]
+            results[i]["coins"][symbol] = {"sentiment": float(score), "mentions": int(count)}
+        return results
+
+    def _coin_codes(self, vocabulary, lowered: List[str]) -> np.ndarray:
+        """Coin index of each distinct token (-1 if it names no coin)."""
+        coin_codes = np.full(len(vocabulary), -1, dtype=np.int64)
+        for code, (word, lower) in enumerate(zip(vocabulary, lowered)):
+            if word.isupper() and word in self.mentions.symbols:
+                coin_codes[code] = self.mentions.symbols[word]
+            elif lower in self.mentions.words:
+                coin_codes[code] = self.mentions.words[lower]
+        return coin_codes
+
+    def _resolve_phrases(self, flat: List[str], lowered: List[str], codes: np.ndarray, coin_of: np.ndarray):
+        """Mark multi-word coin names in place (the first word carries the mention)."""
+        if not self.mentions.phrases:
+            return
+        starts = np.array([word in self.mentions.phrases for word in lowered])[codes]
+        for position in np.flatnonzero(starts):
+            for rest, coin in self.mentions.phrases[lowered[codes[position]]]:
+                end = position + 1 + len(rest)
+                if end <= len(flat) and [word.lower() for word in flat[position + 1:end]] == rest:
+                    coin_of[position] = coin
+                    coin_of[position + 1:end] = -1
+                    break
+
+    def score_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score articles, reusing cached results for texts scored before.
+
+        Args:
+            articles: Dictionaries with text and, optionally, content_hash
+                (as stored by ArticleStore)
+
+        Returns:
+            One result per article, as returned by score_texts()
+        """
+        hashes = [article.get("content_hash") or content_hash(article.get("text") or "") for article in articles]
+        cached = self.cache.get_many(list(set(hashes)), self.model) if self.cache else {}
+
+        missing: Dict[str, str] = {}
+        for key, article in zip(hashes, articles):
+            if key not in cached:
+                missing.setdefault(key, article.get("text") or "")
+
+        if missing:
+            scored = dict(zip(missing, self.score_texts(list(missing.values()))))
+            if self.cache:
+                self.cache.put_many(scored, self.model)
+            cached.update(scored)
+
+        logger.info(f"Scored {len(missing)} articles ({len(articles) - len(missing)} from cache)")
+        return [cached[key] for key in hashes]
+
+    def coin_sentiment(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Aggregate article scores into one sentiment row per source and coin.
+
+        Args:
+            articles: Dictionaries with source and text (see score_articles)
+
+        Returns:
+            List of dictionaries with name, symbol, sentiment (mention-weighted
+            mean, 0..1), trend, mentions, articles and source
+        """
+        totals: Dict[Tuple[str, str], List[float]] = {}
+        for article, result in zip(articles, self.score_articles(articles)):
+            for symbol, coin in result["coins"].items():
+                total = totals.setdefault((article.get("source"), symbol), [0.0, 0, 0])
+                total[0] += coin["sentiment"] * coin["mentions"]
+                total[1] += coin["mentions"]
+                total[2] += 1
+
+        names = {symbol: name for name, symbol in self.mentions.coins}
+        rows = []
+        for (source, symbol), (weighted, mentions, count) in totals.items():
+            sentiment = round(weighted / mentions, 4)
+            rows.append({
+                "name": names[symbol],
+                "symbol": symbol,
+                "sentiment": sentiment,
+                "trend": sentiment_trend(sentiment),
+                "mentions": mentions,
+                "articles": count,
+                "source": source,
+            })
+        rows.sort(key=lambda row: (-row["mentions"], row["symbol"]))
+        return rows
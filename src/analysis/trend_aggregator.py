@@ -0,0 +1,366 @@
+# src/analysis/trend_aggregator.py
+import math
+import heapq
+import logging
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .market_analyzer import market_sentiment
+
+logger = logging.getLogger(__name__)
+
+# Gainers and losers reported, as in MarketAnalyzer.analyze_market_trends
+DEFAULT_TOP_K = 5
+
+# Heaps are rebuilt once stale entries outnumber live ones by this factor
+_COMPACT_RATIO = 2
+
+
+class TrendAggregator:
+    """
+    Incrementally maintained market trend statistics over coin rows.
+
+    Keeps the summary of MarketAnalyzer.analyze_market_trends() up to date
+    as quotes change, without rescanning the market:
+
+    - the mean from a running sum and count,
+    - the exact median from two heaps (a max-heap of the lower half and a
+      min-heap of the upper half),
+    - positive / negative / unchanged counters,
+    - gainers and losers from a max-heap and a min-heap of all values.
+
+    Heap entries are never removed in place: replacing a row's value pushes
+    a new entry and leaves the old one stale, to be dropped when it reaches
+    the top. An update therefore costs O(log n) and reading the top k costs
+    O(k log n). Heaps are rebuilt (and the running sum recomputed, which
+    bounds rounding drift) once stale entries dominate.
+
+    Rows are identified by a key (the DataFrame index label for
+    from_frame()); a missing (NaN) change counts as a row but is left out of
+    every statistic, as the pandas reductions skip it.
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        """
+        Initialize an empty aggregator.
+
+        Args:
+            top_k: Number of gainers and losers to report
+        """
+        self.top_k = top_k
+        self._values: Dict[Hashable, float] = {}
+        self._info: Dict[Hashable, Tuple[Any, Any]] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._by_symbol: Dict[str, List[Hashable]] = {}
+        self._seq: Dict[Hashable, int] = {}
+        self._next_order = 0
+        self._next_seq = 0
+
+        self._sum = 0.0
+        self._count = 0
+        self._positive = 0
+        self._negative = 0
+        self._neutral = 0
+
+        # Median halves: _lower holds (-value, seq, key), _upper (value, seq, key)
+        self._lower: List[Tuple[float, int, Hashable]] = []
+        self._upper: List[Tuple[float, int, Hashable]] = []
+        self._side: Dict[Hashable, bool] = {}  # True if the row's value is in the lower half
+        self._lower_size = 0
+        self._upper_size = 0
+
+        # All values for gainers (-value, order, seq, key) and losers (value, order, seq, key)
+        self._gainers: List[Tuple[float, int, int, Hashable]] = []
+        self._losers: List[Tuple[float, int, int, Hashable]] = []
+
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, top_k: int = DEFAULT_TOP_K) -> "TrendAggregator":
+        """
+        Build an aggregator from a market snapshot, one row per DataFrame row.
+
+        Args:
+            data: DataFrame with change_24h (and name / symbol)
+            top_k: Number of gainers and losers to report
+
+        Returns:
+            TrendAggregator keyed by the index labels (by position if the
+            index has duplicates)
+        """
+        aggregator = cls(top_k)
+        if data.empty:
+            return aggregator
+
+        keys = data.index if data.index.is_unique else range(len(data))
+        changes = data['change_24h'] if 'change_24h' in data.columns else pd.Series(float('nan'), index=data.index)
+        names = data['name'] if 'name' in data.columns else pd.Series(None, index=data.index)
+        symbols = data['symbol'] if 'symbol' in data.columns else pd.Series(None, index=data.index)
+        for key, change, name, symbol in zip(keys, changes.to_numpy(dtype=float, na_value=float('nan')), names, symbols):
+            aggregator.update(key, change, name, symbol)
+        return aggregator
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def update(self, key: Hashable, change_24h: Optional[float], name: Any = None, symbol: Any = None):
+        """
+        Insert a row or replace its 24h change.
+
+        Args:
+            key: Row identifier
+            change_24h: New 24h change in percent (None / NaN if unknown)
+            name: Coin name (kept from the first update if omitted)
+            symbol: Coin symbol (kept from the first update if omitted)
+        """
+        value = float('nan') if change_24h is None else float(change_24h)
+        with self._lock:
+            if key in self._values:
+                old_name, old_symbol = self._info[key]
+                self._discard(key)
+                name = old_name if name is None else name
+                if symbol is None:
+                    symbol = old_symbol
+                elif symbol != old_symbol:
+                    self._unindex_symbol(key, old_symbol)
+                    self._index_symbol(key, symbol)
+            else:
+                self._order[key] = self._next_order
+                self._next_order += 1
+                self._index_symbol(key, symbol)
+            self._info[key] = (name, symbol)
+            self._insert(key, value)
+            self._maybe_compact()
+
+    def remove(self, key: Hashable):
+        """Remove a row (no-op for unknown keys)."""
+        with self._lock:
+            if key not in self._values:
+                return
+            self._discard(key)
+            self._unindex_symbol(key, self._info.pop(key)[1])
+            del self._values[key], self._order[key]
+            self._maybe_compact()
+
+    def apply_quotes(self, quotes: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Apply streamed quotes, like MarketAnalyzer.apply_live_quotes().
+
+        Every row of a quoted symbol that already has a 24h change gets the
+        new one; rows without a change (e.g. sentiment-only rows) are left
+        alone.
+
+        Args:
+            quotes: Latest quotes keyed by symbol (e.g. QuoteBook.changes_since)
+
+        Returns:
+            Number of rows updated
+        """
+        updated = 0
+        for symbol, quote in quotes.items():
+            change = quote.get('change_24h')
+            if change is None:
+                continue
+            for key in list(self._by_symbol.get(str(symbol).upper(), ())):
+                if not math.isnan(self._values.get(key, float('nan'))):
+                    self.update(key, change)
+                    updated += 1
+        return updated
+
+    def apply_deltas(self, deltas: Iterable[Dict[str, Any]]) -> int:
+        """QuoteBook listener: apply the deltas of one apply() call (see QuoteBook.subscribe)."""
+        return self.apply_quotes({delta['symbol']: delta for delta in deltas})
+
+    def median(self) -> Optional[float]:
+        """Median 24h change (None without values)."""
+        with self._lock:
+            return self._median()
+
+    def top(self, k: Optional[int] = None, largest: bool = True) -> List[Dict[str, Any]]:
+        """
+        Rows with the largest (or smallest) 24h change.
+
+        Ties keep the order in which rows were first added, as
+        DataFrame.nlargest / nsmallest keep the first occurrence.
+
+        Args:
+            k: Number of rows (defaults to top_k)
+            largest: Gainers if True, losers otherwise
+
+        Returns:
+            List of dictionaries with name, symbol and change_24h
+        """
+        with self._lock:
+            return self._top(self.top_k if k is None else k, largest)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Current trend statistics.
+
+        Returns:
+            Dictionary with the keys of MarketAnalyzer.analyze_market_trends()
+        """
+        if not self._values:
+            return {"status": "error", "message": "No data available for analysis"}
+
+        with self._lock:
+            avg_change_24h = self._sum / self._count if self._count else None
+            median_change_24h = self._median()
+            return {
+                "status": "success",
+                "avg_change_24h": avg_change_24h,
+                "median_change_24h": median_change_24h,
+                "positive_performers": self._positive,
+                "negative_performers": self._negative,
+                "neutral_performers": self._neutral,
+                "positive_ratio": self._positive / len(self._values),
+                "market_sentiment": market_sentiment(avg_change_24h),
+                "top_gainers": self._top(self.top_k, largest=True),
+                "top_losers": self._top(self.top_k, largest=False)
+            }
+
+    def _top(self, k: int, largest: bool) -> List[Dict[str, Any]]:
+        heap = self._gainers if largest else self._losers
+        taken = []
+        while heap and len(taken) < k:
+            entry = heapq.heappop(heap)
+            if self._seq.get(entry[3]) == entry[2]:
+                taken.append(entry)
+        # Stale entries met on the way stay dropped; live ones go back
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return [
+            {"name": self._info[key][0], "symbol": self._info[key][1], "change_24h": self._values[key]}
+            for _, _, _, key in taken
+        ]
+
+    def _index_symbol(self, key: Hashable, symbol: Any):
+        if isinstance(symbol, str):
+            self._by_symbol.setdefault(symbol.upper(), []).append(key)
+
+    def _unindex_symbol(self, key: Hashable, symbol: Any):
+        if isinstance(symbol, str):
+            keys = self._by_symbol.get(symbol.upper(), [])
+            if key in keys:
+                keys.remove(key)
+            if not keys:
+                self._by_symbol.pop(symbol.upper(), None)
+
+    def _insert(self, key: Hashable, value: float):
+        """Add a row's value to every statistic (the row must not be counted yet)."""
+        self._values[key] = value
+        if math.isnan(value):
+            self._seq.pop(key, None)
+            return
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seq[key] = seq
+
+        self._sum += value
+        self._count += 1
+        if value > 0:
+            self._positive += 1
+        elif value < 0:
+            self._negative += 1
+        else:
+            self._neutral += 1
+
+        order = self._order[key]
+        heapq.heappush(self._gainers, (-value, order, seq, key))
+        heapq.heappush(self._losers, (value, order, seq, key))
+
+        self._prune(self._lower)
+        if self._lower_size == 0 or value <= -self._lower[0][0]:
+            heapq.heappush(self._lower, (-value, seq, key))
+            self._side[key] = True
+            self._lower_size += 1
+        else:
+            heapq.heappush(self._upper, (value, seq, key))
+            self._side[key] = False
+            self._upper_size += 1
+        self._rebalance()
+
+    def _discard(self, key: Hashable):
+        """Take a row's current value out of every statistic (its heap entries become stale)."""
+        value = self._values[key]
+        if math.isnan(value):
+            return
+
+        self._seq.pop(key)
+        self._sum -= value
+        self._count -= 1
+        if value > 0:
+            self._positive -= 1
+        elif value < 0:
+            self._negative -= 1
+        else:
+            self._neutral -= 1
+
+        if self._side.pop(key):
+            self._lower_size -= 1
+        else:
+            self._upper_size -= 1
+        self._rebalance()
+
+    def _is_live(self, entry: Tuple[float, int, Hashable]) -> bool:
+        return self._seq.get(entry[2]) == entry[1]
+
+    def _prune(self, heap: List[Tuple[float, int, Hashable]]):
+        """Drop stale entries from the top of a median heap."""
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+
+    def _rebalance(self):
+        """Keep the lower half equal in size to the upper half, or one larger."""
+        while self._lower_size > self._upper_size + 1:
+            self._prune(self._lower)
+            value, seq, key = heapq.heappop(self._lower)
+            heapq.heappush(self._upper, (-value, seq, key))
+            self._side[key] = False
+            self._lower_size -= 1
+            self._upper_size += 1
+        while self._upper_size > self._lower_size:
+            self._prune(self._upper)
+            value, seq, key = heapq.heappop(self._upper)
+            heapq.heappush(self._lower, (-value, seq, key))
+            self._side[key] = True
+            self._upper_size -= 1
+            self._lower_size += 1
+
+    def _median(self) -> Optional[float]:
+        if self._count == 0:
+            return None
+        self._prune(self._lower)
+        if self._lower_size > self._upper_size:
+            return -self._lower[0][0]
+        self._prune(self._upper)
+        return (-self._lower[0][0] + self._upper[0][0]) / 2
+
+    def _maybe_compact(self):
+        """Rebuild the heaps from the live values once stale entries dominate."""
+        # Reads pop stale entries off whichever heap they touch, so any one
+        # heap can stay small while the others grow
+        size = max(len(self._gainers), len(self._losers), len(self._lower) + len(self._upper))
+        if size <= _COMPACT_RATIO * self._count + 64:
+            return
+
+        live = sorted(
+            (value, self._order[key], self._seq[key], key)
+            for key, value in self._values.items() if not math.isnan(value)
+        )
+        self._losers = live
+        self._gainers = [(-value, order, seq, key) for value, order, seq, key in live]
+        heapq.heapify(self._gainers)
+
+        # The sorted values split straight into the two median halves
+        half = (len(live) + 1) // 2
+        self._lower = [(-value, seq, key) for value, _, seq, key in live[:half]]
+        heapq.heapify(self._lower)
+        self._upper = [(value, seq, key) for value, _, seq, key in live[half:]]
+        self._side = {key: index < half for index, (_, _, _, key) in enumerate(live)}
+        self._lower_size, self._upper_size = half, len(live) - half
+        self._sum = math.fsum(value for value, _, _, _ in live)
+        logger.debug(f"Compacted trend heaps to {len(live)} values")
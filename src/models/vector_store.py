@@ -1,9 +1,11 @@
 # src/models/vector_store.py
 import os
 from langchain_community.vectorstores import FAISS
-from langchain_community.document_loaders import TextLoader 
+from langchain_community.document_loaders import TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
 from .embeddings import get_embedding_model
+from ..utils.data_processing import dataframe_to_records
 
 
 def build_vector_store_from_docs(doc_paths):
@@ -30,11 +32,34 @@ def build_vector_store_from_docs(doc_paths):
         except Exception as e:
             print(f"⚠️ Failed to load {path}: {e}")
 
+    return build_vector_store_from_documents(documents)
+
+
+def build_vector_store_from_documents(documents, chunk_size=500, chunk_overlap=50):
+    """
+    Builds a FAISS vector store from in-memory documents.
+
+    Only documents longer than chunk_size are split; short ones (such as
+    one record per coin) are embedded as they are.
+
+    Args:
+        documents (List[Document]): Documents to index
+        chunk_size (int): Maximum characters per chunk
+        chunk_overlap (int): Characters shared by consecutive chunks
+
+    Returns:
+        FAISS vector store object
+    """
     if not documents:
         raise ValueError("No valid documents found to build vector store.")
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    chunks = splitter.split_documents(documents)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunks = []
+    for document in documents:
+        if len(document.page_content) > chunk_size:
+            chunks.extend(splitter.split_documents([document]))
+        else:
+            chunks.append(document)
 
     if not chunks:
         raise ValueError("Document splitting failed. No chunks created.")
@@ -43,3 +68,32 @@ def build_vector_store_from_docs(doc_paths):
     vectorstore = FAISS.from_documents(chunks, embeddings)
 
     return vectorstore
+
+
+def dataframe_to_documents(data):
+    """
+    Converts market data rows into documents, one per row.
+
+    Args:
+        data (pd.DataFrame): Coin rows (market and/or sentiment columns)
+
+    Returns:
+        List[Document] with the row rendered as text and its values as metadata
+    """
+    return [
+        Document(page_content=record["text"], metadata=record["metadata"])
+        for record in dataframe_to_records(data)
+    ]
+
+
+def build_vector_store_from_dataframe(data):
+    """
+    Builds a FAISS vector store directly from a market DataFrame.
+
+    Args:
+        data (pd.DataFrame): Coin rows to index
+
+    Returns:
+        FAISS vector store object
+    """
+    return build_vector_store_from_documents(dataframe_to_documents(data))
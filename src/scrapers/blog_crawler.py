@@ -0,0 +1,280 @@
+# src/scrapers/blog_crawler.py
+import re
+import time
+import hashlib
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from .http_client import HttpClient
+from .html_parsing import HAS_LXML
+from .rate_limiter import RateLimiter
+from ..storage.article_store import ArticleStore, content_hash
+
+logger = logging.getLogger(__name__)
+
+# Index pages and article layout per blog. Both blogs render server-side
+# HTML for crawlers; the selectors may need updating when the layouts change.
+BLOG_SOURCES: Dict[str, Dict[str, Any]] = {
+    "Binance Blog": {
+        "index_urls": ["https://www.binance.com/en/blog"],
+        "article_pattern": r"^/en/blog/[\w-]+/[\w-]+$",
+        "title_selector": "h1",
+        "body_selector": "article",
+        "date_selector": "time",
+    },
+    "Kraken Blog": {
+        "index_urls": ["https://blog.kraken.com/"],
+        "article_pattern": r"^/(?:news|product|crypto-education|market-update|security)/[\w-]+/?$",
+        "title_selector": "h1",
+        "body_selector": "article .entry-content, article",
+        "date_selector": "time",
+    },
+}
+
+# Per-domain politeness: (burst, requests per second)
+DEFAULT_POLITENESS = (2, 1.0)
+
+# Shared per-domain request budget, so concurrent crawler processes stay polite together
+DEFAULT_POLITENESS_PATH = "data/cache/blog_politeness.sqlite"
+
+# Known articles are not re-checked more often than this (seconds)
+DEFAULT_RECHECK_AFTER = 6 * 3600
+
+_PARSER = "lxml" if HAS_LXML else "html.parser"
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _select_first(soup, selectors: str):
+    for selector in selectors.split(","):
+        node = soup.select_one(selector.strip())
+        if node is not None:
+            return node
+    return None
+
+
+class BlogCrawler:
+    """
+    Concurrent crawler for the exchange blogs.
+
+    Article pages are fetched on a shared worker pool, while each domain is
+    held to its own request rate and concurrency. Every article is stored
+    with its ETag/Last-Modified validators and two hashes, so a re-crawl
+    sends conditional requests (304 means nothing is downloaded), skips
+    parsing when the page bytes are identical, and only marks the article
+    for re-embedding when its extracted text actually changed.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ArticleStore] = None,
+        client: Optional[HttpClient] = None,
+        sources: Optional[Dict[str, Dict[str, Any]]] = None,
+        politeness: Tuple[float, float] = DEFAULT_POLITENESS,
+        max_per_domain: int = 2,
+        max_workers: int = 8,
+        recheck_after: float = DEFAULT_RECHECK_AFTER,
+        throttle: Optional[RateLimiter] = None
+    ):
+        """
+        Initialize the crawler.
+
+        Args:
+            store: Article store (defaults to DEFAULT_ARTICLE_PATH)
+            client: HttpClient for requests. Defaults to a client without a
+                response cache, so 304 replies reach the crawler
+            sources: Blog configurations (defaults to BLOG_SOURCES)
+            politeness: (burst, requests per second) allowed per domain
+            max_per_domain: Maximum concurrent requests per domain
+            max_workers: Maximum concurrent requests overall
+            recheck_after: Seconds before a known article is checked again
+            throttle: RateLimiter holding the per-domain budgets (domains are
+                added on first use)
+        """
+        self.store = store or ArticleStore()
+        self.client = client or HttpClient(cache=None)
+        self.sources = sources if sources is not None else BLOG_SOURCES
+        self.politeness = politeness
+        self.max_per_domain = max_per_domain
+        self.max_workers = max_workers
+        self.recheck_after = recheck_after
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Language': 'en-US,en;q=0.9',
+        }
+        self._throttle = throttle or RateLimiter(state_path=DEFAULT_POLITENESS_PATH, limits={})
+        self._domain_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """GET a URL within its domain's rate and concurrency limits."""
+        domain = urlparse(url).netloc
+        with self._lock:
+            if domain not in self._domain_slots:
+                # Budgets configured on the throttle beforehand take precedence
+                self._throttle.add_provider(domain, {"free": self.politeness})
+                self._domain_slots[domain] = threading.BoundedSemaphore(self.max_per_domain)
+            slots = self._domain_slots[domain]
+
+        with slots:
+            self._throttle.acquire(domain)
+            return self.client.get(url, headers=dict(self.headers, **(headers or {})))
+
+    def discover(self, source: str) -> List[str]:
+        """
+        Collect article URLs from a blog's index pages.
+
+        Args:
+            source: Name of a configured blog
+
+        Returns:
+            Absolute article URLs in page order, without duplicates
+        """
+        config = self.sources[source]
+        pattern = re.compile(config["article_pattern"])
+        urls: Dict[str, None] = {}
+        for index_url in config["index_urls"]:
+            try:
+                response = self._get(index_url)
+                response.raise_for_status()
+            except Exception as e:
+                logger.error(f"Error fetching {source} index {index_url}: {e}")
+                continue
+
+            soup = BeautifulSoup(response.text, _PARSER)
+            for link in soup.find_all("a", href=True):
+                url = urljoin(index_url, link["href"]).split("#")[0]
+                if urlparse(url).netloc == urlparse(index_url).netloc and pattern.match(urlparse(url).path):
+                    urls[url] = None
+        return list(urls)
+
+    def parse_article(self, html: str, source: str) -> Dict[str, Optional[str]]:
+        """
+        Extract the title, publication date and text of an article page.
+
+        Args:
+            html: Article page source
+            source: Name of the blog the page belongs to
+
+        Returns:
+            Dictionary with title, published and text
+        """
+        config = self.sources[source]
+        soup = BeautifulSoup(html, _PARSER)
+        title = _select_first(soup, config["title_selector"])
+        date = _select_first(soup, config["date_selector"])
+
+        # Drop page chrome so only the article prose is hashed and embedded
+        for tag in soup(["script", "style", "nav", "footer", "aside", "form"]):
+            tag.decompose()
+        body = _select_first(soup, config["body_selector"])
+        if body is not None:
+            text = body.get_text(" ", strip=True)
+        else:
+            text = " ".join(p.get_text(" ", strip=True) for p in soup.find_all("p"))
+
+        published = None
+        if date is not None:
+            published = date.get("datetime") or date.get_text(strip=True)
+        else:
+            meta = soup.find("meta", attrs={"property": "article:published_time"})
+            published = meta.get("content") if meta else None
+
+        return {
+            "title": title.get_text(" ", strip=True) if title is not None else None,
+            "published": published,
+            "text": _WHITESPACE.sub(" ", text).strip(),
+        }
+
+    def fetch_article(self, url: str, source: str, known: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Fetch one article and store it if it is new or its text changed.
+
+        Args:
+            url: Article URL
+            source: Name of the blog
+            known: Stored version of the article, if any
+
+        Returns:
+            Outcome: 'new', 'updated', 'unchanged' or 'not_modified'
+        """
+        headers = {}
+        if known:
+            if known.get("etag"):
+                headers["If-None-Match"] = known["etag"]
+            if known.get("last_modified"):
+                headers["If-Modified-Since"] = known["last_modified"]
+
+        response = self._get(url, headers)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if known and response.status_code == 304:
+            self.store.touch(url, etag, last_modified)
+            return "not_modified"
+        response.raise_for_status()
+
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        if known and known.get("body_hash") == body_hash:
+            self.store.touch(url, etag, last_modified)
+            return "unchanged"
+
+        parsed = self.parse_article(response.text, source)
+        text_hash = content_hash(parsed["text"])
+        now = time.time()
+        changed = not known or known.get("content_hash") != text_hash
+        self.store.save(dict(
+            known or {},
+            url=url,
+            source=source,
+            body_hash=body_hash,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=now,
+            **(dict(parsed, content_hash=text_hash, updated_at=now) if changed else {})
+        ))
+        if not known:
+            return "new"
+        return "updated" if changed else "unchanged"
+
+    def crawl(self, sources: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Crawl the configured blogs and store new or changed articles.
+
+        Args:
+            sources: Blog names to crawl (defaults to all configured blogs)
+
+        Returns:
+            Counts of discovered, new, updated, unchanged, not_modified,
+            skipped (checked recently) and failed articles
+        """
+        stats = {key: 0 for key in ("discovered", "new", "updated", "unchanged", "not_modified", "skipped", "failed")}
+        jobs = []
+        for source in sources or list(self.sources):
+            urls = self.discover(source)
+            stats["discovered"] += len(urls)
+            known = self.store.get_many(urls)
+            now = time.time()
+            for url in urls:
+                article = known.get(url)
+                if article and now - (article.get("fetched_at") or 0) < self.recheck_after:
+                    stats["skipped"] += 1
+                    continue
+                jobs.append((url, source, article))
+
+        if not jobs:
+            return stats
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+            futures = {executor.submit(self.fetch_article, *job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    stats[future.result()] += 1
+                except Exception as e:
+                    logger.error(f"Error fetching article {futures[future]}: {e}")
+                    stats["failed"] += 1
+
+        return stats
@@ -1,16 +1,34 @@
 # src/scrapers/blog_scrapers.py
-import requests
-from bs4 import BeautifulSoup
-
-def scrape_binance_blog():
-    # Dummy return for now
-    return [
-        {"name": "Bitcoin", "sentiment": 0.8, "trend": "bullish", "source": "Binance Blog"},
-        {"name": "Ethereum", "sentiment": 0.75, "trend": "bullish", "source": "Binance Blog"},
-    ]
-
-def scrape_kraken_blog():
-    return [
-        {"name": "Solana", "sentiment": 0.65, "trend": "neutral", "source": "Kraken Blog"},
-        {"name": "Polygon", "sentiment": 0.72, "trend": "bullish", "source": "Kraken Blog"},
-    ]
+import logging
+
+from .blog_crawler import BlogCrawler
+from ..analysis.sentiment import SentimentScorer, SentimentCache
+from ..storage.article_store import ArticleStore
+
+logger = logging.getLogger(__name__)
+
+# Most recent articles per blog that feed the sentiment rows
+SENTIMENT_ARTICLE_LIMIT = 500
+
+def _blog_sentiment(source, store=None, scorer=None, limit=SENTIMENT_ARTICLE_LIMIT):
+    articles = (store or ArticleStore()).articles(source, limit=limit)
+    if not articles:
+        logger.warning(f"No stored {source} articles; run the crawler first")
+        return []
+    return (scorer or SentimentScorer(cache=SentimentCache())).coin_sentiment(articles)
+
+def scrape_binance_blog(store=None, scorer=None):
+    """Per-coin sentiment rows computed from the stored Binance blog articles."""
+    return _blog_sentiment("Binance Blog", store, scorer)
+
+def scrape_kraken_blog(store=None, scorer=None):
+    """Per-coin sentiment rows computed from the stored Kraken blog articles."""
+    return _blog_sentiment("Kraken Blog", store, scorer)
+
+def crawl_binance_blog(crawler=None):
+    """Crawl the Binance blog into the article store; returns crawl counts."""
+    return (crawler or BlogCrawler()).crawl(["Binance Blog"])
+
+def crawl_kraken_blog(crawler=None):
+    """Crawl the Kraken blog into the article store; returns crawl counts."""
+    return (crawler or BlogCrawler()).crawl(["Kraken Blog"])
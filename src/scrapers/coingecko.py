@@ -1,14 +1,46 @@
 # src/scrapers/coingecko.py
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
+import math
 import time
 import random
 import logging
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+import pyarrow as pa
+
+from .http_client import HttpClient, get_http_client
+from .html_parsing import extract_table_rows
+from .columnar import concat_market_tables, market_table
+from ..utils.data_processing import parse_market_columns, parse_market_rows
 
 logger = logging.getLogger(__name__)
 
+# The /coins/markets endpoint returns at most this many coins per page
+MAX_PER_PAGE = 250
+
+# (cell index, selector) of each field in the coins table on the website
+WEB_TABLE_COLUMNS = {
+    'name': (2, '.tw-hidden'),
+    'symbol': (2, '.d-lg-inline'),
+    'price': (3, 'span'),
+    'change_24h': (5, 'span'),
+    'market_cap': (6, 'span'),
+    'volume_24h': (7, 'span')
+}
+
+# Schema metadata key listing the API pages missing from a paged table
+FAILED_PAGES_KEY = b'failed_pages'
+
+# Output column -> field of a /coins/markets item
+MARKETS_FIELDS = {
+    'name': 'name',
+    'symbol': 'symbol',
+    'price': 'current_price',
+    'market_cap': 'market_cap',
+    'volume_24h': 'total_volume',
+    'change_24h': 'price_change_percentage_24h'
+}
+
 class CoinGeckoScraper:
     """
     Scraper for CoinGecko website.
@@ -17,68 +49,49 @@ class CoinGeckoScraper:
     including prices, market caps, volumes, and other metrics.
     """
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, client: HttpClient = None, html_backend: str = None):
         """
         Initialize the CoinGecko scraper.
         
         Args:
             api_key: Optional API key for CoinGecko Pro API access
+            client: Optional HttpClient (defaults to the shared pooled client)
+            html_backend: HTML parser backend for the web fallback (defaults to the fastest available)
         """
         self.base_url = "https://www.coingecko.com"
         self.api_base_url = "https://api.coingecko.com/api/v3"
         self.pro_api_base_url = "https://pro-api.coingecko.com/api/v3"
         self.api_key = api_key
+        self.client = client or get_http_client()
+        self.html_backend = html_backend
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9',
         }
         if api_key:
             self.headers['x_cg_pro_api_key'] = api_key
+        # Rate limit budget used for API calls
+        self.plan = 'pro' if api_key else 'free'
     
     def scrape_top_coins(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Scrape data for top cryptocurrencies from CoinGecko.
         
+        Limits above the API page cap are fetched with scrape_top_coins_paged.
+        
         Args:
             limit: Number of top coins to retrieve
             
         Returns:
             List of dictionaries containing coin data
         """
+        if limit > MAX_PER_PAGE:
+            coins, _ = self.scrape_top_coins_paged(limit)
+            return coins
+        
         try:
             # Use the API for data retrieval (free API has limits)
-            endpoint = f"{self.api_base_url}/coins/markets"
-            params = {
-                'vs_currency': 'usd',
-                'order': 'market_cap_desc',
-                'per_page': limit,
-                'page': 1,
-                'sparkline': False,
-                'price_change_percentage': '24h'
-            }
-            
-            if self.api_key:
-                # Use Pro API if key is available
-                endpoint = f"{self.pro_api_base_url}/coins/markets"
-            
-            response = requests.get(endpoint, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            coin_data = []
-            for item in data:
-                coin = {
-                    'name': item['name'],
-                    'symbol': item['symbol'].upper(),
-                    'price': item['current_price'],
-                    'market_cap': item['market_cap'],
-                    'volume_24h': item['total_volume'],
-                    'change_24h': item['price_change_percentage_24h'],
-                    'source': 'CoinGecko'
-                }
-                coin_data.append(coin)
-            
-            return coin_data
+            return self._fetch_markets_page(page=1, per_page=limit)
             
         except Exception as e:
             logger.error(f"Error using CoinGecko API: {e}")
@@ -86,50 +99,191 @@ class CoinGeckoScraper:
             # Fallback to web scraping if API fails
             return self._scrape_from_web(limit)
     
-    def _scrape_from_web(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Fallback method to scrape from web if API fails."""
+    def scrape_top_coins_table(self, limit: int = 100) -> pa.Table:
+        """
+        Fetch top cryptocurrencies from CoinGecko as a columnar table.
+        
+        Same data as scrape_top_coins, but API pages are turned straight into
+        columns without building a dictionary per coin.
+        
+        Args:
+            limit: Number of top coins to retrieve
+            
+        Returns:
+            pyarrow Table with the MARKET_SCHEMA columns. When some pages of a
+            paged fetch failed, their numbers are listed comma-separated under
+            the FAILED_PAGES_KEY schema metadata key.
+        """
         try:
-            url = f"{self.base_url}/en/coins"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
+            if limit <= MAX_PER_PAGE:
+                return self._fetch_markets_table(page=1, per_page=limit)
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            failures = {}
+            pages = dict(self.iter_top_coin_pages(limit, columnar=True, failures=failures))
+            if pages:
+                table = concat_market_tables(pages[page] for page in sorted(pages))
+                if failures:
+                    failed = ','.join(str(page) for page in sorted(failures))
+                    table = table.replace_schema_metadata({FAILED_PAGES_KEY: failed})
+                return table
             
-            # Extract data from the table - structure may change, requiring updates
-            coin_data = []
+        except Exception as e:
+            logger.error(f"Error using CoinGecko API: {e}")
+        
+        # Fallback to web scraping if the API fails
+        return market_table(self._scrape_web_columns(limit), source='CoinGecko')
+    
+    def scrape_top_coins_paged(
+        self,
+        limit: int = 1000,
+        per_page: int = MAX_PER_PAGE,
+        max_workers: int = 4,
+        pages_per_second: Optional[float] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[int, str]]:
+        """
+        Fetch a large coin universe page by page and merge it in rank order.
+        
+        Args:
+            limit: Number of top coins to retrieve
+            per_page: Coins per API page (capped at MAX_PER_PAGE)
+            max_workers: Maximum number of pages fetched concurrently
+            pages_per_second: Optional cap on the page request start rate
             
-            # This is a simplified example - actual implementation would need to adapt to 
-            # CoinGecko's current HTML structure
-            rows = soup.select('table.sort tbody tr')
+        Returns:
+            Tuple of (list of dictionaries containing coin data ordered by
+            market cap rank, dictionary mapping each failed page number to its
+            error message). The coin list is missing the failed pages' ranks.
+        """
+        pages = {}
+        failures = {}
+        for page, coins in self.iter_top_coin_pages(limit, per_page, max_workers, pages_per_second,
+                                                    failures=failures):
+            pages[page] = coins
+        
+        if not pages:
+            # Fallback to web scraping if every API page failed
+            return self._scrape_from_web(limit), failures
+        
+        return [coin for page in sorted(pages) for coin in pages[page]], failures
+    
+    def iter_top_coin_pages(
+        self,
+        limit: int = 1000,
+        per_page: int = MAX_PER_PAGE,
+        max_workers: int = 4,
+        pages_per_second: Optional[float] = None,
+        columnar: bool = False,
+        failures: Optional[Dict[int, str]] = None
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Fetch market pages concurrently and yield each one as it arrives.
+        
+        Pages are yielded in completion order, so callers can start processing
+        before the whole universe has been downloaded. Failed pages are logged,
+        recorded in failures and skipped.
+        
+        Args:
+            limit: Number of top coins to retrieve
+            per_page: Coins per API page (capped at MAX_PER_PAGE)
+            max_workers: Maximum number of pages fetched concurrently
+            pages_per_second: Optional cap on the page request start rate
+            columnar: Yield each page as a MARKET_SCHEMA table instead of a list
+            failures: Optional dictionary that receives each failed page number
+                mapped to its error message
             
-            for row in rows[:limit]:
+        Yields:
+            Tuples of (1-based page number, list of coin dictionaries or table)
+        """
+        per_page = max(1, min(per_page, MAX_PER_PAGE))
+        page_count = math.ceil(limit / per_page)
+        if page_count <= 0:
+            return
+        
+        interval = 1.0 / pages_per_second if pages_per_second else 0.0
+        start = time.monotonic()
+        fetch = self._fetch_markets_table if columnar else self._fetch_markets_page
+        
+        def fetch_page(page: int):
+            # Spread request starts over time to stay inside the rate budget
+            delay = start + (page - 1) * interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            return fetch(page, per_page)
+        
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, page_count))
+        try:
+            futures = {executor.submit(fetch_page, page): page for page in range(1, page_count + 1)}
+            for future in as_completed(futures):
+                page = futures[future]
                 try:
-                    name_elem = row.select_one('td:nth-child(3) .tw-hidden')
-                    symbol_elem = row.select_one('td:nth-child(3) .d-lg-inline')
-                    price_elem = row.select_one('td:nth-child(4) span')
-                    change_elem = row.select_one('td:nth-child(6) span')
-                    market_cap_elem = row.select_one('td:nth-child(7) span')
-                    volume_elem = row.select_one('td:nth-child(8) span')
-                    
-                    # Skip if any essential element is missing
-                    if not all([name_elem, symbol_elem, price_elem]):
-                        continue
-                    
-                    coin = {
-                        'name': name_elem.text.strip(),
-                        'symbol': symbol_elem.text.strip().upper(),
-                        'price': self._parse_price(price_elem.text.strip()),
-                        'change_24h': self._parse_percentage(change_elem.text.strip()) if change_elem else None,
-                        'market_cap': self._parse_market_cap(market_cap_elem.text.strip()) if market_cap_elem else None,
-                        'volume_24h': self._parse_volume(volume_elem.text.strip()) if volume_elem else None,
-                        'source': 'CoinGecko'
-                    }
-                    
-                    coin_data.append(coin)
-                    
+                    coins = future.result()
                 except Exception as e:
-                    logger.warning(f"Error parsing coin row: {e}")
+                    logger.error(f"Error fetching CoinGecko markets page {page}: {e}")
+                    if failures is not None:
+                        failures[page] = str(e)
                     continue
+                
+                # The last page may overshoot the requested limit
+                remaining = limit - (page - 1) * per_page
+                yield page, coins[:remaining]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _fetch_markets_page(self, page: int, per_page: int) -> List[Dict[str, Any]]:
+        """Fetch one page of the /coins/markets endpoint."""
+        data = self._fetch_markets_json(page, per_page)
+        
+        coin_data = []
+        for item in data:
+            coin = {
+                'name': item['name'],
+                'symbol': item['symbol'].upper(),
+                'price': item['current_price'],
+                'market_cap': item['market_cap'],
+                'volume_24h': item['total_volume'],
+                'change_24h': item['price_change_percentage_24h'],
+                'source': 'CoinGecko'
+            }
+            coin_data.append(coin)
+        
+        return coin_data
+    
+    def _fetch_markets_table(self, page: int, per_page: int) -> pa.Table:
+        """Fetch one page of the /coins/markets endpoint as a table."""
+        fetched_at = time.time()
+        data = self._fetch_markets_json(page, per_page)
+        
+        columns = {field: [item[key] for item in data] for field, key in MARKETS_FIELDS.items()}
+        columns['symbol'] = [symbol.upper() for symbol in columns['symbol']]
+        return market_table(columns, source='CoinGecko', fetched_at=fetched_at)
+    
+    def _fetch_markets_json(self, page: int, per_page: int) -> List[Dict[str, Any]]:
+        """Request one page of the /coins/markets endpoint and decode it."""
+        endpoint = f"{self.api_base_url}/coins/markets"
+        params = {
+            'vs_currency': 'usd',
+            'order': 'market_cap_desc',
+            'per_page': per_page,
+            'page': page,
+            'sparkline': False,
+            'price_change_percentage': '24h'
+        }
+        
+        if self.api_key:
+            # Use Pro API if key is available
+            endpoint = f"{self.pro_api_base_url}/coins/markets"
+        
+        response = self.client.get(endpoint, headers=self.headers, params=params,
+                                   provider='coingecko', plan=self.plan)
+        response.raise_for_status()
+        return response.json()
+    
+    def _scrape_from_web(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Fallback method to scrape from web if API fails."""
+        try:
+            rows = self._fetch_web_rows(limit)
+            
+            coin_data = parse_market_rows(rows, source='CoinGecko', uppercase_symbols=True)
             
             return coin_data
             
@@ -137,45 +291,26 @@ class CoinGeckoScraper:
             logger.error(f"Error scraping CoinGecko website: {e}")
             return []
     
-    def _parse_price(self, price_str: str) -> float:
-        """Parse price string to float."""
+    def _scrape_web_columns(self, limit: int = 100) -> Dict[str, Any]:
+        """Columnar variant of _scrape_from_web (empty columns on failure)."""
         try:
-            # Remove currency symbols and commas
-            price_str = price_str.replace('$', '').replace(',', '')
-            return float(price_str)
-        except (ValueError, TypeError):
-            return None
-    
-    def _parse_percentage(self, percentage_str: str) -> float:
-        """Parse percentage string to float."""
-        try:
-            # Remove % symbol
-            percentage_str = percentage_str.replace('%', '')
-            return float(percentage_str)
-        except (ValueError, TypeError):
-            return None
-    
-    def _parse_market_cap(self, market_cap_str: str) -> float:
-        """Parse market cap string to float."""
-        try:
-            # Handle abbreviations like $1.2B or $900M
-            market_cap_str = market_cap_str.replace('$', '').replace(',', '')
-            
-            if 'B' in market_cap_str:
-                return float(market_cap_str.replace('B', '')) * 1_000_000_000
-            elif 'M' in market_cap_str:
-                return float(market_cap_str.replace('M', '')) * 1_000_000
-            elif 'K' in market_cap_str:
-                return float(market_cap_str.replace('K', '')) * 1_000
-            else:
-                return float(market_cap_str)
-        except (ValueError, TypeError):
-            return None
+            rows = self._fetch_web_rows(limit)
+        except Exception as e:
+            logger.error(f"Error scraping CoinGecko website: {e}")
+            rows = []
+        return parse_market_columns(rows, uppercase_symbols=True)
     
-    def _parse_volume(self, volume_str: str) -> float:
-        """Parse volume string to float."""
-        # Same logic as market cap parsing
-        return self._parse_market_cap(volume_str)
+    def _fetch_web_rows(self, limit: int) -> List[Dict[str, Any]]:
+        """Download the coins page and extract the raw text of the market table."""
+        url = f"{self.base_url}/en/coins"
+        response = self.client.get(url, headers=self.headers)
+        response.raise_for_status()
+        
+        # Extract data from the table - structure may change, requiring updates
+        # This is a simplified example - actual implementation would need to adapt to 
+        # CoinGecko's current HTML structure
+        return extract_table_rows(response.text, WEB_TABLE_COLUMNS, table_class='sort',
+                                  limit=limit, backend=self.html_backend)
     
     def get_coin_details(self, coin_id: str) -> Dict[str, Any]:
         """
@@ -188,69 +323,112 @@ class CoinGeckoScraper:
             Dictionary containing detailed coin data
         """
         try:
-            endpoint = f"{self.api_base_url}/coins/{coin_id}"
-            params = {
-                'localization': False,
-                'tickers': False,
-                'market_data': True,
-                'community_data': True,
-                'developer_data': True
-            }
-            
-            if self.api_key:
-                endpoint = f"{self.pro_api_base_url}/coins/{coin_id}"
-            
-            response = requests.get(endpoint, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract relevant data
-            details = {
-                'name': data['name'],
-                'symbol': data['symbol'].upper(),
-                'source': 'CoinGecko',
-                'description': data['description']['en'],
-                'homepage': data['links']['homepage'][0] if data['links']['homepage'] else None,
-                'github': data['links']['repos_url']['github'][0] if data['links']['repos_url']['github'] else None,
-                'reddit': data['links']['subreddit_url'],
-                'twitter_followers': data['community_data']['twitter_followers'],
-                'reddit_subscribers': data['community_data']['reddit_subscribers'],
-                'github_stars': data['developer_data']['stars'],
-                'github_commits_4_weeks': data['developer_data']['commit_count_4_weeks'],
-                'sentiment_votes_up_percentage': data['sentiment_votes_up_percentage'],
-                'sentiment_votes_down_percentage': data['sentiment_votes_down_percentage']
-            }
-            
-            # Add market data if available
-            if 'market_data' in data:
-                market_data = {
-                    'current_price': data['market_data']['current_price']['usd'],
-                    'market_cap': data['market_data']['market_cap']['usd'],
-                    'market_cap_rank': data['market_data']['market_cap_rank'],
-                    'total_volume': data['market_data']['total_volume']['usd'],
-                    'high_24h': data['market_data']['high_24h']['usd'],
-                    'low_24h': data['market_data']['low_24h']['usd'],
-                    'price_change_24h': data['market_data']['price_change_24h'],
-                    'price_change_percentage_24h': data['market_data']['price_change_percentage_24h'],
-                    'price_change_percentage_7d': data['market_data']['price_change_percentage_7d'],
-                    'price_change_percentage_30d': data['market_data']['price_change_percentage_30d'],
-                    'price_change_percentage_1y': data['market_data']['price_change_percentage_1y'],
-                    'ath': data['market_data']['ath']['usd'],
-                    'ath_change_percentage': data['market_data']['ath_change_percentage']['usd'],
-                    'ath_date': data['market_data']['ath_date']['usd'],
-                    'atl': data['market_data']['atl']['usd'],
-                    'atl_change_percentage': data['market_data']['atl_change_percentage']['usd'],
-                    'atl_date': data['market_data']['atl_date']['usd'],
-                    'roi': data['market_data']['roi'],
-                    'fully_diluted_valuation': data['market_data'].get('fully_diluted_valuation', {}).get('usd'),
-                    'total_supply': data['market_data']['total_supply'],
-                    'max_supply': data['market_data']['max_supply'],
-                    'circulating_supply': data['market_data']['circulating_supply']
-                }
-                details.update(market_data)
-            
-            return details
+            return self._fetch_coin_details(coin_id)
             
         except Exception as e:
             logger.error(f"Error getting coin details for {coin_id}: {e}")
-            return {'name': coin_id.capitalize(), 'source': 'CoinGecko', 'details_available': False}
\ No newline at end of file
+            return {'name': coin_id.capitalize(), 'source': 'CoinGecko', 'details_available': False}
+    
+    def get_coin_details_bulk(
+        self,
+        coin_ids: List[str],
+        max_workers: int = 8
+    ) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        """
+        Get detailed information for many coins concurrently.
+        
+        Requests run on a bounded worker pool and share the client's rate
+        limit budget, so large batches queue politely instead of tripping 429s.
+        
+        Args:
+            coin_ids: CoinGecko IDs for the coins (duplicates are fetched once)
+            max_workers: Maximum number of concurrent requests
+            
+        Returns:
+            Tuple of (DataFrame with one row per fetched coin in input order,
+            dictionary mapping each failed coin ID to its error message)
+        """
+        unique_ids = list(dict.fromkeys(coin_ids))
+        if not unique_ids:
+            return pd.DataFrame(), {}
+        
+        details = {}
+        failures = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_ids))) as executor:
+            futures = {executor.submit(self._fetch_coin_details, coin_id): coin_id for coin_id in unique_ids}
+            for future in as_completed(futures):
+                coin_id = futures[future]
+                try:
+                    details[coin_id] = future.result()
+                except Exception as e:
+                    logger.warning(f"Error getting coin details for {coin_id}: {e}")
+                    failures[coin_id] = str(e)
+        
+        rows = [{'coin_id': coin_id, **details[coin_id]} for coin_id in unique_ids if coin_id in details]
+        return pd.DataFrame(rows), failures
+    
+    def _fetch_coin_details(self, coin_id: str) -> Dict[str, Any]:
+        """Fetch and flatten the /coins/{id} payload for one coin."""
+        endpoint = f"{self.api_base_url}/coins/{coin_id}"
+        params = {
+            'localization': False,
+            'tickers': False,
+            'market_data': True,
+            'community_data': True,
+            'developer_data': True
+        }
+        
+        if self.api_key:
+            endpoint = f"{self.pro_api_base_url}/coins/{coin_id}"
+        
+        response = self.client.get(endpoint, headers=self.headers, params=params,
+                                   provider='coingecko', plan=self.plan)
+        response.raise_for_status()
+        data = response.json()
+        
+        # Extract relevant data
+        details = {
+            'name': data['name'],
+            'symbol': data['symbol'].upper(),
+            'source': 'CoinGecko',
+            'description': data['description']['en'],
+            'homepage': data['links']['homepage'][0] if data['links']['homepage'] else None,
+            'github': data['links']['repos_url']['github'][0] if data['links']['repos_url']['github'] else None,
+            'reddit': data['links']['subreddit_url'],
+            'twitter_followers': data['community_data']['twitter_followers'],
+            'reddit_subscribers': data['community_data']['reddit_subscribers'],
+            'github_stars': data['developer_data']['stars'],
+            'github_commits_4_weeks': data['developer_data']['commit_count_4_weeks'],
+            'sentiment_votes_up_percentage': data['sentiment_votes_up_percentage'],
+            'sentiment_votes_down_percentage': data['sentiment_votes_down_percentage']
+        }
+        
+        # Add market data if available
+        if 'market_data' in data:
+            market_data = {
+                'current_price': data['market_data']['current_price']['usd'],
+                'market_cap': data['market_data']['market_cap']['usd'],
+                'market_cap_rank': data['market_data']['market_cap_rank'],
+                'total_volume': data['market_data']['total_volume']['usd'],
+                'high_24h': data['market_data']['high_24h']['usd'],
+                'low_24h': data['market_data']['low_24h']['usd'],
+                'price_change_24h': data['market_data']['price_change_24h'],
+                'price_change_percentage_24h': data['market_data']['price_change_percentage_24h'],
+                'price_change_percentage_7d': data['market_data']['price_change_percentage_7d'],
+                'price_change_percentage_30d': data['market_data']['price_change_percentage_30d'],
+                'price_change_percentage_1y': data['market_data']['price_change_percentage_1y'],
+                'ath': data['market_data']['ath']['usd'],
+                'ath_change_percentage': data['market_data']['ath_change_percentage']['usd'],
+                'ath_date': data['market_data']['ath_date']['usd'],
+                'atl': data['market_data']['atl']['usd'],
+                'atl_change_percentage': data['market_data']['atl_change_percentage']['usd'],
+                'atl_date': data['market_data']['atl_date']['usd'],
+                'roi': data['market_data']['roi'],
+                'fully_diluted_valuation': data['market_data'].get('fully_diluted_valuation', {}).get('usd'),
+                'total_supply': data['market_data']['total_supply'],
+                'max_supply': data['market_data']['max_supply'],
+                'circulating_supply': data['market_data']['circulating_supply']
+            }
+            details.update(market_data)
+        
+        return details
@@ -1,14 +1,44 @@
 # src/scrapers/coinmarketcap.py
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import random
 import logging
-from typing import List, Dict, Any
+import numpy as np
+import pyarrow as pa
+from typing import List, Dict, Any, Iterator, Optional
+
+from .http_client import HttpClient, get_http_client
+from .html_parsing import extract_table_rows
+from .json_stream import iter_json_array
+from .columnar import empty_market_table, market_table
+from ..utils.data_processing import parse_market_columns, parse_market_rows
 
 logger = logging.getLogger(__name__)
 
+# (cell index, selector) of each field in the listings table on the website;
+# a None index searches the whole row
+WEB_TABLE_COLUMNS = {
+    'name': (None, '.cmc-link'),
+    'symbol': (None, '.coin-item-symbol'),
+    'price': (3, None),
+    'change_24h': (4, None),
+    'market_cap': (6, None),
+    'volume_24h': (7, None)
+}
+
+# Listings at or above this limit are decoded incrementally from the response stream
+STREAM_THRESHOLD = 1000
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Output column -> field in a listing's USD quote
+QUOTE_FIELDS = {
+    'price': 'price',
+    'market_cap': 'market_cap',
+    'volume_24h': 'volume_24h',
+    'change_24h': 'percent_change_24h'
+}
+
 class CoinMarketCapScraper:
     """
     Scraper for CoinMarketCap website.
@@ -17,22 +47,28 @@ class CoinMarketCapScraper:
     including prices, market caps, volumes, and other metrics.
     """
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, client: HttpClient = None, html_backend: str = None):
         """
         Initialize the CoinMarketCap scraper.
         
         Args:
             api_key: Optional API key for CoinMarketCap API access
+            client: Optional HttpClient (defaults to the shared pooled client)
+            html_backend: HTML parser backend for the web fallback (defaults to the fastest available)
         """
         self.base_url = "https://coinmarketcap.com"
         self.api_base_url = "https://pro-api.coinmarketcap.com/v1"
         self.api_key = api_key
+        self.client = client or get_http_client()
+        self.html_backend = html_backend
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9',
         }
         if api_key:
             self.headers['X-CMC_PRO_API_KEY'] = api_key
+        # Rate limit budget used for API calls
+        self.plan = 'pro' if api_key else 'free'
     
     def scrape_top_coins(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -50,47 +86,9 @@ class CoinMarketCapScraper:
                 return self._get_data_from_api(limit)
             
             # Otherwise, fall back to web scraping (note: may be against ToS)
-            url = f"{self.base_url}/en/"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract data from the table - structure may change, requiring updates
-            coin_data = []
+            rows = self._fetch_web_rows(limit)
             
-            # This is a simplified example - actual implementation would need to adapt to 
-            # CoinMarketCap's current HTML structure
-            rows = soup.select('table tbody tr')
-            
-            for row in rows[:limit]:
-                try:
-                    name_elem = row.select_one('.cmc-link')
-                    symbol_elem = row.select_one('.coin-item-symbol')
-                    price_elem = row.select_one('td:nth-child(4)')
-                    change_elem = row.select_one('td:nth-child(5)')
-                    market_cap_elem = row.select_one('td:nth-child(7)')
-                    volume_elem = row.select_one('td:nth-child(8)')
-                    
-                    # Skip if any essential element is missing
-                    if not all([name_elem, symbol_elem, price_elem]):
-                        continue
-                    
-                    coin = {
-                        'name': name_elem.text.strip(),
-                        'symbol': symbol_elem.text.strip(),
-                        'price': self._parse_price(price_elem.text.strip()),
-                        'change_24h': self._parse_percentage(change_elem.text.strip()) if change_elem else None,
-                        'market_cap': self._parse_market_cap(market_cap_elem.text.strip()) if market_cap_elem else None,
-                        'volume_24h': self._parse_volume(volume_elem.text.strip()) if volume_elem else None,
-                        'source': 'CoinMarketCap'
-                    }
-                    
-                    coin_data.append(coin)
-                    
-                except Exception as e:
-                    logger.warning(f"Error parsing coin row: {e}")
-                    continue
+            coin_data = parse_market_rows(rows, source='CoinMarketCap')
             
             return coin_data
             
@@ -98,32 +96,58 @@ class CoinMarketCapScraper:
             logger.error(f"Error scraping CoinMarketCap: {e}")
             return []
     
-    def _get_data_from_api(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get data from CoinMarketCap API instead of scraping."""
-        url = f"{self.api_base_url}/cryptocurrency/listings/latest"
-        parameters = {
-            'start': '1',
-            'limit': str(limit),
-            'convert': 'USD'
-        }
+    def scrape_top_coins_table(self, limit: int = 100) -> pa.Table:
+        """
+        Fetch top cryptocurrencies from CoinMarketCap as a columnar table.
         
+        Same data as scrape_top_coins, but listings are read straight into
+        columns without building a dictionary per coin.
+        
+        Args:
+            limit: Number of top coins to retrieve
+            
+        Returns:
+            pyarrow Table with the MARKET_SCHEMA columns (empty on failure)
+        """
+        fetched_at = time.time()
         try:
-            response = requests.get(url, headers=self.headers, params=parameters)
-            response.raise_for_status()
-            data = response.json()
+            if self.api_key:
+                columns = self.get_listing_columns(limit)
+            else:
+                columns = parse_market_columns(self._fetch_web_rows(limit))
+            return market_table(columns, source='CoinMarketCap', fetched_at=fetched_at)
+            
+        except Exception as e:
+            logger.error(f"Error scraping CoinMarketCap: {e}")
+            return empty_market_table()
+    
+    def _fetch_web_rows(self, limit: int) -> List[Dict[str, Any]]:
+        """Download the home page and extract the raw text of the listings table."""
+        url = f"{self.base_url}/en/"
+        response = self.client.get(url, headers=self.headers)
+        response.raise_for_status()
+        
+        # Extract data from the table - structure may change, requiring updates
+        # This is a simplified example - actual implementation would need to adapt to 
+        # CoinMarketCap's current HTML structure
+        return extract_table_rows(response.text, WEB_TABLE_COLUMNS, limit=limit, backend=self.html_backend)
+    
+    def _get_data_from_api(self, limit: int = 100, stream: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Get data from CoinMarketCap API instead of scraping.
+        
+        Args:
+            limit: Number of top coins to retrieve
+            stream: Decode the listings incrementally from the response stream
+                (defaults to True for limits of STREAM_THRESHOLD and above)
             
+        Returns:
+            List of dictionaries containing coin data
+        """
+        try:
             coin_data = []
-            for item in data['data']:
-                coin = {
-                    'name': item['name'],
-                    'symbol': item['symbol'],
-                    'price': item['quote']['USD']['price'],
-                    'market_cap': item['quote']['USD']['market_cap'],
-                    'volume_24h': item['quote']['USD']['volume_24h'],
-                    'change_24h': item['quote']['USD']['percent_change_24h'],
-                    'source': 'CoinMarketCap'
-                }
-                coin_data.append(coin)
+            for item in self._iter_listing_items(limit, stream):
+                coin_data.append(self._normalize_listing(item))
             
             return coin_data
                 
@@ -131,45 +155,80 @@ class CoinMarketCapScraper:
             logger.error(f"Error fetching data from CoinMarketCap API: {e}")
             return []
     
-    def _parse_price(self, price_str: str) -> float:
-        """Parse price string to float."""
-        try:
-            # Remove currency symbols and commas
-            price_str = price_str.replace('$', '').replace(',', '')
-            return float(price_str)
-        except (ValueError, TypeError):
-            return None
-    
-    def _parse_percentage(self, percentage_str: str) -> float:
-        """Parse percentage string to float."""
-        try:
-            # Remove % symbol
-            percentage_str = percentage_str.replace('%', '')
-            return float(percentage_str)
-        except (ValueError, TypeError):
-            return None
-    
-    def _parse_market_cap(self, market_cap_str: str) -> float:
-        """Parse market cap string to float."""
-        try:
-            # Handle abbreviations like $1.2B or $900M
-            market_cap_str = market_cap_str.replace('$', '').replace(',', '')
+    def get_listing_columns(self, limit: int = 5000, stream: Optional[bool] = None) -> Dict[str, np.ndarray]:
+        """
+        Read the latest listings straight into preallocated column arrays.
+        
+        When streamed, the payload is decoded one listing at a time, so peak
+        memory is the output columns plus a single listing, not the raw body
+        plus the parsed tree plus per-coin dictionaries.
+        
+        Args:
+            limit: Number of top coins to retrieve
+            stream: Decode the listings incrementally from the response stream
+                (defaults to True for limits of STREAM_THRESHOLD and above)
             
-            if 'B' in market_cap_str:
-                return float(market_cap_str.replace('B', '')) * 1_000_000_000
-            elif 'M' in market_cap_str:
-                return float(market_cap_str.replace('M', '')) * 1_000_000
-            elif 'K' in market_cap_str:
-                return float(market_cap_str.replace('K', '')) * 1_000
-            else:
-                return float(market_cap_str)
-        except (ValueError, TypeError):
-            return None
+        Returns:
+            Dictionary of equal-length numpy arrays keyed by name, symbol,
+            price, market_cap, volume_24h and change_24h
+        """
+        names = np.empty(limit, dtype=object)
+        symbols = np.empty(limit, dtype=object)
+        numeric = {field: np.full(limit, np.nan) for field in QUOTE_FIELDS}
+        
+        count = 0
+        for item in self._iter_listing_items(limit, stream):
+            if count == limit:
+                break
+            quote = item['quote']['USD']
+            names[count] = item['name']
+            symbols[count] = item['symbol']
+            for field, quote_key in QUOTE_FIELDS.items():
+                value = quote.get(quote_key)
+                if value is not None:
+                    numeric[field][count] = value
+            count += 1
+        
+        columns = {'name': names[:count], 'symbol': symbols[:count]}
+        columns.update({field: values[:count] for field, values in numeric.items()})
+        return columns
     
-    def _parse_volume(self, volume_str: str) -> float:
-        """Parse volume string to float."""
-        # Same logic as market cap parsing
-        return self._parse_market_cap(volume_str)
+    def _iter_listing_items(self, limit: int, stream: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the raw items of the latest listings, optionally decoded from the response stream."""
+        if stream is None:
+            stream = limit >= STREAM_THRESHOLD
+        
+        url = f"{self.api_base_url}/cryptocurrency/listings/latest"
+        parameters = {
+            'start': '1',
+            'limit': str(limit),
+            'convert': 'USD'
+        }
+        
+        if not stream:
+            response = self.client.get(url, headers=self.headers, params=parameters,
+                                       provider='coinmarketcap', plan=self.plan)
+            response.raise_for_status()
+            yield from response.json()['data']
+            return
+        
+        response = self.client.get(url, headers=self.headers, params=parameters,
+                                   provider='coinmarketcap', plan=self.plan, stream=True)
+        with response:
+            response.raise_for_status()
+            yield from iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), 'data')
+    
+    def _normalize_listing(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten one listings item to the common coin format."""
+        return {
+            'name': item['name'],
+            'symbol': item['symbol'],
+            'price': item['quote']['USD']['price'],
+            'market_cap': item['quote']['USD']['market_cap'],
+            'volume_24h': item['quote']['USD']['volume_24h'],
+            'change_24h': item['quote']['USD']['percent_change_24h'],
+            'source': 'CoinMarketCap'
+        }
     
     def scrape_coin_details(self, coin_slug: str) -> Dict[str, Any]:
         """
@@ -183,7 +242,7 @@ class CoinMarketCapScraper:
         """
         try:
             url = f"{self.base_url}/currencies/{coin_slug}/"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url, headers=self.headers)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
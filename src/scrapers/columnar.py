@@ -0,0 +1,113 @@
+# src/scrapers/columnar.py
+import time
+import logging
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# Fixed schema shared by every market-data source, so tables from different
+# scrapers concatenate without casting or copying
+MARKET_SCHEMA = pa.schema([
+    ("name", pa.string()),
+    ("symbol", pa.string()),
+    ("price", pa.float64()),
+    ("market_cap", pa.float64()),
+    ("volume_24h", pa.float64()),
+    ("change_24h", pa.float64()),
+    ("source", pa.string()),
+    ("fetched_at", pa.timestamp("ms", tz="UTC")),
+])
+
+MARKET_FIELDS = ["name", "symbol", "price", "market_cap", "volume_24h", "change_24h"]
+
+
+def _column(values: Any, type_: pa.DataType) -> pa.Array:
+    """Convert a column to Arrow; float64 numpy arrays are wrapped without a copy."""
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        return values.cast(type_)
+    # from_pandas maps NaN to null so missing values look the same for every source
+    return pa.array(values, type=type_, from_pandas=True)
+
+
+def _fetched_at_column(fetched_at: Optional[float], length: int) -> pa.Array:
+    timestamp = int((fetched_at if fetched_at is not None else time.time()) * 1000)
+    return pa.repeat(pa.scalar(timestamp, type=MARKET_SCHEMA.field("fetched_at").type), length)
+
+
+def market_table(
+    columns: Dict[str, Any],
+    source: str,
+    fetched_at: Optional[float] = None
+) -> pa.Table:
+    """
+    Build a MARKET_SCHEMA table from per-field columns.
+
+    Args:
+        columns: Mapping of MARKET_FIELDS to equal-length arrays or sequences
+            (None/NaN for missing values)
+        source: Source label stored on every row
+        fetched_at: Epoch seconds the data was fetched (defaults to now)
+
+    Returns:
+        pyarrow Table with the MARKET_SCHEMA columns
+    """
+    arrays = [_column(columns[field], MARKET_SCHEMA.field(field).type) for field in MARKET_FIELDS]
+    length = len(arrays[0])
+    arrays.append(pa.repeat(pa.scalar(source, type=pa.string()), length))
+    arrays.append(_fetched_at_column(fetched_at, length))
+    return pa.Table.from_arrays(arrays, schema=MARKET_SCHEMA)
+
+
+def rows_to_table(
+    rows: Sequence[Dict[str, Any]],
+    source: Optional[str] = None,
+    fetched_at: Optional[float] = None
+) -> pa.Table:
+    """
+    Build a MARKET_SCHEMA table from coin dictionaries.
+
+    Used for the paths that still produce dictionaries (web fallbacks,
+    simulated data); the API paths build their columns directly.
+
+    Args:
+        rows: Coin dictionaries with the MARKET_FIELDS keys
+        source: Source label; when omitted each row's 'source' value is used
+        fetched_at: Epoch seconds the data was fetched (defaults to now)
+
+    Returns:
+        pyarrow Table with the MARKET_SCHEMA columns
+    """
+    columns = {field: [row.get(field) for row in rows] for field in MARKET_FIELDS}
+    if source is not None:
+        return market_table(columns, source, fetched_at)
+
+    arrays = [_column(columns[field], MARKET_SCHEMA.field(field).type) for field in MARKET_FIELDS]
+    arrays.append(pa.array([row.get("source") for row in rows], type=pa.string()))
+    arrays.append(_fetched_at_column(fetched_at, len(rows)))
+    return pa.Table.from_arrays(arrays, schema=MARKET_SCHEMA)
+
+
+def empty_market_table() -> pa.Table:
+    """Return a MARKET_SCHEMA table with no rows."""
+    return MARKET_SCHEMA.empty_table()
+
+
+def concat_market_tables(tables: Iterable[Optional[pa.Table]]) -> pa.Table:
+    """
+    Concatenate market tables from several sources.
+
+    The result references the input chunks instead of copying them.
+
+    Args:
+        tables: MARKET_SCHEMA tables (None entries are skipped)
+
+    Returns:
+        Combined pyarrow Table
+    """
+    present = [table for table in tables if table is not None]
+    if not present:
+        return empty_market_table()
+    return pa.concat_tables(present)
+
@@ -1,21 +1,38 @@
 # src/scrapers/cryptocompare.py
-import requests
+import time
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import pyarrow as pa
+
+from .http_client import HttpClient, get_http_client
+from .columnar import empty_market_table, market_table
 
 logger = logging.getLogger(__name__)
 
+# Candle endpoint per history interval
+HISTORY_ENDPOINTS = {
+    "day": "v2/histoday",
+    "hour": "v2/histohour",
+}
+
+# Maximum number of candles a single history request may ask for
+MAX_HISTORY_LIMIT = 2000
+
 class CryptoCompareScraper:
     """
     Scraper for CryptoCompare data using the official API.
     """
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, client: HttpClient = None):
         self.api_key = api_key
+        self.client = client or get_http_client()
         self.base_url = "https://min-api.cryptocompare.com/data"
         self.headers = {
             "Authorization": f"Apikey {self.api_key}" if self.api_key else ""
         }
+        # Rate limit budget used for API calls
+        self.plan = "pro" if api_key else "free"
 
     def get_top_coins(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -28,14 +45,7 @@ class CryptoCompareScraper:
             A list of coin data dictionaries
         """
         try:
-            url = f"{self.base_url}/top/mktcapfull"
-            params = {
-                "limit": limit,
-                "tsym": "USD"
-            }
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._fetch_top_coins_json(limit)
 
             coin_list = []
             for item in data.get("Data", []):
@@ -59,3 +69,107 @@ class CryptoCompareScraper:
         except Exception as e:
             logger.error(f"Failed to fetch data from CryptoCompare: {e}")
             return []
+
+    def get_top_coins_table(self, limit: int = 10) -> pa.Table:
+        """
+        Get top cryptocurrencies by market cap as a columnar table.
+
+        Args:
+            limit: number of coins to fetch
+
+        Returns:
+            pyarrow Table with the MARKET_SCHEMA columns (empty on failure)
+        """
+        fetched_at = time.time()
+        try:
+            items = self._fetch_top_coins_json(limit).get("Data", [])
+
+            infos = [item["CoinInfo"] for item in items]
+            raws = [item.get("RAW", {}).get("USD", {}) for item in items]
+            columns = {
+                "name": [info.get("FullName") for info in infos],
+                "symbol": [info.get("Name") for info in infos],
+                "price": [raw.get("PRICE") for raw in raws],
+                "market_cap": [raw.get("MKTCAP") for raw in raws],
+                "volume_24h": [raw.get("TOTALVOLUME24H") for raw in raws],
+                "change_24h": [raw.get("CHANGEPCT24HOUR") for raw in raws],
+            }
+            return market_table(columns, source="CryptoCompare", fetched_at=fetched_at)
+
+        except Exception as e:
+            logger.error(f"Failed to fetch data from CryptoCompare: {e}")
+            return empty_market_table()
+
+    def _fetch_top_coins_json(self, limit: int) -> Dict[str, Any]:
+        """Request the top-by-market-cap endpoint and decode it."""
+        url = f"{self.base_url}/top/mktcapfull"
+        params = {
+            "limit": limit,
+            "tsym": "USD"
+        }
+        response = self.client.get(url, headers=self.headers, params=params,
+                                   provider="cryptocompare", plan=self.plan)
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        interval: str = "day",
+        limit: int = MAX_HISTORY_LIMIT,
+        to_ts: Optional[int] = None,
+        tsym: str = "USD"
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch OHLCV candles for a symbol, oldest first.
+
+        The API returns limit + 1 candles ending at to_ts (the current,
+        still-open candle when to_ts is omitted). Periods before a coin was
+        listed come back as all-zero candles.
+
+        Args:
+            symbol: Coin symbol (e.g. 'BTC')
+            interval: 'day' or 'hour'
+            limit: Number of candles before to_ts (at most MAX_HISTORY_LIMIT)
+            to_ts: Unix timestamp of the last candle to return
+            tsym: Quote currency
+
+        Returns:
+            List of candle dictionaries with time, open, high, low, close,
+            volume_from and volume_to
+
+        Raises:
+            ValueError: If the interval is unknown or the API reports an error
+            requests.HTTPError: If the request fails
+        """
+        if interval not in HISTORY_ENDPOINTS:
+            raise ValueError(f"Unknown history interval: {interval}")
+
+        url = f"{self.base_url}/{HISTORY_ENDPOINTS[interval]}"
+        params = {
+            "fsym": symbol,
+            "tsym": tsym,
+            "limit": max(1, min(limit, MAX_HISTORY_LIMIT))
+        }
+        if to_ts is not None:
+            params["toTs"] = int(to_ts)
+
+        response = self.client.get(url, headers=self.headers, params=params,
+                                   provider="cryptocompare", plan=self.plan)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("Response") == "Error":
+            raise ValueError(f"CryptoCompare history error for {symbol}: {data.get('Message')}")
+
+        return [
+            {
+                "time": item["time"],
+                "open": item["open"],
+                "high": item["high"],
+                "low": item["low"],
+                "close": item["close"],
+                "volume_from": item["volumefrom"],
+                "volume_to": item["volumeto"]
+            }
+            for item in data.get("Data", {}).get("Data", [])
+        ]
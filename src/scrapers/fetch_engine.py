@@ -0,0 +1,112 @@
+# src/scrapers/fetch_engine.py
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Any, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_sources(
+    fetchers: Dict[str, Callable[[], Any]],
+    timeout: float = 15.0,
+    timeouts: Optional[Dict[str, float]] = None,
+    max_workers: Optional[int] = None
+) -> Iterator[Tuple[str, Any, Optional[Exception]]]:
+    """
+    Run all source fetchers concurrently and yield results as they complete.
+
+    Every fetcher starts immediately on its own worker thread, so total latency
+    is close to the slowest source rather than the sum of all of them. A source
+    that misses its deadline is reported with a TimeoutError and the remaining
+    sources are still returned (partial results). A source's deadline runs from
+    the moment a worker starts it, so with fewer workers than sources, time
+    spent queued does not count against it.
+
+    Args:
+        fetchers: Mapping of source name to a zero-argument callable
+        timeout: Default per-source timeout in seconds
+        timeouts: Optional per-source timeout overrides
+        max_workers: Worker thread count (defaults to one per source)
+
+    Yields:
+        Tuples of (source, data, error) in completion order; data is None
+        whenever error is set
+    """
+    if not fetchers:
+        return
+
+    timeouts = timeouts or {}
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or len(fetchers),
+        thread_name_prefix="fetch"
+    )
+    deadlines: Dict[str, float] = {}
+
+    def run(source: str, fn: Callable[[], Any]) -> Any:
+        deadlines[source] = time.monotonic() + timeouts.get(source, timeout)
+        return fn()
+
+    futures = {executor.submit(run, source, fn): source for source, fn in fetchers.items()}
+    pending = set(futures)
+
+    try:
+        while pending:
+            # A queued source cannot expire before a full timeout from now
+            now = time.monotonic()
+            next_deadline = min(
+                deadlines.get(futures[f], now + timeouts.get(futures[f], timeout)) for f in pending
+            )
+            done, pending = wait(
+                pending,
+                timeout=max(0.0, next_deadline - time.monotonic()),
+                return_when=FIRST_COMPLETED
+            )
+
+            for future in done:
+                source = futures[future]
+                try:
+                    yield source, future.result(), None
+                except Exception as e:
+                    logger.error(f"Error fetching {source}: {e}")
+                    yield source, None, e
+
+            now = time.monotonic()
+            expired = {f for f in pending if deadlines.get(futures[f], float('inf')) <= now}
+            for future in expired:
+                source = futures[future]
+                future.cancel()
+                logger.warning(f"Timed out fetching {source} after {timeouts.get(source, timeout)}s")
+                yield source, None, TimeoutError(f"{source} did not respond in time")
+            pending -= expired
+    finally:
+        # Never block on stragglers: their results are simply discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_all(
+    fetchers: Dict[str, Callable[[], Any]],
+    timeout: float = 15.0,
+    timeouts: Optional[Dict[str, float]] = None,
+    max_workers: Optional[int] = None
+) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """
+    Run all source fetchers concurrently and collect the results.
+
+    Args:
+        fetchers: Mapping of source name to a zero-argument callable
+        timeout: Default per-source timeout in seconds
+        timeouts: Optional per-source timeout overrides
+        max_workers: Worker thread count (defaults to one per source)
+
+    Returns:
+        Tuple of (results by source, errors by source)
+    """
+    results = {}
+    errors = {}
+    for source, data, error in fetch_sources(fetchers, timeout, timeouts, max_workers):
+        if error is None:
+            results[source] = data
+        else:
+            errors[source] = error
+    return results, errors
@@ -0,0 +1,189 @@
+# src/scrapers/html_parsing.py
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml.etree
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+# A column is located by (cell index, selector). The cell index is 0-based over
+# the row's element children (CSS td:nth-child(index + 1)), or None to search
+# the whole row. The selector is '.class', 'tag', or None for the cell itself.
+ColumnSpec = Tuple[Optional[int], Optional[str]]
+
+
+class _SoupBackend:
+    """BeautifulSoup backend (html.parser or lxml tree builder)."""
+
+    def __init__(self, features: str):
+        self.features = features
+
+    def rows(self, html: str, table_class: Optional[str]):
+        soup = BeautifulSoup(html, self.features)
+        table = f"table.{table_class}" if table_class else "table"
+        return soup.select(f"{table} tbody tr")
+
+    def children(self, node):
+        return node.find_all(True, recursive=False)
+
+    def is_cell(self, node) -> bool:
+        return node.name == "td"
+
+    def find(self, node, selector: str):
+        if selector.startswith("."):
+            return node.find(class_=selector[1:])
+        return node.find(selector)
+
+    def text(self, node) -> str:
+        return node.get_text()
+
+
+class _LxmlBackend:
+    """lxml.html backend using precompiled XPath lookups."""
+
+    def __init__(self):
+        self._xpaths = {}
+
+    def _xpath(self, expression: str):
+        compiled = self._xpaths.get(expression)
+        if compiled is None:
+            compiled = self._xpaths[expression] = lxml.etree.XPath(expression)
+        return compiled
+
+    def rows(self, html: str, table_class: Optional[str]):
+        tree = lxml.html.fromstring(html)
+        table = f"//table[{_xpath_has_class(table_class)}]" if table_class else "//table"
+        return self._xpath(f"{table}//tbody//tr")(tree)
+
+    def children(self, node):
+        # Skip comments and processing instructions, like CSS nth-child does
+        return [child for child in node if isinstance(child.tag, str)]
+
+    def is_cell(self, node) -> bool:
+        return node.tag == "td"
+
+    def find(self, node, selector: str):
+        if selector.startswith("."):
+            expression = f"(.//*[{_xpath_has_class(selector[1:])}])[1]"
+        else:
+            expression = f"(.//{selector})[1]"
+        matches = self._xpath(expression)(node)
+        return matches[0] if matches else None
+
+    def text(self, node) -> str:
+        return node.text_content()
+
+
+class _SelectolaxBackend:
+    """selectolax (Lexbor) backend."""
+
+    def rows(self, html: str, table_class: Optional[str]):
+        table = f"table.{table_class}" if table_class else "table"
+        return LexborHTMLParser(html).css(f"{table} tbody tr")
+
+    def children(self, node):
+        # Comment and text nodes are reported with '-comment'/'-text' pseudo tags
+        return [child for child in node.iter(include_text=False) if not child.tag.startswith("-")]
+
+    def is_cell(self, node) -> bool:
+        return node.tag == "td"
+
+    def find(self, node, selector: str):
+        return node.css_first(selector)
+
+    def text(self, node) -> str:
+        return node.text(deep=True)
+
+
+def _xpath_has_class(class_name: str) -> str:
+    """XPath predicate equivalent to the CSS '.class_name' selector."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def available_backends() -> List[str]:
+    """Return the names of the parser backends usable in this environment."""
+    backends = ["html.parser"]
+    if HAS_LXML:
+        backends.extend(["bs4-lxml", "lxml"])
+    if HAS_SELECTOLAX:
+        backends.append("selectolax")
+    return backends
+
+
+# Fastest backend available, used when callers do not pick one
+DEFAULT_BACKEND = "selectolax" if HAS_SELECTOLAX else "lxml" if HAS_LXML else "html.parser"
+
+
+def _get_backend(name: str):
+    if name == "selectolax" and HAS_SELECTOLAX:
+        return _SelectolaxBackend()
+    if name == "lxml" and HAS_LXML:
+        return _LxmlBackend()
+    if name == "bs4-lxml" and HAS_LXML:
+        return _SoupBackend("lxml")
+    if name == "html.parser":
+        return _SoupBackend("html.parser")
+    raise ValueError(f"HTML parser backend not available: {name}")
+
+
+def extract_table_rows(
+    html: str,
+    columns: Dict[str, ColumnSpec],
+    table_class: Optional[str] = None,
+    limit: Optional[int] = None,
+    backend: Optional[str] = None
+) -> List[Dict[str, Optional[str]]]:
+    """
+    Extract the raw text of selected columns from every row of an HTML table.
+
+    Each row's element children are listed once and columns are then looked
+    up by index, instead of running one CSS query per column per row.
+
+    Args:
+        html: Page source
+        columns: Mapping of output field to (cell index, selector)
+        table_class: Optional CSS class the table must carry
+        limit: Maximum number of rows to extract
+        backend: Parser backend name (defaults to DEFAULT_BACKEND)
+
+    Returns:
+        List of dictionaries mapping each field to its stripped text, or to
+        None when the element is missing from the row
+    """
+    parser = _get_backend(backend or DEFAULT_BACKEND)
+    rows = parser.rows(html, table_class)
+    if limit is not None:
+        rows = rows[:limit]
+
+    extracted = []
+    for row in rows:
+        cells = parser.children(row)
+        values = {}
+        for field, (index, selector) in columns.items():
+            if index is None:
+                node = row
+            elif index < len(cells) and parser.is_cell(cells[index]):
+                node = cells[index]
+            else:
+                values[field] = None
+                continue
+
+            if selector is not None:
+                node = parser.find(node, selector)
+            values[field] = parser.text(node).strip() if node is not None else None
+        extracted.append(values)
+
+    return extracted
@@ -0,0 +1,228 @@
+# src/scrapers/http_client.py
+import threading
+import logging
+from typing import Dict, Any, Optional, Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Connection pool size per provider host. API hosts get larger pools because
+# they serve the bulk of the (possibly concurrent) traffic.
+DEFAULT_POOL_SIZES = {
+    "api.coingecko.com": 10,
+    "pro-api.coingecko.com": 10,
+    "www.coingecko.com": 4,
+    "pro-api.coinmarketcap.com": 10,
+    "coinmarketcap.com": 4,
+    "min-api.cryptocompare.com": 10,
+}
+
+
+class HttpClient:
+    """
+    Shared HTTP client for the market-data scrapers.
+
+    Wraps a single requests.Session so every scraper reuses pooled keep-alive
+    connections instead of opening a new TCP+TLS connection per call. Each
+    provider host gets its own connection pool, and idempotent requests are
+    retried with exponential backoff on connection errors and 429/5xx replies.
+    Requests tagged with a provider draw from that provider's rate limit budget.
+    With a rate limiter attached, 429 replies to tagged requests are not
+    retried inside the session: the reply blocks the shared budget and the
+    request is sent again once a new token frees up, so every worker pauses
+    together instead of each sleeping through its own retries. Untagged
+    requests keep retrying 429 replies after their Retry-After pause.
+    With a ResponseCache attached, fresh cached responses are returned without
+    any network call and stale ones are revalidated with conditional requests.
+    """
+
+    def __init__(
+        self,
+        pool_sizes: Optional[Dict[str, int]] = None,
+        default_pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        status_forcelist: Iterable[int] = (429, 500, 502, 503, 504),
+        timeout: float = 10.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None
+    ):
+        """
+        Initialize the HTTP client.
+
+        Args:
+            pool_sizes: Maximum pooled connections per host (overrides DEFAULT_POOL_SIZES)
+            default_pool_size: Pool size for hosts without an explicit entry
+            max_retries: Maximum number of retries per request
+            backoff_factor: Base delay for exponential backoff between retries
+            status_forcelist: HTTP status codes that trigger a retry
+            timeout: Default (connect, read) timeout in seconds
+            rate_limiter: Optional RateLimiter applied to provider-tagged requests
+            cache: Optional ResponseCache for GET responses
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.pool_sizes = dict(DEFAULT_POOL_SIZES)
+        if pool_sizes:
+            self.pool_sizes.update(pool_sizes)
+
+        self.retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=tuple(status_forcelist),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        self.session = self._make_session(self.retry, default_pool_size)
+
+        # Provider-tagged requests go through a session whose rate limited
+        # replies come back to the limiter (see get()). urllib3 retries any
+        # reply carrying Retry-After when it respects the header, whatever the
+        # forcelist says, so the limiter honours it instead.
+        self.limited_session = self.session
+        if rate_limiter is not None:
+            limited_retry = self.retry.new(
+                status_forcelist=tuple(status for status in status_forcelist if status != 429),
+                respect_retry_after_header=False
+            )
+            self.limited_session = self._make_session(limited_retry, default_pool_size)
+
+    def _make_session(self, retry: Retry, default_pool_size: int) -> requests.Session:
+        """Create a session with per-host pools that share one retry policy."""
+        session = requests.Session()
+        session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+
+        default_adapter = self._make_adapter(default_pool_size, retry)
+        session.mount('https://', default_adapter)
+        session.mount('http://', default_adapter)
+
+        # requests picks the adapter with the longest matching prefix, so each
+        # host below gets a dedicated pool of the configured size.
+        for host, size in self.pool_sizes.items():
+            session.mount(f"https://{host}/", self._make_adapter(size, retry))
+        return session
+
+    def _make_adapter(self, pool_size: int, retry: Retry) -> HTTPAdapter:
+        """Create a pooled adapter with the given retry policy."""
+        return HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        provider: Optional[str] = None,
+        plan: str = "free",
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send a GET request through the pooled session.
+
+        Args:
+            url: Request URL
+            headers: Extra request headers (merged with the session defaults)
+            params: Query string parameters
+            timeout: Request timeout in seconds (defaults to the client timeout)
+            provider: Provider whose rate limit budget this request uses
+            plan: Provider plan ('free' or 'pro') selecting the budget
+
+        Returns:
+            The requests.Response object
+
+        Raises:
+            RateLimitTimeout: If the provider budget stays blocked longer than
+                the limiter's max_wait
+        """
+        # Streamed bodies are consumed incrementally by the caller, so they
+        # bypass the cache rather than being buffered just to store them.
+        cache_key = None
+        entry = None
+        if self.cache is not None and not kwargs.get('stream'):
+            cache_key = self.cache.make_key(url, params)
+            entry = self.cache.get(cache_key)
+            if entry and entry['fresh']:
+                self.cache.record('hits')
+                return self.cache.build_response(entry)
+            if entry:
+                headers = dict(headers or {})
+                if entry['etag']:
+                    headers['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    headers['If-Modified-Since'] = entry['last_modified']
+
+        limited = bool(provider and self.rate_limiter)
+        session = self.limited_session if limited else self.session
+        attempts = 0
+        while True:
+            # One token per attempt, including retries after a 429
+            if limited:
+                self.rate_limiter.acquire(provider, plan)
+
+            response = session.get(
+                url,
+                headers=headers,
+                params=params,
+                timeout=timeout if timeout is not None else self.timeout,
+                **kwargs
+            )
+
+            if not limited:
+                break
+            self.rate_limiter.update_from_response(provider, plan, response)
+            if response.status_code != 429 or attempts >= self.max_retries:
+                break
+            # The 429 blocked the budget, so the next acquire() waits it out
+            attempts += 1
+            response.close()
+
+        if cache_key is not None:
+            if response.status_code == 304 and entry:
+                self.cache.record('revalidations')
+                self.cache.refresh(cache_key)
+                return self.cache.build_response(entry)
+            self.cache.record('misses')
+            if response.status_code == 200:
+                self.cache.store(cache_key, response)
+
+        return response
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+        if self.limited_session is not self.session:
+            self.limited_session.close()
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Return the process-wide HttpClient shared by all scrapers.
+
+    Returns:
+        The shared HttpClient instance (created on first use)
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = HttpClient(rate_limiter=RateLimiter(), cache=ResponseCache())
+    return _shared_client
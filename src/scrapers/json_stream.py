@@ -0,0 +1,143 @@
+# src/scrapers/json_stream.py
+import codecs
+import json
+import logging
+from typing import Any, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class _ChunkReader:
+    """Decode a byte-chunk iterator into a sliding text buffer."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def read_more(self, trim: bool = True) -> bool:
+        """Append the next chunk to the buffer; False once the stream is done."""
+        if self.exhausted:
+            return False
+        # Drop text that has already been consumed so the buffer stays small
+        if trim and self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return ""
+
+
+def _seek_array(reader: _ChunkReader, key: str):
+    """Advance the reader to just past the '[' of the top-level array under key."""
+    depth = 0
+    in_string = False
+    escaped = False
+    string_start = 0
+    last_string = None
+
+    while True:
+        if reader.pos >= len(reader.buffer):
+            # The prefix before the array is small, so keep it untrimmed; a
+            # key string may straddle two chunks
+            if not reader.read_more(trim=False):
+                raise ValueError(f"JSON stream has no top-level '{key}' array")
+            continue
+
+        char = reader.buffer[reader.pos]
+        reader.pos += 1
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                last_string = reader.buffer[string_start:reader.pos - 1]
+            continue
+
+        if char == '"':
+            in_string = True
+            string_start = reader.pos
+        elif char in "{[":
+            if char == "[" and depth == 1 and last_string == key:
+                return
+            depth += 1
+            last_string = None
+        elif char in "}]":
+            depth -= 1
+        elif char == ",":
+            last_string = None
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str = "data") -> Iterator[Any]:
+    """
+    Incrementally decode the items of a top-level array in a JSON document.
+
+    Only one array item is materialized at a time, so a large listings payload
+    never has to be held as raw bytes and as a parsed tree at the same time.
+
+    Args:
+        chunks: Iterator of raw response bytes (e.g. response.iter_content())
+        key: Name of the top-level field holding the array
+
+    Yields:
+        Decoded array items, in order
+
+    Raises:
+        ValueError: If the array is missing or the stream is malformed
+    """
+    reader = _ChunkReader(chunks)
+    decoder = json.JSONDecoder()
+    _seek_array(reader, key)
+
+    if reader.peek() == "]":
+        return
+
+    while True:
+        if not reader.peek():
+            raise ValueError("JSON stream ended inside the array")
+        try:
+            item, end = decoder.raw_decode(reader.buffer, reader.pos)
+        except json.JSONDecodeError:
+            # The item is split across chunks; read more and try again
+            if not reader.read_more():
+                raise ValueError("JSON stream ended inside an array item")
+            continue
+        if not reader.exhausted and (end == len(reader.buffer) or reader.buffer[end] not in _DELIMITERS):
+            # A number at the buffer edge (e.g. '2' of '2.5') may continue in
+            # the next chunk
+            reader.read_more()
+            continue
+
+        reader.pos = end
+        yield item
+
+        separator = reader.peek()
+        if separator == ",":
+            reader.pos += 1
+        elif separator == "]":
+            return
+        else:
+            raise ValueError(f"Unexpected character in JSON array: {separator!r}")
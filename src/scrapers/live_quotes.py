@@ -0,0 +1,287 @@
+# src/scrapers/live_quotes.py
+import json
+import time
+import threading
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .http_client import HttpClient, get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Quote fields tracked per symbol; anything else in a tick is ignored
+QUOTE_FIELDS = ("price", "change_24h", "volume_24h")
+
+
+class QuoteBook:
+    """
+    Thread-safe in-memory table of the latest quote per symbol.
+
+    Every change bumps a global version number that is stored on the quote,
+    so readers can cheaply ask for just the symbols that moved since their
+    last look instead of re-reading the whole market.
+    """
+
+    def __init__(self):
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def subscribe(self, listener: Callable[[List[Dict[str, Any]]], None]):
+        """
+        Register a callback that receives the deltas of every apply() call.
+
+        Args:
+            listener: Called with a list of delta dictionaries (symbol, the
+                changed fields, version, ts) from the thread applying the ticks
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def apply(self, ticks: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Merge ticks into the book.
+
+        Args:
+            ticks: Dictionaries with a symbol and any of QUOTE_FIELDS (plus an
+                optional ts); ticks that change nothing are dropped
+
+        Returns:
+            List of deltas, one per symbol that changed, holding only the
+            changed fields
+        """
+        deltas = []
+        with self._lock:
+            for tick in ticks:
+                symbol = tick.get("symbol")
+                if not symbol:
+                    continue
+                symbol = symbol.upper()
+                quote = self._quotes.get(symbol)
+                changed = {
+                    field: tick[field] for field in QUOTE_FIELDS
+                    if tick.get(field) is not None and (quote is None or quote.get(field) != tick[field])
+                }
+                if not changed:
+                    continue
+
+                self._version += 1
+                ts = tick.get("ts") or time.time()
+                if quote is None:
+                    quote = self._quotes[symbol] = {"symbol": symbol}
+                quote.update(changed, version=self._version, ts=ts)
+                deltas.append(dict(changed, symbol=symbol, version=self._version, ts=ts))
+            listeners = list(self._listeners)
+
+        if deltas:
+            for listener in listeners:
+                try:
+                    listener(deltas)
+                except Exception as e:
+                    logger.error(f"Quote listener failed: {e}")
+        return deltas
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the latest quote for a symbol, or None."""
+        with self._lock:
+            quote = self._quotes.get(symbol.upper())
+            return dict(quote) if quote else None
+
+    def changes_since(self, version: int) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """
+        Return the latest quote of every symbol that changed after a version.
+
+        Args:
+            version: Version returned by a previous call (0 for everything)
+
+        Returns:
+            Tuple of (current version, quotes keyed by symbol)
+        """
+        with self._lock:
+            return self._version, {
+                symbol: dict(quote) for symbol, quote in self._quotes.items() if quote["version"] > version
+            }
+
+    def snapshot(self) -> pd.DataFrame:
+        """Return every latest quote as a DataFrame with one row per symbol."""
+        with self._lock:
+            rows = [dict(quote) for quote in self._quotes.values()]
+        return pd.DataFrame(rows, columns=["symbol", *QUOTE_FIELDS, "ts", "version"])
+
+
+def iter_stream_lines(raw, chunk_size: int = 65536) -> Iterator[str]:
+    """
+    Yield decoded lines from a streaming urllib3 response as soon as they arrive.
+
+    requests' iter_lines() waits for a full chunk_size block (or the end of
+    the body) before yielding, which stalls a low-volume event stream;
+    read1() returns whatever the socket has buffered.
+    """
+    buffer = b""
+    while True:
+        chunk = raw.read1(chunk_size, decode_content=True)
+        if not chunk:
+            break
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8")
+    if buffer:
+        yield buffer.rstrip(b"\r").decode("utf-8")
+
+
+def iter_sse_events(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """
+    Parse a text/event-stream body into events.
+
+    Args:
+        lines: Decoded lines of the stream (e.g. from iter_stream_lines)
+
+    Yields:
+        Dictionaries with 'event', 'data' and, when sent, 'id' and 'retry'.
+        A block without data is not an event, but its 'id' and 'retry' still
+        apply, so it is yielded with just those keys.
+    """
+    event: Dict[str, Any] = {}
+    data: List[str] = []
+    for line in lines:
+        if not line:
+            if data:
+                yield dict(event, event=event.get("event") or "message", data="\n".join(data))
+            elif "id" in event or "retry" in event:
+                yield {field: event[field] for field in ("id", "retry") if field in event}
+            event, data = {}, []
+            continue
+        if line.startswith(":"):
+            # Comment / keep-alive
+            continue
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            data.append(value)
+        elif field in ("event", "id", "retry"):
+            event[field] = value
+
+
+class LiveQuoteFeed:
+    """
+    Background consumer of a server-sent-events ticker feed.
+
+    Each event's data is a JSON tick or list of ticks, which is applied to a
+    QuoteBook. The feed reconnects with exponential backoff and resumes from
+    the last event id it saw.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        book: Optional[QuoteBook] = None,
+        client: Optional[HttpClient] = None,
+        params: Optional[Dict[str, Any]] = None,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        read_timeout: float = 30.0
+    ):
+        """
+        Initialize the feed.
+
+        Args:
+            url: SSE endpoint URL
+            book: QuoteBook to update (a new one is created if omitted)
+            client: Optional HttpClient (defaults to the shared pooled client)
+            params: Query string parameters for the stream request
+            reconnect_delay: Initial delay before reconnecting after an error
+            max_reconnect_delay: Upper bound for the reconnect backoff
+            read_timeout: Seconds without any bytes before the stream is
+                considered dead
+        """
+        self.url = url
+        self.book = book or QuoteBook()
+        self.client = client or get_http_client()
+        self.params = params
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.read_timeout = read_timeout
+        self.last_event_id: Optional[str] = None
+        self.events = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._response = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "LiveQuoteFeed":
+        """Start consuming the feed on a daemon thread."""
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="live-quote-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the feed and wait for the consumer thread to exit.
+
+        A read already in progress ends when the next event or keep-alive
+        arrives, or at the read timeout.
+        """
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            # Unblocks a read that is waiting for the next event
+            response.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                self._consume()
+                delay = self.reconnect_delay
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning(f"Live quote feed disconnected: {e}; reconnecting in {delay:.1f}s")
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _consume(self):
+        """Read one connection's worth of events."""
+        headers = {"Accept": "text/event-stream", "Cache-Control": "no-cache"}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+
+        response = self.client.get(self.url, headers=headers, params=self.params, stream=True,
+                                   timeout=(5.0, self.read_timeout))
+        self._response = response
+        try:
+            response.raise_for_status()
+            for event in iter_sse_events(iter_stream_lines(response.raw)):
+                if self._stop.is_set():
+                    return
+                if "id" in event:
+                    self.last_event_id = event["id"]
+                if "retry" in event and event["retry"].isdigit():
+                    self.reconnect_delay = int(event["retry"]) / 1000
+                if "data" not in event or event["event"] not in ("message", "quote", "quotes"):
+                    continue
+
+                ticks = json.loads(event["data"])
+                self.book.apply(ticks if isinstance(ticks, list) else [ticks])
+                self.events += 1
+        finally:
+            self._response = None
+            response.close()
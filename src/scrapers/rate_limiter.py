@@ -0,0 +1,263 @@
+# src/scrapers/rate_limiter.py
+import os
+import time
+import sqlite3
+import logging
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Token bucket settings per provider and plan: (burst capacity, tokens per second).
+# Values follow the published limits with a little headroom.
+PROVIDER_LIMITS: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "coingecko": {
+        "free": (5, 25 / 60),
+        "pro": (50, 450 / 60),
+    },
+    "coinmarketcap": {
+        "free": (5, 25 / 60),
+        "pro": (20, 110 / 60),
+    },
+    "cryptocompare": {
+        "free": (10, 4.0),
+        "pro": (30, 15.0),
+    },
+}
+
+DEFAULT_STATE_PATH = "data/cache/rate_limits.sqlite"
+
+# Used when a provider answers 429 without telling us how long to wait
+DEFAULT_RETRY_AFTER = 30.0
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request budget does not free up within the allowed wait."""
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter shared by all scrapers.
+
+    Bucket state lives in a small SQLite database so that threads and separate
+    worker processes draw from the same budget. Every update runs inside an
+    IMMEDIATE transaction, which SQLite serializes with a file lock.
+    """
+
+    def __init__(
+        self,
+        state_path: str = DEFAULT_STATE_PATH,
+        limits: Optional[Dict[str, Dict[str, Tuple[float, float]]]] = None,
+        max_wait: float = 120.0
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            state_path: SQLite file holding the shared bucket state
+            limits: Per-provider, per-plan (capacity, refill rate) settings
+                (copied, defaults to PROVIDER_LIMITS)
+            max_wait: Maximum seconds acquire() blocks before giving up
+        """
+        self.state_path = state_path
+        # Own copy, so providers added later never leak into the shared defaults
+        self.limits = {
+            provider: dict(plans) for provider, plans in (limits if limits is not None else PROVIDER_LIMITS).items()
+        }
+        self.max_wait = max_wait
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the shared state file, creating it on first use."""
+        if not self._initialized:
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.state_path, timeout=30, isolation_level=None)
+
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " key TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated REAL NOT NULL,"
+                " blocked_until REAL NOT NULL DEFAULT 0)"
+            )
+            self._initialized = True
+        return conn
+
+    def add_provider(self, provider: str, plans: Dict[str, Tuple[float, float]]):
+        """
+        Register a provider's budgets unless it already has some.
+
+        Args:
+            provider: Provider name (e.g. a blog domain)
+            plans: Per-plan (capacity, refill rate) settings
+        """
+        self.limits.setdefault(provider, dict(plans))
+
+    def _bucket_settings(self, provider: str, plan: str) -> Optional[Tuple[float, float]]:
+        """Look up (capacity, rate) for a provider plan, or None if unlimited."""
+        plans = self.limits.get(provider)
+        if not plans:
+            return None
+        return plans.get(plan) or plans.get("free")
+
+    def _load_bucket(self, conn: sqlite3.Connection, key: str, capacity: float, now: float) -> Tuple[float, float, float]:
+        """Read the bucket row (tokens, updated, blocked_until), defaulting to full."""
+        row = conn.execute(
+            "SELECT tokens, updated, blocked_until FROM buckets WHERE key = ?", (key,)
+        ).fetchone()
+        return row if row else (capacity, now, 0.0)
+
+    def _save_bucket(self, conn: sqlite3.Connection, key: str, tokens: float, updated: float, blocked_until: float):
+        conn.execute(
+            "INSERT OR REPLACE INTO buckets (key, tokens, updated, blocked_until) VALUES (?, ?, ?, ?)",
+            (key, tokens, updated, blocked_until)
+        )
+
+    def acquire(self, provider: str, plan: str = "free") -> float:
+        """
+        Block until a request token is available for the provider plan.
+
+        Args:
+            provider: Provider name (e.g. 'coingecko')
+            plan: Plan name ('free' or 'pro')
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: If no token frees up within max_wait seconds
+        """
+        settings = self._bucket_settings(provider, plan)
+        if settings is None:
+            return 0.0
+
+        capacity, rate = settings
+        key = f"{provider}:{plan}"
+        waited = 0.0
+
+        while True:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                tokens, updated, blocked_until = self._load_bucket(conn, key, capacity, now)
+                tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+
+                if blocked_until > now:
+                    wait = blocked_until - now
+                elif tokens >= 1.0:
+                    self._save_bucket(conn, key, tokens - 1.0, now, blocked_until)
+                    conn.execute("COMMIT")
+                    return waited
+                else:
+                    wait = (1.0 - tokens) / rate
+
+                self._save_bucket(conn, key, tokens, now, blocked_until)
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+
+            if waited + wait > self.max_wait:
+                raise RateLimitTimeout(f"{key} budget exhausted; next slot in {wait:.1f}s")
+
+            # Sleep in short steps so a block lifted by another worker is noticed
+            step = min(wait, 1.0)
+            time.sleep(step)
+            waited += step
+
+    def update_from_response(self, provider: str, plan: str, response) -> None:
+        """
+        Adjust the bucket from a provider response.
+
+        A 429 reply blocks the bucket for the Retry-After period. Rate-limit
+        headers (X-RateLimit-Remaining/Reset and the RateLimit-* drafts) clamp
+        the local token count to what the provider reports.
+
+        Args:
+            provider: Provider name
+            plan: Plan name
+            response: The requests.Response received from the provider
+        """
+        settings = self._bucket_settings(provider, plan)
+        if settings is None:
+            return
+
+        headers = response.headers
+        remaining = _header_float(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset_at = _parse_reset(_header_float(headers, "X-RateLimit-Reset", "RateLimit-Reset"))
+        block_until = 0.0
+
+        if response.status_code == 429:
+            retry_after = _parse_retry_after(headers.get("Retry-After"))
+            if retry_after is None:
+                retry_after = (reset_at - time.time()) if reset_at else DEFAULT_RETRY_AFTER
+            block_until = time.time() + max(0.0, retry_after)
+            logger.warning(f"{provider} rate limited; pausing requests for {retry_after:.1f}s")
+        elif remaining is not None and remaining <= 0 and reset_at:
+            block_until = reset_at
+
+        if remaining is None and not block_until:
+            return
+
+        capacity, _ = settings
+        key = f"{provider}:{plan}"
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            tokens, updated, blocked_until = self._load_bucket(conn, key, capacity, now)
+            if remaining is not None:
+                tokens = min(tokens, remaining)
+            if block_until:
+                tokens = 0.0
+            self._save_bucket(conn, key, tokens, updated, max(blocked_until, block_until))
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+
+def _header_float(headers, *names: str) -> Optional[float]:
+    """Return the first of the named headers that parses as a number."""
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+def _parse_reset(value: Optional[float]) -> Optional[float]:
+    """Normalize a rate-limit reset header to an absolute epoch timestamp."""
+    if value is None:
+        return None
+    # Large values are epoch timestamps, small ones are seconds from now
+    return value if value > 1e9 else time.time() + value
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,236 @@
+# src/scrapers/response_cache.py
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from typing import Dict, Any, Optional, List, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "data/cache/http_cache.sqlite"
+
+# Freshness lifetime in seconds per endpoint; the first URL fragment that
+# matches wins. Market snapshots move quickly, coin metadata barely at all.
+DEFAULT_TTLS: List[Tuple[str, float]] = [
+    ("/coins/markets", 60),
+    ("/cryptocurrency/listings/latest", 60),
+    ("/top/mktcapfull", 60),
+    ("/coins/", 900),
+    ("/currencies/", 900),
+]
+
+DEFAULT_TTL = 60.0
+
+# Hop-by-hop and transfer headers that no longer describe the stored body
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache shared by all scrapers.
+
+    Successful GET responses are stored in a SQLite file together with their
+    ETag/Last-Modified validators. Fresh entries are served without touching
+    the network; stale ones are revalidated with a conditional request. The
+    file is kept under max_bytes by evicting the least recently used entries.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttls: Optional[List[Tuple[str, float]]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        max_bytes: int = 200 * 1024 * 1024
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            path: SQLite file holding cached responses
+            ttls: (URL fragment, TTL seconds) pairs, checked in order
+            default_ttl: TTL for URLs that match no fragment
+            max_bytes: Upper bound on the total size of cached bodies
+        """
+        self.path = path
+        self.ttls = ttls if ttls is not None else DEFAULT_TTLS
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._stats_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache file, creating it on first use."""
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " url TEXT NOT NULL,"
+                " status INTEGER NOT NULL,"
+                " headers TEXT NOT NULL,"
+                " encoding TEXT,"
+                " body BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " expires_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+            self._initialized = True
+        return conn
+
+    def record(self, counter: str):
+        """Increment one of the hits/misses/revalidations/evictions counters."""
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def ttl_for(self, url: str) -> float:
+        """Return the freshness lifetime configured for a URL."""
+        for fragment, ttl in self.ttls:
+            if fragment in url:
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build the cache key for a GET request (the fully encoded URL)."""
+        return requests.Request("GET", url, params=params).prepare().url
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached entry.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Entry dictionary (with a 'fresh' flag) or None if not cached
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT url, status, headers, encoding, body, etag, last_modified, expires_at"
+                " FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        finally:
+            conn.close()
+
+        url, status, headers, encoding, body, etag, last_modified, expires_at = row
+        return {
+            "url": url,
+            "status": status,
+            "headers": json.loads(headers),
+            "encoding": encoding,
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": expires_at > now,
+        }
+
+    def store(self, key: str, response: requests.Response):
+        """
+        Store a successful response and evict old entries if over budget.
+
+        Args:
+            key: Cache key from make_key()
+            response: Response to store (its body is read fully)
+        """
+        body = response.content
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        now = time.time()
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, url, status, headers, encoding, body, size, etag, last_modified, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, response.url, response.status_code, json.dumps(headers), response.encoding,
+                    sqlite3.Binary(body), len(body), response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"), now + self.ttl_for(key), now
+                )
+            )
+            self._evict(conn)
+        finally:
+            conn.close()
+
+    def refresh(self, key: str):
+        """Extend an entry's lifetime after a 304 Not Modified revalidation."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                (now + self.ttl_for(key), now, key)
+            )
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.record("evictions")
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Remove every cached response."""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM responses")
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cache counters.
+
+        Returns:
+            Dictionary with hits, misses, revalidations and evictions
+        """
+        with self._stats_lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+            }
+
+    @staticmethod
+    def build_response(entry: Dict[str, Any]) -> requests.Response:
+        """Rebuild a requests.Response from a cached entry."""
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = "OK"
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = entry["encoding"]
+        response._content = bytes(entry["body"])
+        return response
@@ -0,0 +1,185 @@
+# src/storage/article_store.py
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARTICLE_PATH = "data/articles/articles.sqlite"
+
+_COLUMNS = [
+    "url", "source", "title", "published", "text", "content_hash", "body_hash",
+    "etag", "last_modified", "fetched_at", "updated_at", "embedded_hash",
+]
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of extracted article text (whitespace-normalized)."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+class ArticleStore:
+    """
+    Local SQLite store of crawled blog articles.
+
+    Besides the article text it keeps what the crawler needs to avoid
+    repeated work: the HTTP validators for conditional requests, a hash of
+    the raw page (skip re-parsing) and a hash of the extracted text (skip
+    re-embedding). embedded_hash records which text version the RAG index
+    already holds.
+    """
+
+    def __init__(self, path: str = DEFAULT_ARTICLE_PATH):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite file holding the articles
+        """
+        self.path = path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the store, creating it on first use."""
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                " url TEXT PRIMARY KEY,"
+                " source TEXT NOT NULL,"
+                " title TEXT,"
+                " published TEXT,"
+                " text TEXT,"
+                " content_hash TEXT,"
+                " body_hash TEXT,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " fetched_at REAL,"
+                " updated_at REAL,"
+                " embedded_hash TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS articles_source ON articles (source, published)")
+            self._initialized = True
+        return conn
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the stored article for a URL, or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM articles WHERE url = ?", (url,)).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
+    def get_many(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the stored articles for several URLs, keyed by URL."""
+        if not urls:
+            return {}
+        conn = self._connect()
+        try:
+            found = {}
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(urls), 500):
+                batch = urls[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT * FROM articles WHERE url IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                found.update((row["url"], dict(row)) for row in rows)
+        finally:
+            conn.close()
+        return found
+
+    def save(self, article: Dict[str, Any]):
+        """
+        Insert or update an article.
+
+        Args:
+            article: Dictionary with url and source plus any other column
+        """
+        values = {column: article.get(column) for column in _COLUMNS}
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO articles ({', '.join(_COLUMNS)})"
+                    f" VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    [values[column] for column in _COLUMNS]
+                )
+        finally:
+            conn.close()
+
+    def touch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Record that an article was checked and found unchanged."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE articles SET fetched_at = ?,"
+                    " etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)"
+                    " WHERE url = ?",
+                    (time.time(), etag, last_modified, url)
+                )
+        finally:
+            conn.close()
+
+    def articles(self, source: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return stored articles, newest first.
+
+        Args:
+            source: Optional source name to filter on
+            limit: Optional maximum number of articles
+
+        Returns:
+            List of article dictionaries
+        """
+        query = "SELECT * FROM articles"
+        params: List[Any] = []
+        if source is not None:
+            query += " WHERE source = ?"
+            params.append(source)
+        query += " ORDER BY COALESCE(published, '') DESC, updated_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+
+    def pending_embeddings(self) -> List[Dict[str, Any]]:
+        """Return articles whose current text has not been embedded yet."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM articles WHERE text IS NOT NULL"
+                " AND (embedded_hash IS NULL OR embedded_hash != content_hash)"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def mark_embedded(self, articles: List[Dict[str, Any]]):
+        """Record that the given article versions are now in the RAG index."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "UPDATE articles SET embedded_hash = ? WHERE url = ?",
+                    [(article["content_hash"], article["url"]) for article in articles]
+                )
+        finally:
+            conn.close()
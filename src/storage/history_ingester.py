@@ -0,0 +1,150 @@
+# src/storage/history_ingester.py
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from ..scrapers.cryptocompare import CryptoCompareScraper, MAX_HISTORY_LIMIT
+from .ohlcv_store import OHLCVStore, INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Candles fetched on the first sync of a symbol
+DEFAULT_BACKFILL = {
+    "day": 2000,
+    "hour": 24 * 90,
+}
+
+
+def _is_placeholder(candle: Dict[str, Any]) -> bool:
+    """CryptoCompare pads periods before a coin was listed with all-zero candles."""
+    return not (candle["open"] or candle["high"] or candle["low"] or candle["close"] or candle["volume_to"])
+
+
+class HistoryIngester:
+    """
+    Backfills and incrementally syncs OHLCV history from CryptoCompare.
+
+    The first sync of a symbol pages backwards until the backfill depth is
+    reached. Later syncs only request the candles after the newest stored
+    one (re-fetching that one, since it may have been stored while still
+    open), which is a single request per symbol and interval for anything
+    synced within the last MAX_HISTORY_LIMIT periods.
+    """
+
+    def __init__(
+        self,
+        scraper: Optional[CryptoCompareScraper] = None,
+        store: Optional[OHLCVStore] = None,
+        backfill: Optional[Dict[str, int]] = None
+    ):
+        """
+        Initialize the ingester.
+
+        Args:
+            scraper: CryptoCompare scraper used for requests (its client
+                applies the shared rate limit)
+            store: Candle store to sync into
+            backfill: Candles to fetch per interval on a symbol's first sync
+        """
+        self.scraper = scraper or CryptoCompareScraper()
+        self.store = store or OHLCVStore()
+        self.backfill = dict(DEFAULT_BACKFILL)
+        if backfill:
+            self.backfill.update(backfill)
+
+    def fetch_new_candles(
+        self,
+        symbol: str,
+        interval: str = "day",
+        last_time: Optional[int] = None,
+        now: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the candles that are missing from the store for one symbol.
+
+        Args:
+            symbol: Coin symbol
+            interval: 'day' or 'hour'
+            last_time: Newest stored candle time, or None to backfill
+            now: Current Unix time (defaults to time.time())
+
+        Returns:
+            Candle dictionaries, oldest first
+        """
+        step = INTERVAL_SECONDS[interval]
+        current = int(now if now is not None else time.time()) // step * step
+        since = last_time if last_time is not None else current - self.backfill[interval] * step
+
+        pages = []
+        to_ts = None
+        while True:
+            end = to_ts if to_ts is not None else current
+            limit = max(1, min(MAX_HISTORY_LIMIT, (end - since) // step))
+            page = self.scraper.fetch_ohlcv(symbol, interval, limit=limit, to_ts=to_ts)
+            if not page:
+                break
+
+            candles = [candle for candle in page if candle["time"] >= since and not _is_placeholder(candle)]
+            pages.append(candles)
+
+            # Stop at the sync horizon or once the coin's listing date is reached
+            earliest = page[0]["time"]
+            if earliest <= since or len(candles) < sum(1 for candle in page if candle["time"] >= since):
+                break
+            to_ts = earliest - step
+
+        return [candle for candles in reversed(pages) for candle in candles]
+
+    def sync(
+        self,
+        symbols: Iterable[str],
+        intervals: Iterable[str] = ("day", "hour"),
+        max_workers: int = 8
+    ) -> Tuple[Dict[Tuple[str, str], int], Dict[Tuple[str, str], str]]:
+        """
+        Sync many symbols in parallel.
+
+        Requests run on a bounded worker pool and draw from the scraper
+        client's rate limit budget. Candles are written from the calling
+        thread as each symbol completes, so the store has a single writer.
+
+        Args:
+            symbols: Coin symbols (duplicates are synced once)
+            intervals: Intervals to sync
+            max_workers: Maximum number of concurrent requests
+
+        Returns:
+            Tuple of (candles written per (symbol, interval),
+            error message per failed (symbol, interval))
+        """
+        symbols = list(dict.fromkeys(symbols))
+        jobs = []
+        for interval in intervals:
+            if interval not in INTERVAL_SECONDS:
+                raise ValueError(f"Unknown history interval: {interval}")
+            last_times = self.store.last_timestamps(interval)
+            jobs.extend((symbol, interval, last_times.get(symbol)) for symbol in symbols)
+
+        written: Dict[Tuple[str, str], int] = {}
+        failures: Dict[Tuple[str, str], str] = {}
+        if not jobs:
+            return written, failures
+
+        now = time.time()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as executor:
+            futures = {
+                executor.submit(self.fetch_new_candles, symbol, interval, last_time, now): (symbol, interval)
+                for symbol, interval, last_time in jobs
+            }
+            for future in as_completed(futures):
+                symbol, interval = futures[future]
+                try:
+                    candles = future.result()
+                except Exception as e:
+                    logger.error(f"Error syncing {interval} history for {symbol}: {e}")
+                    failures[(symbol, interval)] = str(e)
+                    continue
+                written[(symbol, interval)] = self.store.write_candles(symbol, interval, candles)
+
+        return written, failures
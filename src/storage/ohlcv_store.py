@@ -0,0 +1,212 @@
+# src/storage/ohlcv_store.py
+import os
+import sqlite3
+import logging
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = "data/history/ohlcv.sqlite"
+
+# Candle length in seconds per interval
+INTERVAL_SECONDS = {
+    "day": 86400,
+    "hour": 3600,
+}
+
+CANDLE_COLUMNS = ["time", "open", "high", "low", "close", "volume_from", "volume_to"]
+
+
+class OHLCVStore:
+    """
+    Local SQLite store of OHLCV candles keyed by (symbol, interval, time).
+
+    Writing a candle that is already stored replaces it, so re-fetching the
+    most recent (possibly still open) candle simply updates it.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite file holding the candles
+        """
+        self.path = path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the store, creating it on first use."""
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30)
+
+        if not self._initialized:
+            # WAL lets readers (e.g. the app) query while a sync is writing
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS candles ("
+                " symbol TEXT NOT NULL,"
+                " interval TEXT NOT NULL,"
+                " time INTEGER NOT NULL,"
+                " open REAL, high REAL, low REAL, close REAL,"
+                " volume_from REAL, volume_to REAL,"
+                " PRIMARY KEY (symbol, interval, time)) WITHOUT ROWID"
+            )
+            self._initialized = True
+        return conn
+
+    def last_timestamps(self, interval: str) -> Dict[str, int]:
+        """
+        Return the newest stored candle time of every symbol for an interval.
+
+        Args:
+            interval: 'day' or 'hour'
+
+        Returns:
+            Dictionary mapping symbol to Unix timestamp
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT symbol, MAX(time) FROM candles WHERE interval = ? GROUP BY symbol", (interval,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return dict(rows)
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        """Return the newest stored candle time for a symbol, or None if it has none."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT MAX(time) FROM candles WHERE symbol = ? AND interval = ?", (symbol, interval)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0]
+
+    def write_candles(self, symbol: str, interval: str, candles: List[Dict[str, Any]]) -> int:
+        """
+        Insert or replace candles for a symbol.
+
+        Args:
+            symbol: Coin symbol
+            interval: 'day' or 'hour'
+            candles: Candle dictionaries with the CANDLE_COLUMNS keys
+
+        Returns:
+            Number of candles written
+        """
+        if not candles:
+            return 0
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO candles"
+                    " (symbol, interval, time, open, high, low, close, volume_from, volume_to)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (symbol, interval, candle["time"], candle["open"], candle["high"], candle["low"],
+                         candle["close"], candle["volume_from"], candle["volume_to"])
+                        for candle in candles
+                    ]
+                )
+        finally:
+            conn.close()
+        return len(candles)
+
+    def load(
+        self,
+        symbol: str,
+        interval: str = "day",
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Load stored candles for a symbol, oldest first.
+
+        Args:
+            symbol: Coin symbol
+            interval: 'day' or 'hour'
+            start: Optional first Unix timestamp to include
+            end: Optional last Unix timestamp to include
+
+        Returns:
+            DataFrame with the CANDLE_COLUMNS columns
+        """
+        query = "SELECT " + ", ".join(CANDLE_COLUMNS) + " FROM candles WHERE symbol = ? AND interval = ?"
+        params: List[Any] = [symbol, interval]
+        if start is not None:
+            query += " AND time >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND time <= ?"
+            params.append(end)
+        query += " ORDER BY time"
+
+        conn = self._connect()
+        try:
+            return pd.read_sql_query(query, conn, params=params)
+        finally:
+            conn.close()
+
+    def time_range(self, interval: str = "day") -> Optional[Tuple[int, int]]:
+        """Return the (oldest, newest) stored candle time for an interval, or None if it has none."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT MIN(time), MAX(time) FROM candles WHERE interval = ?", (interval,)).fetchone()
+        finally:
+            conn.close()
+        return None if row[0] is None else (row[0], row[1])
+
+    def iter_chunks(
+        self,
+        interval: str = "day",
+        columns: Sequence[str] = ("close",),
+        chunk_size: int = 200_000,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream every candle of an interval in chunks, ordered by symbol and time.
+
+        Args:
+            interval: 'day' or 'hour'
+            columns: Candle columns to read besides symbol and time
+            chunk_size: Rows per chunk
+            start: Oldest candle time to include
+            end: Newest candle time to include
+
+        Yields:
+            DataFrames with symbol, time and the requested columns
+        """
+        unknown = set(columns) - set(CANDLE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown candle columns: {sorted(unknown)}")
+
+        query = "SELECT symbol, time, " + ", ".join(columns) + " FROM candles WHERE interval = ?"
+        params = [interval]
+        if start is not None:
+            query += " AND time >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND time <= ?"
+            params.append(end)
+        query += " ORDER BY symbol, time"
+        conn = self._connect()
+        try:
+            yield from pd.read_sql_query(query, conn, params=params, chunksize=chunk_size)
+        finally:
+            conn.close()
+
+    def symbols(self, interval: str = "day") -> List[str]:
+        """Return the symbols that have stored candles for an interval."""
+        return sorted(self.last_timestamps(interval))
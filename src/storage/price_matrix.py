@@ -0,0 +1,245 @@
+# src/storage/price_matrix.py
+import os
+import json
+import time
+import shutil
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .ohlcv_store import OHLCVStore, INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MATRIX_PATH = "data/history/matrix"
+
+# Candle fields written by default
+DEFAULT_FIELDS = ("close", "volume_to")
+
+_META_FILE = "meta.json"
+
+# File next to the matrix directories naming the current one of an interval
+_CURRENT_SUFFIX = ".current"
+
+
+class PriceMatrix:
+    """
+    Dense on-disk [coin x timestamp] float32 matrices for historical analytics.
+
+    Each build of an interval writes a new versioned directory holding a raw
+    float32 file per field plus meta.json (symbols in row order, first
+    timestamp, step and length); a small pointer file names the current one.
+    Fields are opened with numpy.memmap, so slicing a time window across the
+    whole universe is a zero-copy strided view and only the touched pages
+    are read from disk. Missing candles are NaN.
+    """
+
+    def __init__(self, directory: str, mode: str = "r"):
+        """
+        Open an existing matrix.
+
+        Args:
+            directory: Matrix directory (as written by build() or create())
+            mode: numpy.memmap mode ('r' read-only, 'r+' writable)
+        """
+        self.directory = directory
+        self.mode = mode
+        with open(os.path.join(directory, _META_FILE)) as f:
+            meta = json.load(f)
+        self.symbols: List[str] = meta["symbols"]
+        self.start: int = meta["start"]
+        self.step: int = meta["step"]
+        self.length: int = meta["length"]
+        self.fields: List[str] = meta["fields"]
+        self._rows = {symbol: row for row, symbol in enumerate(self.symbols)}
+        self._arrays: Dict[str, np.memmap] = {}
+
+    @property
+    def shape(self):
+        return (len(self.symbols), self.length)
+
+    @property
+    def times(self) -> np.ndarray:
+        """Unix timestamp of every column."""
+        return self.start + self.step * np.arange(self.length, dtype=np.int64)
+
+    def field(self, name: str = "close") -> np.ndarray:
+        """Return the memory-mapped [coin x timestamp] array of a field."""
+        if name not in self._arrays:
+            if name not in self.fields:
+                raise KeyError(f"Field {name!r} not in matrix (has {self.fields})")
+            self._arrays[name] = np.memmap(
+                os.path.join(self.directory, f"{name}.f32"), dtype=np.float32, mode=self.mode, shape=self.shape
+            )
+        return self._arrays[name]
+
+    def rows(self, symbols: Sequence[str]) -> np.ndarray:
+        """Row numbers of the given symbols (KeyError for unknown symbols)."""
+        return np.fromiter((self._rows[symbol.upper()] for symbol in symbols), dtype=np.int64, count=len(symbols))
+
+    def columns(self, start: Optional[int] = None, end: Optional[int] = None) -> slice:
+        """Column slice covering timestamps start <= t <= end."""
+        first = 0 if start is None else max(0, -(-(start - self.start) // self.step))
+        last = self.length if end is None else min(self.length, (end - self.start) // self.step + 1)
+        return slice(first, max(first, last))
+
+    def window(
+        self,
+        name: str = "close",
+        symbols: Optional[Sequence[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Slice a field by symbols and time.
+
+        Args:
+            name: Field name
+            symbols: Symbols to select (all coins if omitted)
+            start: First Unix timestamp to include
+            end: Last Unix timestamp to include
+
+        Returns:
+            [coin x timestamp] array; a view of the memmap (no copy) when
+            symbols is omitted, otherwise a copy of just the selected rows
+        """
+        columns = self.columns(start, end)
+        array = self.field(name)
+        if symbols is None:
+            return array[:, columns]
+        return array[self.rows(symbols), columns]
+
+    def flush(self):
+        """Write pending changes of writable fields to disk."""
+        for array in self._arrays.values():
+            array.flush()
+
+    @classmethod
+    def create(
+        cls,
+        directory: str,
+        symbols: Sequence[str],
+        start: int,
+        step: int,
+        length: int,
+        fields: Sequence[str] = DEFAULT_FIELDS
+    ) -> "PriceMatrix":
+        """
+        Create a NaN-filled matrix and open it for writing.
+
+        Args:
+            directory: Directory to create (must not contain a matrix yet)
+            symbols: Symbols in row order
+            start: Unix timestamp of the first column
+            step: Seconds between columns
+            length: Number of columns
+            fields: Field names, one file each
+
+        Returns:
+            PriceMatrix opened in 'r+' mode
+        """
+        os.makedirs(directory, exist_ok=True)
+        shape = (len(symbols), length)
+        for name in fields:
+            array = np.memmap(os.path.join(directory, f"{name}.f32"), dtype=np.float32, mode="w+", shape=shape)
+            array[:] = np.nan
+            array.flush()
+            del array
+        with open(os.path.join(directory, _META_FILE), "w") as f:
+            json.dump({
+                "symbols": [symbol.upper() for symbol in symbols],
+                "start": int(start),
+                "step": int(step),
+                "length": int(length),
+                "fields": list(fields),
+            }, f)
+        return cls(directory, mode="r+")
+
+    @classmethod
+    def build(
+        cls,
+        store: OHLCVStore,
+        interval: str = "day",
+        root: str = DEFAULT_MATRIX_PATH,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        chunk_size: int = 200_000
+    ) -> Optional["PriceMatrix"]:
+        """
+        (Re)build the matrix of an interval from the OHLCV store.
+
+        Candles are streamed from SQLite in chunks and scattered into the
+        memmap, so memory use does not grow with the history size. The new
+        matrix is written to its own directory and published by replacing the
+        interval's pointer file in one step, so open() sees either the old or
+        the new matrix. Candles stored while the build runs (after the time
+        range or for new symbols) are left for the next build.
+
+        Args:
+            store: Candle store to read
+            interval: 'day' or 'hour'
+            root: Directory holding one matrix per interval
+            fields: Candle fields to write
+            chunk_size: Candles read per chunk
+
+        Returns:
+            The rebuilt matrix opened read-only, or None if the store has no
+            candles for the interval
+        """
+        time_range = store.time_range(interval)
+        if time_range is None:
+            return None
+
+        step = INTERVAL_SECONDS[interval]
+        symbols = store.symbols(interval)
+        start, end = time_range
+        version = f"{interval}.{time.time_ns()}"
+        directory = os.path.join(root, version)
+
+        matrix = cls.create(directory, symbols, start, step, (end - start) // step + 1, fields)
+        rows = {symbol: row for row, symbol in enumerate(symbols)}
+        arrays = {name: matrix.field(name) for name in fields}
+        written = 0
+        for chunk in store.iter_chunks(interval, fields, chunk_size, start=start, end=end):
+            row = chunk["symbol"].map(rows)
+            known = row.notna().to_numpy()
+            if not known.all():
+                # Symbols that got their first candle after the symbol list was read
+                chunk, row = chunk[known], row[known]
+            row = row.to_numpy(dtype=np.int64)
+            column = (chunk["time"].to_numpy() - start) // step
+            for name, array in arrays.items():
+                array[row, column] = chunk[name].to_numpy(dtype=np.float32, na_value=np.nan)
+            written += len(chunk)
+        matrix.flush()
+        del arrays, matrix
+
+        # Publish the finished matrix with a single rename of the pointer file.
+        # Readers holding an older memmap keep their open files.
+        pointer = os.path.join(root, interval + _CURRENT_SUFFIX)
+        with open(pointer + ".tmp", "w") as f:
+            f.write(version)
+        os.replace(pointer + ".tmp", pointer)
+        _remove_older_versions(root, interval, version)
+        logger.info(f"Built {interval} price matrix: {len(symbols)} coins x {(end - start) // step + 1} candles "
+                    f"({written} stored)")
+        return cls(directory)
+
+    @classmethod
+    def open(cls, interval: str = "day", root: str = DEFAULT_MATRIX_PATH) -> Optional["PriceMatrix"]:
+        """Open the matrix of an interval read-only, or return None if it has not been built."""
+        try:
+            with open(os.path.join(root, interval + _CURRENT_SUFFIX)) as f:
+                version = f.read()
+        except FileNotFoundError:
+            return None
+        return cls(os.path.join(root, version))
+
+
+def _remove_older_versions(root: str, interval: str, current: str):
+    """Delete the matrix directories of an interval built before the current one."""
+    current_ns = int(current.rsplit(".", 1)[1])
+    for name in os.listdir(root):
+        prefix, _, suffix = name.rpartition(".")
+        if prefix == interval and suffix.isdigit() and int(suffix) < current_ns:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
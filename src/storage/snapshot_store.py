@@ -0,0 +1,229 @@
+# src/storage/snapshot_store.py
+import os
+import time
+import uuid
+import logging
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Union
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ..scrapers.columnar import MARKET_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = "data/snapshots"
+
+_DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+# Stored columns: MARKET_SCHEMA with name and symbol dictionary-encoded. The
+# date and source of a snapshot are partition directories, not file columns.
+SNAPSHOT_SCHEMA = pa.schema([
+    pa.field(field.name, _DICTIONARY if field.name in ("name", "symbol") else field.type)
+    for field in MARKET_SCHEMA if field.name != "source"
+])
+
+# Hive-style partition keys: <root>/date=YYYY-MM-DD/source=<name>/part-*.parquet.
+# A partition key is stored once per directory, which is as compact as a
+# dictionary; query results dictionary-encode it again.
+PARTITION_SCHEMA = pa.schema([("date", pa.string()), ("source", pa.string())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+# Columns as read back, partition keys included
+DATASET_SCHEMA = pa.unify_schemas([SNAPSHOT_SCHEMA, PARTITION_SCHEMA])
+
+# Query results: MARKET_SCHEMA column order, with name, symbol and source dictionary-encoded
+RESULT_SCHEMA = pa.schema([
+    pa.field(field.name, _DICTIONARY if field.name in ("name", "symbol", "source") else field.type)
+    for field in MARKET_SCHEMA
+])
+
+# Rows per Parquet row group; small groups keep symbol statistics selective
+ROW_GROUP_SIZE = 4096
+
+TimeBound = Union[None, float, int, datetime, str]
+
+
+def _to_datetime(value: TimeBound) -> Optional[datetime]:
+    """Normalize epoch seconds, ISO strings and datetimes to an aware UTC datetime."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime.fromtimestamp(value, tz=timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _encode_source(table: pa.Table) -> pa.Table:
+    """Dictionary-encode the source partition column of a query result."""
+    if "source" not in table.column_names:
+        return table
+    index = table.schema.get_field_index("source")
+    return table.set_column(index, pa.field("source", _DICTIONARY), pc.dictionary_encode(table["source"]))
+
+
+class SnapshotStore:
+    """
+    Append-only Parquet store of market data snapshots.
+
+    Each append writes new files under a date/source partition and never
+    rewrites existing ones. Rows are sorted by symbol before writing, so the
+    row-group statistics let a query for a few symbols skip most of every
+    file, while time-range queries skip whole date directories.
+    """
+
+    def __init__(self, root: str = DEFAULT_SNAPSHOT_PATH):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the partitioned dataset
+        """
+        self.root = root
+
+    def append(self, table: pa.Table) -> int:
+        """
+        Store a market data snapshot.
+
+        Args:
+            table: MARKET_SCHEMA table (e.g. from the scrapers' *_table methods);
+                rows may come from several sources and fetch times
+
+        Returns:
+            Number of rows written
+        """
+        if table.num_rows == 0:
+            return 0
+
+        table = table.select(MARKET_SCHEMA.names).cast(MARKET_SCHEMA)
+        # Rows without a fetch time are stamped with the time of the append
+        fetched_at = pc.fill_null(
+            table["fetched_at"], pa.scalar(int(time.time() * 1000), type=MARKET_SCHEMA.field("fetched_at").type)
+        )
+        table = table.set_column(MARKET_SCHEMA.get_field_index("fetched_at"), "fetched_at", fetched_at)
+        dates = pc.strftime(fetched_at, format="%Y-%m-%d")
+        sources = pc.fill_null(table["source"], "unknown")
+
+        written = 0
+        batch = uuid.uuid4().hex[:12]
+        partitions = pa.table({"date": dates, "source": sources}).group_by(["date", "source"]).aggregate([])
+        for date, source in zip(partitions["date"].to_pylist(), partitions["source"].to_pylist()):
+            mask = pc.and_(pc.equal(dates, date), pc.equal(sources, source))
+            part = table.filter(mask).drop_columns(["source"]).sort_by([("symbol", "ascending")])
+            part = part.cast(SNAPSHOT_SCHEMA)
+
+            # Partition values are URI-encoded, as the hive partitioning decodes them
+            directory = os.path.join(self.root, f"date={date}", f"source={quote(source, safe='')}")
+            os.makedirs(directory, exist_ok=True)
+            name = f"part-{int(time.time() * 1000)}-{batch}.parquet"
+            # Write under a hidden name (skipped by readers) so nobody sees a partial file
+            temp_path = os.path.join(directory, "." + name)
+            pq.write_table(part, temp_path, row_group_size=ROW_GROUP_SIZE,
+                           use_dictionary=["name", "symbol"], compression="zstd")
+            os.replace(temp_path, os.path.join(directory, name))
+            written += part.num_rows
+
+        logger.info(f"Stored {written} snapshot rows in {len(partitions)} partitions")
+        return written
+
+    def dataset(self) -> Optional[ds.Dataset]:
+        """Return the stored snapshots as a pyarrow dataset (None if nothing is stored)."""
+        if not os.path.isdir(self.root):
+            return None
+        return ds.dataset(self.root, schema=DATASET_SCHEMA, format="parquet", partitioning=PARTITIONING)
+
+    def query(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        start: TimeBound = None,
+        end: TimeBound = None,
+        sources: Optional[Iterable[str]] = None,
+        columns: Optional[List[str]] = None
+    ) -> pa.Table:
+        """
+        Read stored snapshots matching the given filters.
+
+        The date and source filters prune partition directories; the symbol
+        and fetch-time filters are pushed down to the Parquet row groups.
+
+        Args:
+            symbols: Symbols to include (all if omitted)
+            start: Inclusive lower bound on fetched_at (epoch seconds, ISO
+                string or datetime)
+            end: Exclusive upper bound on fetched_at
+            sources: Source names to include (all if omitted)
+            columns: Columns to read (defaults to the MARKET_SCHEMA columns)
+
+        Returns:
+            pyarrow Table with the requested columns, sorted by fetched_at;
+            name, symbol and source stay dictionary-encoded
+        """
+        columns = columns or MARKET_SCHEMA.names
+        dataset = self.dataset()
+        if dataset is None:
+            return _encode_source(DATASET_SCHEMA.empty_table().select(columns))
+
+        conditions: List[Any] = []
+        if symbols is not None:
+            conditions.append(ds.field("symbol").isin([symbol.upper() for symbol in symbols]))
+        if sources is not None:
+            conditions.append(ds.field("source").isin(list(sources)))
+
+        start, end = _to_datetime(start), _to_datetime(end)
+        timestamp_type = MARKET_SCHEMA.field("fetched_at").type
+        if start is not None:
+            conditions.append(ds.field("date") >= start.strftime("%Y-%m-%d"))
+            conditions.append(ds.field("fetched_at") >= pa.scalar(start, type=timestamp_type))
+        if end is not None:
+            conditions.append(ds.field("date") <= end.strftime("%Y-%m-%d"))
+            conditions.append(ds.field("fetched_at") < pa.scalar(end, type=timestamp_type))
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        table = _encode_source(dataset.to_table(columns=columns, filter=expression))
+        if "fetched_at" in columns:
+            table = table.sort_by([("fetched_at", "ascending")])
+        return table
+
+    def latest(self, sources: Optional[Iterable[str]] = None) -> pa.Table:
+        """
+        Return the most recent snapshot of each source.
+
+        Args:
+            sources: Source names to include (all if omitted)
+
+        Returns:
+            Table of the MARKET_SCHEMA columns with the rows of each source's
+            newest fetch
+        """
+        dataset = self.dataset()
+        if dataset is None:
+            return RESULT_SCHEMA.empty_table()
+
+        # Only the newest date directory of each source needs to be read;
+        # the partition keys are known from the file paths alone
+        newest_dates = {}
+        for fragment in dataset.get_fragments():
+            keys = ds.get_partition_keys(fragment.partition_expression)
+            if sources is None or keys["source"] in sources:
+                newest_dates[keys["source"]] = max(keys["date"], newest_dates.get(keys["source"], ""))
+
+        tables = []
+        for source, date in sorted(newest_dates.items()):
+            table = dataset.to_table(
+                columns=MARKET_SCHEMA.names, filter=(ds.field("source") == source) & (ds.field("date") == date)
+            )
+            tables.append(_encode_source(table.filter(pc.equal(table["fetched_at"], pc.max(table["fetched_at"])))))
+
+        if not tables:
+            return RESULT_SCHEMA.empty_table()
+        return pa.concat_tables(tables).unify_dictionaries()
@@ -1,7 +1,181 @@
 # src/utils/data_processing.py
+import os
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+from typing import Iterable, List, Dict, Any, Optional
+
+# Multipliers for abbreviated amounts such as $1.2B or $2.35T
+SUFFIX_MULTIPLIERS = {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+
+_NUMBER_PATTERN = r'^(?P<number>[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)(?P<suffix>[KMBT]?)$'
+_SUFFIXES = pa.array(list(SUFFIX_MULTIPLIERS), type=pa.string())
+_MULTIPLIERS = pa.array(list(SUFFIX_MULTIPLIERS.values()), type=pa.float64())
 
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     df = df.drop_duplicates()
     df = df.dropna(subset=['price'])
     return df
+
+def parse_numeric_column(values: Iterable, abbreviations: bool = True) -> np.ndarray:
+    """
+    Parse a whole column of scraped number strings in one vectorized pass.
+
+    Handles currency symbols, thousands separators, percent signs, unicode
+    minus signs and (optionally) K/M/B/T suffixes. Anything unparseable,
+    empty or missing becomes NaN. The work runs in Arrow compute kernels,
+    so there is no Python call per cell.
+
+    Args:
+        values: Raw strings (None/NaN allowed), e.g. ['$1,234.5', '$2.1T', None]
+        abbreviations: Whether to expand K/M/B/T suffixes
+
+    Returns:
+        float64 numpy array of the same length
+    """
+    raw = pa.array(values if isinstance(values, (list, np.ndarray, pd.Series)) else list(values),
+                   type=pa.string(), from_pandas=True)
+    cleaned = pc.replace_substring_regex(
+        pc.replace_substring(raw, '−', '-'), r'[$,%\s]', ''
+    )
+    parts = pc.extract_regex(cleaned, _NUMBER_PATTERN)
+    numbers = pc.cast(pc.struct_field(parts, 'number'), pa.float64())
+    suffixes = pc.struct_field(parts, 'suffix')
+
+    if abbreviations:
+        multipliers = pc.fill_null(pc.take(_MULTIPLIERS, pc.index_in(suffixes, value_set=_SUFFIXES)), 1.0)
+        numbers = pc.multiply(numbers, multipliers)
+    else:
+        # A suffixed value is not a plain number
+        numbers = pc.if_else(pc.equal(suffixes, ''), numbers, None)
+
+    return numbers.to_numpy(zero_copy_only=False)
+
+def parse_price_column(values: Iterable) -> np.ndarray:
+    """Parse price strings like '$61,245.32' to a float64 array."""
+    return parse_numeric_column(values, abbreviations=False)
+
+def parse_percentage_column(values: Iterable) -> np.ndarray:
+    """Parse percentage strings like '-1.2%' to a float64 array."""
+    return parse_numeric_column(values, abbreviations=False)
+
+def parse_abbreviated_column(values: Iterable) -> np.ndarray:
+    """Parse market cap / volume strings like '$1.2B' or '$2.35T' to a float64 array."""
+    return parse_numeric_column(values, abbreviations=True)
+
+def parse_market_columns(
+    rows: List[Dict[str, Optional[str]]],
+    uppercase_symbols: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    Turn raw text rows scraped from a market table into parsed columns.
+
+    Numeric columns are parsed column-wise with the vectorized parsers above.
+    Rows missing a name, symbol or price are skipped.
+
+    Args:
+        rows: Dictionaries of raw cell text keyed by name, symbol, price,
+            change_24h, market_cap and volume_24h (None for missing cells)
+        uppercase_symbols: Whether to upper-case the symbols
+
+    Returns:
+        Dictionary of equal-length arrays keyed by name, symbol, price,
+        change_24h, market_cap and volume_24h (NaN for unparseable values)
+    """
+    table = pd.DataFrame.from_records(
+        rows, columns=['name', 'symbol', 'price', 'change_24h', 'market_cap', 'volume_24h']
+    )
+    # Skip rows where any essential element is missing
+    essential = table[['name', 'symbol', 'price']].fillna('').astype(bool).all(axis=1)
+    table = table[essential]
+
+    symbols = table['symbol'].str.upper() if uppercase_symbols and not table.empty else table['symbol']
+    return {
+        'name': table['name'].to_numpy(),
+        'symbol': symbols.to_numpy(),
+        'price': parse_price_column(table['price']),
+        'change_24h': parse_percentage_column(table['change_24h']),
+        'market_cap': parse_abbreviated_column(table['market_cap']),
+        'volume_24h': parse_abbreviated_column(table['volume_24h'])
+    }
+
+def parse_market_rows(
+    rows: List[Dict[str, Optional[str]]],
+    source: str,
+    uppercase_symbols: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Turn raw text rows scraped from a market table into coin dictionaries.
+
+    Args:
+        rows: Dictionaries of raw cell text (see parse_market_columns)
+        source: Source label stored on every coin
+        uppercase_symbols: Whether to upper-case the symbols
+
+    Returns:
+        List of dictionaries containing coin data (None for unparseable values)
+    """
+    columns = parse_market_columns(rows, uppercase_symbols)
+    if not len(columns['name']):
+        return []
+
+    parsed = pd.DataFrame(columns)
+    parsed['source'] = source
+    return parsed.astype(object).where(parsed.notna(), None).to_dict('records')
+
+def dataframe_to_records(data: pd.DataFrame, text_columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Turn each row of a market DataFrame into a text/metadata record for retrieval.
+
+    Args:
+        data: DataFrame of coin rows (market and/or sentiment columns)
+        text_columns: Columns rendered into the text (defaults to all)
+
+    Returns:
+        List of {'text': str, 'metadata': dict} records, one per row; missing
+        values are left out of both and metadata holds plain Python values
+    """
+    if data is None or data.empty:
+        return []
+
+    columns = text_columns or list(data.columns)
+    plain = data.astype(object).where(data.notna(), None)
+    records = []
+    for row in plain.to_dict('records'):
+        metadata = {key: (value.isoformat() if hasattr(value, 'isoformat') else value)
+                    for key, value in row.items() if value is not None}
+        label = metadata.get('name') or metadata.get('symbol') or 'Unknown'
+        if metadata.get('symbol') and metadata.get('name'):
+            label = f"{metadata['name']} ({metadata['symbol']})"
+        details = "; ".join(f"{column}: {metadata[column]}" for column in columns
+                            if column not in ('name', 'symbol') and column in metadata)
+        records.append({'text': f"{label}: {details}" if details else label, 'metadata': metadata})
+    return records
+
+def write_session_snapshot(data: pd.DataFrame, directory: str, session_id: str) -> str:
+    """
+    Save a session's data as an Arrow IPC (Feather) file.
+
+    Each session writes its own file, via a temporary name and an atomic
+    rename, so concurrent sessions never overwrite or half-read each other.
+
+    Args:
+        data: DataFrame to save
+        directory: Directory holding the session snapshots
+        session_id: Identifier of the session (used as the file name)
+
+    Returns:
+        Path of the written file
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{session_id}.arrow")
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(pa.Table.from_pandas(data, preserve_index=False), temp_path, compression="zstd")
+    os.replace(temp_path, path)
+    return path
+
+def read_session_snapshot(path: str) -> pd.DataFrame:
+    """Load a DataFrame saved by write_session_snapshot()."""
+    return feather.read_table(path, memory_map=True).to_pandas()
@@ -0,0 +1,362 @@
+# tests/stand_in_server.py
+"""
+Local stand-in for the market-data providers.
+
+Replays the recorded responses in tests/fixtures over HTTP so the scrapers
+can be exercised offline, with optional latency, server errors and 429
+rate-limit replies injected at configurable rates.
+"""
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _load(name, binary=False):
+    with open(os.path.join(FIXTURES_DIR, name), "rb" if binary else "r", encoding=None if binary else "utf-8") as f:
+        return f.read()
+
+
+# (category, slug, title, text) of the stand-in blog posts
+BLOG_POSTS = [
+    ("market-update", "bitcoin-etf-inflows", "Bitcoin ETF inflows hit a record",
+     "Bitcoin (BTC) rallied to a new high as spot ETF inflows reached a record. Analysts remain bullish and expect "
+     "strong demand to continue, although some warn of short-term volatility."),
+    ("market-update", "ethereum-upgrade-gains", "Ethereum gains ahead of network upgrade",
+     "Ethereum (ETH) gained 6% this week. Developers confirmed the upgrade timeline and staking growth remains "
+     "robust, a positive sign for the ecosystem."),
+    ("news", "solana-outage-report", "Solana network outage report",
+     "Solana (SOL) suffered a brief outage on Tuesday. Validators restarted the network, but the incident raised "
+     "concerns about reliability and the price fell sharply before recovering some losses."),
+    ("news", "bnb-burn-completed", "Quarterly BNB burn completed",
+     "The quarterly BNB burn was completed, removing tokens from supply. BNB has outperformed the market and "
+     "exchange volume is growing."),
+    ("crypto-education", "what-is-polygon", "What is Polygon?",
+     "Polygon (MATIC) is a scaling network for Ethereum. It offers cheap transactions and a growing developer "
+     "community, although competition from other layer 2 networks is intense."),
+    ("news", "xrp-lawsuit-update", "XRP lawsuit update",
+     "XRP slipped after a court delay. Traders are cautious and uncertainty about the lawsuit weighs on sentiment, "
+     "with the risk of further decline if the ruling is negative."),
+    ("market-update", "dogecoin-meme-rally", "Dogecoin meme rally fades",
+     "Dogecoin (DOGE) surged on social media hype, then dropped as the rally faded. The bearish reversal wiped out "
+     "most of the weekly gains."),
+    ("product", "cardano-staking-launch", "Cardano staking now available",
+     "Cardano (ADA) staking is now available with competitive rewards. Users can earn yield securely with no "
+     "lock-up period."),
+]
+
+HISTORY_STEPS = {
+    "/data/v2/histoday": 86400,
+    "/data/v2/histohour": 3600,
+}
+
+
+def history_candles(symbol, step, limit, to_ts):
+    """
+    Deterministic CryptoCompare-style candles for a symbol.
+
+    Each symbol gets its own listing date (earlier periods are all-zero
+    candles, as the real API returns) and its own smooth price path.
+    """
+    seed = zlib.crc32(symbol.encode("utf-8"))
+    listed = 1_500_000_000 + seed % 200_000_000
+    base = 1 + seed % 1000
+    end = to_ts // step * step
+
+    def price(t):
+        return round(base * (1 + 0.2 * math.sin(t / (step * 17.0)) + 0.05 * math.sin(t / (step * 3.0))), 6)
+
+    candles = []
+    for t in range(end - limit * step, end + step, step):
+        if t < listed:
+            candles.append({"time": t, "high": 0, "low": 0, "open": 0, "volumefrom": 0, "volumeto": 0,
+                            "close": 0, "conversionType": "direct", "conversionSymbol": ""})
+            continue
+        open_, close = price(t), price(t + step)
+        candles.append({"time": t, "high": max(open_, close) * 1.01, "low": min(open_, close) * 0.99,
+                        "open": open_, "volumefrom": 1000.0 + seed % 97, "volumeto": round((1000.0 + seed % 97) * close, 2),
+                        "close": close, "conversionType": "direct", "conversionSymbol": ""})
+    return {"Aggregated": False, "TimeFrom": candles[0]["time"], "TimeTo": candles[-1]["time"], "Data": candles}
+
+
+class StandInServer:
+    """
+    Threaded HTTP server imitating the CoinGecko, CoinMarketCap and
+    CryptoCompare endpoints the scrapers use.
+
+    Routes:
+        /api/v3/coins/markets                   CoinGecko markets (page/per_page)
+        /v1/cryptocurrency/listings/latest      CoinMarketCap listings (start/limit)
+        /data/top/mktcapfull                    CryptoCompare top list (limit/page)
+        /data/v2/histoday, /data/v2/histohour   CryptoCompare OHLCV (synthetic, per symbol)
+        /stream/quotes                          SSE ticker feed (symbols/interval/events)
+        /blog/, /blog/<category>/<slug>         Blog index and articles (ETag/Last-Modified)
+        /en/coins                               CoinGecko coins page
+        /en/                                    CoinMarketCap home page
+
+    Use as a context manager, or call start() and stop().
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, retry_after=1,
+                 rate_limit_first=0, seed=None):
+        """
+        Args:
+            latency: Seconds added to every response
+            jitter: Extra uniformly distributed delay of up to this many seconds
+            error_rate: Fraction of requests answered with HTTP 500
+            rate_limit_rate: Fraction of requests answered with HTTP 429
+            retry_after: Retry-After value (seconds) sent with 429 replies
+            rate_limit_first: Number of initial requests answered with HTTP 429
+            seed: Seed for the fault-injection random generator
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.rate_limit_first = rate_limit_first
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.markets = json.loads(_load("coingecko_markets.json"))
+        listings = json.loads(_load("coinmarketcap_listings.json"))
+        self.listings_status, self.listings = listings["status"], listings["data"]
+        self.top_list = json.loads(_load("cryptocompare_mktcapfull.json"))
+        self.pages = {
+            "/en/coins": _load("coingecko_coins.html", binary=True),
+            "/en/": _load("coinmarketcap_home.html", binary=True),
+        }
+
+        # Blog posts by path; tests may edit them (or page_nonce, which changes
+        # the page bytes but not the article text) between crawls
+        self.blog_posts = {
+            f"/blog/{category}/{slug}": {"title": title, "text": text, "published": f"2024-05-{day + 1:02d}"}
+            for day, (category, slug, title, text) in enumerate(BLOG_POSTS)
+        }
+        self.page_nonce = 0
+
+        self._stopping = threading.Event()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def point_scrapers(self, *scrapers):
+        """Redirect the base URLs of CoinGecko/CoinMarketCap/CryptoCompare scrapers here."""
+        for scraper in scrapers:
+            name = type(scraper).__name__
+            if name == "CoinGeckoScraper":
+                scraper.base_url = self.url
+                scraper.api_base_url = scraper.pro_api_base_url = f"{self.url}/api/v3"
+            elif name == "CoinMarketCapScraper":
+                scraper.base_url = self.url
+                scraper.api_base_url = f"{self.url}/v1"
+            elif name == "CryptoCompareScraper":
+                scraper.base_url = f"{self.url}/data"
+            else:
+                raise ValueError(f"No stand-in routes for {name}")
+        return scrapers
+
+    def _fault(self):
+        """Pick the injected fault for one request: 429, 500 or None."""
+        with self._lock:
+            if self.rate_limit_first > 0:
+                self.rate_limit_first -= 1
+                return 429
+            roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+    def _route(self, path, query):
+        """Return (status, content type, body) for a request path."""
+        def number(name, default):
+            try:
+                return int(query.get(name, [default])[0])
+            except ValueError:
+                return default
+
+        if path == "/api/v3/coins/markets":
+            page, per_page = number("page", 1), number("per_page", 100)
+            start = (page - 1) * per_page
+            return 200, "application/json", json.dumps(self.markets[start:start + per_page])
+        if path == "/v1/cryptocurrency/listings/latest":
+            start, limit = number("start", 1) - 1, number("limit", 100)
+            data = self.listings[start:start + limit]
+            return 200, "application/json", json.dumps({"status": self.listings_status, "data": data})
+        if path == "/data/top/mktcapfull":
+            limit, page = number("limit", 10), number("page", 0)
+            start = page * limit
+            body = dict(self.top_list, Data=self.top_list["Data"][start:start + limit])
+            return 200, "application/json", json.dumps(body)
+        if path in HISTORY_STEPS:
+            symbol = query.get("fsym", ["BTC"])[0]
+            to_ts = number("toTs", int(time.time()))
+            body = {"Response": "Success", "Message": "", "HasWarning": False, "Type": 100,
+                    "Data": history_candles(symbol, HISTORY_STEPS[path], number("limit", 30), to_ts)}
+            return 200, "application/json", json.dumps(body)
+        if path in self.pages:
+            return 200, "text/html; charset=utf-8", self.pages[path]
+        return 404, "application/json", json.dumps({"error": "not found"})
+
+    def _blog(self, path, request_headers):
+        """Return (status, content type, body, headers) for a blog page, honoring validators."""
+        if path == "/blog/":
+            links = "".join(f'<li><a href="{post_path}">{post["title"]}</a></li>'
+                            for post_path, post in self.blog_posts.items())
+            body = f"<html><body><nav><a href='/blog/'>Home</a></nav><ul>{links}</ul></body></html>"
+            return 200, "text/html; charset=utf-8", body, {}
+
+        post = self.blog_posts.get(path)
+        if post is None:
+            return 404, "text/html", "<html><body>Not found</body></html>", {}
+
+        body = (
+            f"<html><head><title>{post['title']}</title><script>var nonce = {self.page_nonce};</script></head>"
+            f"<body><nav><a href='/blog/'>Blog</a></nav><article><header><h1>{post['title']}</h1>"
+            f"<time datetime='{post['published']}'>{post['published']}</time></header>"
+            f"<div class='entry-content'><p>{post['text']}</p></div></article>"
+            f"<footer>Not investment advice.</footer></body></html>"
+        )
+        etag = '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:16] + '"'
+        headers = {"ETag": etag, "Last-Modified": "Sat, 01 Jun 2024 12:00:00 GMT"}
+        if request_headers.get("If-None-Match") == etag:
+            with self._lock:
+                self.stats[304] += 1
+            return 304, "text/html", b"", headers
+        return 200, "text/html; charset=utf-8", body, headers
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                delay = server.latency + (server._random.uniform(0, server.jitter) if server.jitter else 0.0)
+                if delay:
+                    time.sleep(delay)
+
+                parsed = urlparse(self.path)
+                fault = server._fault()
+                with server._lock:
+                    server.stats["requests"] += 1
+                    server.stats[parsed.path] += 1
+                    if fault:
+                        server.stats[fault] += 1
+
+                headers = {}
+                if fault == 429:
+                    status, content_type, body = 429, "application/json", json.dumps({"error": "rate limited"})
+                    headers["Retry-After"] = str(server.retry_after)
+                elif fault == 500:
+                    status, content_type, body = 500, "application/json", json.dumps({"error": "internal error"})
+                elif parsed.path == "/stream/quotes":
+                    self.stream_quotes(parse_qs(parsed.query))
+                    return
+                elif parsed.path.startswith("/blog/"):
+                    status, content_type, body, headers = server._blog(parsed.path, self.headers)
+                else:
+                    status, content_type, body = server._route(parsed.path, parse_qs(parsed.query))
+
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def stream_quotes(self, query):
+                """Send random-walk ticks for the requested symbols as server-sent events."""
+                symbols = query.get("symbols", ["BTC,ETH,SOL"])[0].split(",")
+                interval = float(query.get("interval", ["0.1"])[0])
+                max_events = int(query.get("events", ["0"])[0])
+                prices = {item["symbol"]: item["quote"]["USD"]["price"] for item in server.listings}
+                walk = random.Random(",".join(symbols))
+
+                # Event ids continue from Last-Event-ID after a reconnect
+                event_id = int(self.headers.get("Last-Event-ID") or 0)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                try:
+                    self.wfile.write(b"retry: 100\n: connected\n\n")
+                    sent = 0
+                    while not server._stopping.is_set() and (not max_events or sent < max_events):
+                        event_id += 1
+                        ticks = []
+                        for symbol in walk.sample(symbols, max(1, len(symbols) // 2)):
+                            price = prices.get(symbol, 1.0) * (1 + walk.uniform(-0.001, 0.001))
+                            prices[symbol] = price
+                            ticks.append({"symbol": symbol, "price": round(price, 8), "ts": time.time()})
+                        self.wfile.write(f"id: {event_id}\nevent: quotes\ndata: {json.dumps(ticks)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        with server._lock:
+                            server.stats["events"] += 1
+                        sent += 1
+                        server._stopping.wait(interval)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve recorded provider responses locally")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with StandInServer(latency=args.latency, error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate) as stand_in:
+        print(f"Serving on {stand_in.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
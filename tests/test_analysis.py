@@ -1,8 +1,141 @@
 # tests/test_analysis.py
 # python -m unittest discover tests
 import unittest
+from unittest import mock
+import numpy as np
 import pandas as pd
-from src.analysis.market_analyzer import MarketAnalyzer
+from src.analysis.market_analyzer import MarketAnalyzer, POTENTIAL_RETURNS
+
+def reference_score_coins(data, risk_tolerance, investment_horizon):
+    """The original row-wise scoring, kept to check the vectorized version."""
+    scored_data = data.copy()
+    scored_data['score'] = 0.0
+    max_market_cap = scored_data['market_cap'].max()
+    scored_data['market_cap_score'] = np.log1p(scored_data['market_cap']) / np.log1p(max_market_cap)
+    risk_weights = {"Very Low": 3.0, "Low": 2.0, "Medium": 1.0, "High": 0.5, "Very High": 0.2}
+    scored_data['score'] += scored_data['market_cap_score'] * risk_weights.get(risk_tolerance, 1.0)
+    scored_data['change_score'] = ((scored_data['change_24h'] + 10) / 20).clip(0, 1)
+    horizon_weights = {"Short-term (0-3 months)": 2.0, "Medium-term (3-12 months)": 1.0, "Long-term (1+ years)": 0.5}
+    scored_data['score'] += scored_data['change_score'] * horizon_weights.get(investment_horizon, 1.0)
+    scored_data['volume_to_cap'] = scored_data['volume_24h'] / scored_data['market_cap']
+    max_ratio = scored_data['volume_to_cap'].quantile(0.95)
+    scored_data['volume_score'] = (scored_data['volume_to_cap'] / max_ratio).clip(0, 1)
+    scored_data['score'] += scored_data['volume_score'] * 0.5
+
+    def btc_eth_bias(row):
+        if row['name'] == 'Bitcoin':
+            return 1.5 if risk_tolerance in ['Very Low', 'Low'] else 0.8
+        if row['name'] == 'Ethereum':
+            return 1.3 if risk_tolerance in ['Low', 'Medium'] else 0.9
+        return 1.0
+
+    scored_data['score'] *= scored_data.apply(btc_eth_bias, axis=1)
+    return scored_data
+
+def reference_rationale(coin_name, score, market_cap, change_24h):
+    """The original if/elif rationale, kept to check the lookup tables."""
+    rationale_parts = [f"{coin_name} was selected due to its strong performance indicators."]
+    if market_cap:
+        if market_cap > 1e11:
+            rationale_parts.append("It has a very large market capitalization, indicating stability and broad adoption.")
+        elif market_cap > 1e10:
+            rationale_parts.append("It has a solid market cap, making it relatively stable in the market.")
+        else:
+            rationale_parts.append("It is a mid-cap coin, which may offer growth potential but with more volatility.")
+    if change_24h:
+        if change_24h > 5:
+            rationale_parts.append("The asset showed strong recent gains in the last 24 hours.")
+        elif change_24h < -5:
+            rationale_parts.append("The asset had a recent dip, which could present a buying opportunity.")
+        else:
+            rationale_parts.append("The asset had modest price movement recently, suggesting relative stability.")
+    if score > 2:
+        rationale_parts.append("Its overall analysis score suggests a favorable investment outlook.")
+    return " ".join(rationale_parts)
+
+def reference_risk_level(coin_name, risk_tolerance):
+    """The original coin risk rules, kept to check the lookup tables."""
+    if coin_name in ["Bitcoin", "Ethereum"]:
+        base_risk = 1
+    elif coin_name in ["Dogecoin", "Shiba Inu", "Pepe"]:
+        base_risk = 4
+    else:
+        base_risk = 2
+    risk_map = {"Very Low": -1, "Low": 0, "Medium": 1, "High": 2, "Very High": 3}
+    label_map = {1: "Very Low", 2: "Low", 3: "Medium", 4: "High", 5: "Very High"}
+    return label_map[max(1, min(5, base_risk + risk_map.get(risk_tolerance, 1)))]
+
+def reference_potential_return(risk_level, investment_horizon):
+    return POTENTIAL_RETURNS.get(risk_level, {}).get(investment_horizon, "10-30%")
+
+def reference_holding_period(coin_name, investment_horizon, risk_tolerance):
+    """The original if/elif holding period rules, kept to check the lookup tables."""
+    if investment_horizon == "Short-term (0-3 months)":
+        return "1-3 months" if risk_tolerance in ["Low", "Medium"] else "2-6 weeks"
+    elif investment_horizon == "Medium-term (3-12 months)":
+        if risk_tolerance in ["Very Low", "Low"]:
+            return "6-9 months"
+        elif risk_tolerance == "Medium":
+            return "4-6 months"
+        else:
+            return "3-5 months"
+    elif investment_horizon == "Long-term (1+ years)":
+        if coin_name in ["Bitcoin", "Ethereum"]:
+            return "2+ years"
+        else:
+            return "1-2 years" if risk_tolerance in ["Medium", "High"] else "2-3 years"
+    return "6 months (default)"
+
+def reference_recommend(analyzer, data, investment_amount, risk_tolerance, investment_horizon, sentiment_data=None):
+    """The original DataFrame pipeline of recommend_investments, kept to check the score grid."""
+    grouped_data = analyzer._group_market_data(data)
+    scored_coins = reference_score_coins(grouped_data, risk_tolerance, investment_horizon)
+    if sentiment_data is not None and not sentiment_data.empty:
+        sentiment = analyzer._coin_sentiment(scored_coins, sentiment_data)
+        if sentiment is not None:
+            scored_coins['score'] *= 0.75 + 0.5 * sentiment.fillna(0.5)
+
+    top_coins = scored_coins.nlargest(10, 'score').copy()
+    total_score = top_coins['score'].sum()
+    recommendations = []
+    if not top_coins.empty and total_score != 0:
+        top_coins['allocation_percentage'] = (top_coins['score'] / total_score * 100).round(2)
+        top_coins['allocation_amount'] = (top_coins['allocation_percentage'] / 100 * investment_amount).round(2)
+        for _, row in top_coins.head(3).iterrows():
+            risk_level = reference_risk_level(row['name'], risk_tolerance)
+            recommendations.append({
+                "coin": f"{row['name']} ({row['symbol']})",
+                "allocation_percentage": row['allocation_percentage'],
+                "allocation_amount": row['allocation_amount'],
+                "rationale": reference_rationale(row['name'], row['score'], row['market_cap'], row['change_24h']),
+                "holding_period": reference_holding_period(row['name'], investment_horizon, risk_tolerance),
+                "risk_level": risk_level,
+                "potential_return": reference_potential_return(risk_level, investment_horizon)
+            })
+    return analyzer._recommendation_result(
+        recommendations, analyzer._generate_market_outlook(grouped_data), risk_tolerance
+    )
+
+def score_frame(analyzer, data, risk_tolerance, investment_horizon):
+    """One profile's scores from the analyzer's grid building blocks, laid out like reference_score_coins."""
+    components = analyzer._score_components(data)
+    score = analyzer._profile_scores(data, components, [risk_tolerance], [investment_horizon])[0]
+    return data.assign(score=score, **components)
+
+def random_market(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        "name": ["Bitcoin", "Ethereum"] + [f"Coin {i}" for i in range(rows - 2)],
+        "symbol": [f"C{i}" for i in range(rows)],
+        "price": rng.lognormal(0, 3, rows),
+        "market_cap": rng.lognormal(18, 3, rows),
+        "volume_24h": rng.lognormal(15, 3, rows),
+        "change_24h": rng.normal(0, 8, rows),
+    })
+    for column in ("market_cap", "volume_24h", "change_24h"):
+        data.loc[rng.random(rows) < 0.05, column] = np.nan
+    data.loc[3, "market_cap"] = 0.0
+    return data
 
 class TestMarketAnalysis(unittest.TestCase):
     def setUp(self):
@@ -27,5 +160,103 @@ class TestMarketAnalysis(unittest.TestCase):
         self.assertEqual(result["status"], "success")
         self.assertLessEqual(len(result["recommendations"]), 3)
 
+    def test_vectorized_scores_match_row_wise_scoring(self):
+        data = random_market(500)
+        for risk in ("Very Low", "Low", "Medium", "High", "Very High", "Unknown"):
+            for horizon in ("Short-term (0-3 months)", "Medium-term (3-12 months)", "Long-term (1+ years)"):
+                with self.subTest(risk=risk, horizon=horizon):
+                    pd.testing.assert_frame_equal(score_frame(self.analyzer, data, risk, horizon),
+                                                  reference_score_coins(data, risk, horizon), check_exact=True)
+
+    def test_coin_bias_is_configurable(self):
+        analyzer = MarketAnalyzer(coin_bias={"Ethereum": ({"High": 2.0}, 1.0)})
+        plain = score_frame(MarketAnalyzer(coin_bias={}), self.mock_data, "High", "Long-term (1+ years)")
+        biased = score_frame(analyzer, self.mock_data, "High", "Long-term (1+ years)")
+        self.assertEqual(biased["score"].tolist(), [plain["score"][0], plain["score"][1] * 2.0])
+
+    def test_batch_matches_single_profile_results(self):
+        data = random_market(300, seed=5)
+        # Two sources per coin and a few exact score ties
+        data = pd.concat([data, data.assign(price=data["price"] * 1.01)], ignore_index=True)
+        data.loc[data["name"].isin(["Coin 10", "Coin 11"]), ["market_cap", "volume_24h", "change_24h"]] = [5e9, 1e8, 1.0]
+        sentiment = pd.DataFrame({"symbol": ["C0", "C1", "C5"], "sentiment": [0.9, 0.2, 0.7]})
+        profiles = [
+            {"investment_amount": amount, "risk_tolerance": risk, "investment_horizon": horizon}
+            for amount in (500, 12345.67)
+            for risk in ("Very Low", "Low", "Medium", "High", "Very High")
+            for horizon in ("Short-term (0-3 months)", "Medium-term (3-12 months)", "Long-term (1+ years)")
+        ]
+
+        for sentiment_data in (None, sentiment):
+            batch = self.analyzer.recommend_investments_batch(data, profiles, sentiment_data)
+            self.assertEqual(len(batch), len(profiles))
+            for profile, result in zip(profiles, batch):
+                self.assertEqual(result, self.analyzer.recommend_investments(data, sentiment_data=sentiment_data, **profile))
+                self.assertEqual(result, reference_recommend(self.analyzer, data, sentiment_data=sentiment_data, **profile))
+                self.assertEqual(result["status"], "success")
+
+    def test_batch_errors(self):
+        profile = {"investment_amount": 100, "risk_tolerance": "Low", "investment_horizon": "Long-term (1+ years)"}
+        self.assertEqual(self.analyzer.recommend_investments_batch(self.mock_data, []), [])
+        self.assertEqual(self.analyzer.recommend_investments_batch(pd.DataFrame(), [profile] * 2)[1]["status"], "error")
+        broken = self.analyzer.recommend_investments_batch(self.mock_data, [profile, {"risk_tolerance": "Low"}])
+        self.assertEqual([result["status"] for result in broken], ["error", "error"])
+
+    def test_score_grid_is_computed_once_per_snapshot(self):
+        data = random_market(200, seed=9)
+        analyzer = MarketAnalyzer(cache_size=2)
+        profiles = [("Very Low", "Long-term (1+ years)"), ("High", "Short-term (0-3 months)"), ("Custom", "Someday")]
+        with mock.patch.object(analyzer, "_build_score_grid", wraps=analyzer._build_score_grid) as build:
+            for risk, horizon in profiles * 2:
+                result = analyzer.recommend_investments(data.copy(), 1000, risk, horizon)
+                self.assertEqual(result, reference_recommend(analyzer, data, 1000, risk, horizon))
+            self.assertEqual(build.call_count, 1)
+            self.assertEqual((analyzer.cache_hits, analyzer.cache_misses), (5, 1))
+
+            # Changed data is a new snapshot; the least recently used one is dropped
+            changed = data.assign(price=data["price"] * 1.01)
+            analyzer.recommend_investments(changed, 1000, "Low", "Long-term (1+ years)")
+            analyzer.recommend_investments(changed, 1000, "Low", "Long-term (1+ years)", sentiment_data=data)
+            self.assertEqual(build.call_count, 3)
+            analyzer.recommend_investments(data, 1000, "Low", "Long-term (1+ years)")
+            self.assertEqual(build.call_count, 4)
+            self.assertEqual(len(analyzer._score_cache), 2)
+
+        uncached = MarketAnalyzer(cache_size=0)
+        self.assertEqual(
+            uncached.recommend_investments(data, 50, "Medium", "Medium-term (3-12 months)"),
+            analyzer.recommend_investments(data, 50, "Medium", "Medium-term (3-12 months)")
+        )
+        self.assertEqual(len(uncached._score_cache), 0)
+
+    def test_assembled_entries_match_original_rules(self):
+        names = ["Bitcoin", "Dogecoin", "Coin 7", "Ethereum", None]
+        market_caps = [2e11, None, 0.0, np.nan, 5e10]
+        changes = [6.0, -7.0, None, np.nan, 0.0]
+        scores = [2.5, 1.0, np.nan, 2.0, 3.0]
+        for risk in ("Very Low", "Low", "Medium", "High", "Very High", "Custom"):
+            for horizon in ("Short-term (0-3 months)", "Medium-term (3-12 months)", "Long-term (1+ years)", "Someday"):
+                entries = self.analyzer._assemble_recommendations(
+                    names, ["S"] * 5, market_caps, changes, scores, risk, horizon
+                )
+                for entry, name, market_cap, change, score in zip(entries, names, market_caps, changes, scores):
+                    risk_level = reference_risk_level(name, risk)
+                    self.assertEqual(entry, {
+                        "coin": f"{name} (S)",
+                        "rationale": reference_rationale(name, score, market_cap, change),
+                        "holding_period": reference_holding_period(name, horizon, risk),
+                        "risk_level": risk_level,
+                        "potential_return": reference_potential_return(risk_level, horizon)
+                    })
+
+        rationales = self.analyzer._generate_rationales(["Bitcoin", "X"], [2.5, 1.0], [2e11, None], [6.0, 0])
+        self.assertEqual(rationales, [
+            "Bitcoin was selected due to its strong performance indicators. "
+            "It has a very large market capitalization, indicating stability and broad adoption. "
+            "The asset showed strong recent gains in the last 24 hours. "
+            "Its overall analysis score suggests a favorable investment outlook.",
+            "X was selected due to its strong performance indicators."
+        ])
+
 if __name__ == "__main__":
     unittest.main()
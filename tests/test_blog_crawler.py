@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from src.scrapers.blog_crawler import BlogCrawler
+from src.scrapers.http_client import HttpClient
+from src.scrapers.rate_limiter import PROVIDER_LIMITS, RateLimiter
+from src.storage.article_store import ArticleStore, content_hash
+from tests.stand_in_server import StandInServer, BLOG_POSTS
+
+class TestBlogCrawler(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.client = HttpClient(cache=None, rate_limiter=None)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ArticleStore(os.path.join(self.tmp.name, "articles.sqlite"))
+        sources = {
+            "Stand-in Blog": {
+                "index_urls": [self.server.url + "/blog/"],
+                "article_pattern": r"^/blog/[\w-]+/[\w-]+$",
+                "title_selector": "h1",
+                "body_selector": "article .entry-content, article",
+                "date_selector": "time",
+            }
+        }
+        throttle = RateLimiter(state_path=os.path.join(self.tmp.name, "politeness.sqlite"), limits={})
+        self.crawler = BlogCrawler(self.store, self.client, sources, politeness=(100, 1000.0),
+                                   recheck_after=0, throttle=throttle)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def test_first_crawl_stores_articles(self):
+        stats = self.crawler.crawl()
+        self.assertEqual(stats["discovered"], len(BLOG_POSTS))
+        self.assertEqual(stats["new"], len(BLOG_POSTS))
+        self.assertEqual(stats["failed"], 0)
+
+        article = self.store.get(self.server.url + "/blog/news/bnb-burn-completed")
+        self.assertEqual(article["title"], "Quarterly BNB burn completed")
+        self.assertEqual(article["published"], "2024-05-04")
+        self.assertTrue(article["text"].startswith("The quarterly BNB burn"))
+        self.assertNotIn("investment advice", article["text"])
+        self.assertEqual(article["content_hash"], content_hash(article["text"]))
+        self.assertEqual(len(self.store.pending_embeddings()), len(BLOG_POSTS))
+
+    def test_recrawl_only_reprocesses_changed_articles(self):
+        self.crawler.crawl()
+        self.store.mark_embedded(self.store.articles())
+
+        stats = self.crawler.crawl()
+        self.assertEqual(stats["not_modified"], len(BLOG_POSTS))
+        self.assertEqual(self.server.stats[304], len(BLOG_POSTS))
+
+        # New page bytes with the same article text: nothing to re-embed
+        self.server.page_nonce += 1
+        stats = self.crawler.crawl()
+        self.assertEqual(stats["unchanged"], len(BLOG_POSTS))
+        self.assertEqual(self.store.pending_embeddings(), [])
+
+        path = "/blog/news/solana-outage-report"
+        self.server.blog_posts[path]["text"] += " Update: the network is stable again."
+        stats = self.crawler.crawl()
+        self.assertEqual(stats["updated"], 1)
+        self.assertEqual(stats["not_modified"], len(BLOG_POSTS) - 1)
+        self.assertEqual([a["url"] for a in self.store.pending_embeddings()], [self.server.url + path])
+
+    def test_recently_checked_articles_are_skipped(self):
+        self.crawler.crawl()
+        self.crawler.recheck_after = 3600
+        before = self.server.stats["requests"]
+        stats = self.crawler.crawl()
+        self.assertEqual(stats["skipped"], len(BLOG_POSTS))
+        # Only the index page is requested
+        self.assertEqual(self.server.stats["requests"] - before, 1)
+
+    def test_domain_budgets_stay_on_the_throttle(self):
+        throttle = RateLimiter(state_path=os.path.join(self.tmp.name, "shared.sqlite"))
+        crawler = BlogCrawler(self.store, self.client, self.crawler.sources, politeness=(100, 1000.0), throttle=throttle)
+        crawler.crawl()
+        domain = self.server.url.split("//")[1]
+        self.assertEqual(throttle.limits[domain], {"free": (100, 1000.0)})
+        # The module defaults other limiters start from are untouched
+        self.assertNotIn(domain, PROVIDER_LIMITS)
+        self.assertNotIn(domain, RateLimiter().limits)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+from src.scrapers.coingecko import CoinGeckoScraper
+from src.scrapers.coinmarketcap import CoinMarketCapScraper
+from src.scrapers.columnar import MARKET_SCHEMA, concat_market_tables, rows_to_table
+from tests.test_html_parsing import WebOnlyClient, load_fixture
+from tests.test_scrapers import FakeMarketsClient
+
+class TestColumnarOutput(unittest.TestCase):
+    def test_table_matches_list_output(self):
+        scraper = CoinGeckoScraper(client=FakeMarketsClient(600))
+        rows, failures = scraper.scrape_top_coins_paged(limit=600)
+        self.assertEqual(failures, {})
+        table = scraper.scrape_top_coins_table(limit=600)
+
+        self.assertEqual(table.schema, MARKET_SCHEMA)
+        self.assertEqual(table.num_rows, 600)
+        expected = rows_to_table(rows, fetched_at=0).drop_columns(["fetched_at"])
+        self.assertTrue(table.drop_columns(["fetched_at"]).equals(expected))
+        self.assertIsNone(table.schema.metadata)
+
+    def test_sources_concatenate_without_copying(self):
+        gecko = CoinGeckoScraper(client=FakeMarketsClient(50)).scrape_top_coins_table(limit=50)
+        cmc = CoinMarketCapScraper(client=WebOnlyClient(load_fixture("coinmarketcap_home.html"))).scrape_top_coins_table(limit=20)
+        self.assertEqual(cmc.column("market_cap")[0].as_py(), 1.27e12)
+
+        combined = concat_market_tables([gecko, None, cmc])
+        self.assertEqual(combined.num_rows, 70)
+        self.assertEqual(combined.column("source").to_pylist()[49:51], ["CoinGecko", "CoinMarketCap"])
+        self.assertEqual(combined.column("price").chunk(0).buffers()[1].address,
+                         gecko.column("price").chunk(0).buffers()[1].address)
+
+    def test_missing_values_become_null(self):
+        table = rows_to_table([
+            {"name": "Bitcoin", "symbol": "BTC", "price": 1.0, "market_cap": np.nan, "source": "Test"},
+        ])
+        self.assertIsNone(table.column("market_cap")[0].as_py())
+        self.assertIsNone(table.column("volume_24h")[0].as_py())
+        self.assertEqual(concat_market_tables([]).schema, MARKET_SCHEMA)
+
+if __name__ == "__main__":
+    unittest.main()
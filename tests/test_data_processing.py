@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.utils.data_processing import (
+    dataframe_to_records, parse_abbreviated_column, parse_market_rows, parse_percentage_column,
+    parse_price_column, read_session_snapshot, write_session_snapshot
+)
+
+class TestVectorizedParsing(unittest.TestCase):
+    def test_abbreviated_amounts(self):
+        parsed = parse_abbreviated_column(["$1.27T", "$438.56B", "$900M", "$12.5K", "$1,234", "", None, "n/a"])
+        self.assertEqual(parsed.dtype, np.float64)
+        np.testing.assert_allclose(parsed[:5], [1.27e12, 438.56e9, 900e6, 12.5e3, 1234.0])
+        self.assertTrue(np.isnan(parsed[5:]).all())
+
+    def test_prices_and_percentages(self):
+        np.testing.assert_allclose(parse_price_column(["$61,245.32", "$0.00002431"]), [61245.32, 2.431e-05])
+        self.assertTrue(np.isnan(parse_price_column(["$1.2B"])[0]))
+        np.testing.assert_allclose(parse_percentage_column(["-1.2%", "−3.4%", "5%"]), [-1.2, -3.4, 5.0])
+
+    def test_market_rows_skip_incomplete_and_use_none(self):
+        rows = [
+            {"name": "Bitcoin", "symbol": "btc", "price": "$67,123.45", "change_24h": "2.3%",
+             "market_cap": "$1.32T", "volume_24h": None},
+            {"name": "Broken", "symbol": None, "price": "$1.00", "change_24h": None,
+             "market_cap": None, "volume_24h": None},
+        ]
+        coins = parse_market_rows(rows, source="CoinGecko", uppercase_symbols=True)
+        self.assertEqual(coins, [{
+            "name": "Bitcoin", "symbol": "BTC", "price": 67123.45, "change_24h": 2.3,
+            "market_cap": 1.32e12, "volume_24h": None, "source": "CoinGecko"
+        }])
+
+class TestVectorStoreHandoff(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame([
+            {"name": "Bitcoin", "symbol": "BTC", "price": 61245.32, "market_cap": 1.2e12, "source": "CoinGecko",
+             "sentiment": np.nan},
+            {"name": "Ethereum", "symbol": "ETH", "price": np.nan, "market_cap": np.nan, "source": "Kraken Blog",
+             "sentiment": 0.65},
+        ])
+
+    def test_one_record_per_row(self):
+        records = dataframe_to_records(self.data)
+        self.assertEqual(records[0]["text"], "Bitcoin (BTC): price: 61245.32; market_cap: 1200000000000.0; source: CoinGecko")
+        self.assertEqual(records[1]["metadata"], {"name": "Ethereum", "symbol": "ETH", "source": "Kraken Blog",
+                                                  "sentiment": 0.65})
+        self.assertEqual(dataframe_to_records(pd.DataFrame()), [])
+
+    def test_session_snapshots_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = write_session_snapshot(self.data, tmp, "session-a")
+            second = write_session_snapshot(self.data.head(1), tmp, "session-b")
+            self.assertNotEqual(first, second)
+            self.assertEqual(sorted(os.listdir(tmp)), ["session-a.arrow", "session-b.arrow"])
+            pd.testing.assert_frame_equal(read_session_snapshot(first), self.data)
+
+if __name__ == "__main__":
+    unittest.main()
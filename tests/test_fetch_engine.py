@@ -0,0 +1,54 @@
+import time
+import unittest
+from src.scrapers.fetch_engine import fetch_all, fetch_sources
+
+def slow_source(delay, value):
+    def fetch():
+        time.sleep(delay)
+        return value
+    return fetch
+
+def failing_source():
+    raise ValueError("boom")
+
+class TestFetchEngine(unittest.TestCase):
+    def test_sources_run_concurrently(self):
+        fetchers = {f"source_{i}": slow_source(0.3, [i]) for i in range(4)}
+        start = time.monotonic()
+        results, errors = fetch_all(fetchers, timeout=5)
+        elapsed = time.monotonic() - start
+        self.assertEqual(len(results), 4)
+        self.assertEqual(errors, {})
+        self.assertLess(elapsed, 1.0)
+
+    def test_partial_results_on_timeout_and_error(self):
+        fetchers = {
+            "fast": slow_source(0.0, ["ok"]),
+            "slow": slow_source(2.0, ["late"]),
+            "broken": failing_source
+        }
+        start = time.monotonic()
+        events = list(fetch_sources(fetchers, timeout=5, timeouts={"slow": 0.2}))
+        self.assertLess(time.monotonic() - start, 1.5)
+        by_source = {source: (data, error) for source, data, error in events}
+        self.assertEqual(by_source["fast"], (["ok"], None))
+        self.assertIsInstance(by_source["slow"][1], TimeoutError)
+        self.assertIsInstance(by_source["broken"][1], ValueError)
+
+    def test_queued_sources_get_their_full_timeout(self):
+        # One worker: each source waits for the previous ones before it starts
+        fetchers = {f"source_{i}": slow_source(0.2, [i]) for i in range(3)}
+        results, errors = fetch_all(fetchers, timeout=0.5, max_workers=1)
+        self.assertEqual(errors, {})
+        self.assertEqual(len(results), 3)
+
+        # The deadline still applies once a queued source is running
+        fetchers = {"first": slow_source(0.2, ["ok"]), "stuck": slow_source(2.0, ["late"])}
+        start = time.monotonic()
+        results, errors = fetch_all(fetchers, timeout=0.5, max_workers=1)
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertEqual(results, {"first": ["ok"]})
+        self.assertIsInstance(errors["stuck"], TimeoutError)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from src.scrapers.cryptocompare import CryptoCompareScraper
+from src.scrapers.http_client import HttpClient
+from src.storage.history_ingester import HistoryIngester
+from src.storage.ohlcv_store import OHLCVStore
+from tests.stand_in_server import StandInServer
+
+class TestHistoryIngester(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.client = HttpClient(cache=None, rate_limiter=None)
+        scraper = CryptoCompareScraper(client=self.client)
+        self.server.point_scrapers(scraper)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = OHLCVStore(os.path.join(self.tmp.name, "ohlcv.sqlite"))
+        self.ingester = HistoryIngester(scraper, self.store, backfill={"day": 4500, "hour": 72})
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def test_backfill_then_incremental_sync(self):
+        symbols = ["BTC", "ETH", "SOL"]
+        written, failures = self.ingester.sync(symbols)
+        self.assertEqual(failures, {})
+        self.assertEqual(set(written), {(s, i) for s in symbols for i in ("day", "hour")})
+        self.assertEqual(written[("BTC", "hour")], 73)
+
+        # 4500 days reaches before every symbol's listing date: paging stops
+        # there and the zero-filled placeholders are not stored
+        daily = self.store.load("ETH", "day")
+        self.assertGreater(len(daily), 2000)
+        self.assertLess(len(daily), 4501)
+        self.assertTrue((daily["close"] > 0).all())
+        self.assertTrue(daily["time"].diff().dropna().eq(86400).all())
+
+        before = self.server.stats["requests"]
+        written, failures = self.ingester.sync(symbols)
+        # One request per symbol and interval, re-fetching only the open candle
+        self.assertEqual(self.server.stats["requests"] - before, 6)
+        self.assertTrue(all(count in (1, 2) for count in written.values()))
+        self.assertEqual(len(self.store.load("ETH", "day")), len(daily) + written[("ETH", "day")] - 1)
+
+    def test_failures_are_reported_per_symbol(self):
+        self.ingester.scraper.base_url = self.server.url + "/missing"
+        written, failures = self.ingester.sync(["BTC"], intervals=["day"])
+        self.assertEqual(written, {})
+        self.assertIn(("BTC", "day"), failures)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import unittest
+from src.scrapers import coingecko, coinmarketcap
+from src.scrapers.coingecko import CoinGeckoScraper
+from src.scrapers.coinmarketcap import CoinMarketCapScraper
+from src.scrapers.html_parsing import available_backends, extract_table_rows
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+class HtmlResponse:
+    def __init__(self, text):
+        self.text = text
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+class WebOnlyClient:
+    """Fails every API call and serves a saved page for everything else."""
+    def __init__(self, html):
+        self.html = html
+
+    def get(self, url, headers=None, params=None, provider=None, **kwargs):
+        if provider is not None:
+            raise ConnectionError("API unavailable")
+        return HtmlResponse(self.html)
+
+class TestHtmlParsing(unittest.TestCase):
+    def test_backends_produce_identical_rows(self):
+        for filename, columns, table_class in [
+            ("coingecko_coins.html", coingecko.WEB_TABLE_COLUMNS, "sort"),
+            ("coinmarketcap_home.html", coinmarketcap.WEB_TABLE_COLUMNS, None),
+        ]:
+            html = load_fixture(filename)
+            expected = extract_table_rows(html, columns, table_class=table_class, backend="html.parser")
+            self.assertEqual(len(expected), 100)
+            for backend in available_backends():
+                with self.subTest(filename=filename, backend=backend):
+                    rows = extract_table_rows(html, columns, table_class=table_class, backend=backend)
+                    self.assertEqual(rows, expected)
+
+    def test_coingecko_web_fallback(self):
+        scraper = CoinGeckoScraper(client=WebOnlyClient(load_fixture("coingecko_coins.html")))
+        data = scraper.scrape_top_coins(limit=10)
+        self.assertEqual(len(data), 10)
+        self.assertEqual(data[0]["name"], "Bitcoin")
+        self.assertEqual(data[0]["symbol"], "BTC")
+        self.assertEqual(data[0]["price"], 67123.45)
+
+    def test_coinmarketcap_web_fallback(self):
+        scraper = CoinMarketCapScraper(client=WebOnlyClient(load_fixture("coinmarketcap_home.html")))
+        data = scraper.scrape_top_coins(limit=5)
+        self.assertEqual([coin["symbol"] for coin in data], ["BTC", "ETH", "USDT", "BNB", "SOL"])
+        self.assertEqual(data[0]["market_cap"], 1.27e12)
+        self.assertEqual(data[1]["market_cap"], 438.56e9)
+
+if __name__ == "__main__":
+    unittest.main()
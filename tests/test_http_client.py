@@ -0,0 +1,23 @@
+import unittest
+from src.scrapers.http_client import HttpClient, get_http_client
+from src.scrapers.coinmarketcap import CoinMarketCapScraper
+from src.scrapers.coingecko import CoinGeckoScraper
+from src.scrapers.cryptocompare import CryptoCompareScraper
+
+class TestHttpClient(unittest.TestCase):
+    def test_scrapers_share_pooled_client(self):
+        shared = get_http_client()
+        self.assertIs(CoinMarketCapScraper().client, shared)
+        self.assertIs(CoinGeckoScraper().client, shared)
+        self.assertIs(CryptoCompareScraper().client, shared)
+
+    def test_per_host_pool_sizes(self):
+        client = HttpClient(pool_sizes={"api.coingecko.com": 25}, default_pool_size=3)
+        adapter = client.session.get_adapter("https://api.coingecko.com/api/v3/coins/markets")
+        self.assertEqual(adapter._pool_maxsize, 25)
+        fallback = client.session.get_adapter("https://example.com/")
+        self.assertEqual(fallback._pool_maxsize, 3)
+        self.assertEqual(adapter.max_retries.total, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import math
+import unittest
+from src.scrapers.coinmarketcap import CoinMarketCapScraper
+from src.scrapers.json_stream import iter_json_array
+
+def make_listings(count):
+    return {
+        "status": {"error_code": 0, "notice": "listings [\"data\"]"},
+        "data": [
+            {
+                "id": i,
+                "name": f"Coin é{i}",
+                "symbol": f"C{i}",
+                "tags": ["a", "b"],
+                "quote": {"USD": {
+                    "price": 1.5 + i,
+                    "market_cap": 1e9 / (i + 1),
+                    "volume_24h": None if i % 7 == 0 else 2.25e6,
+                    "percent_change_24h": -0.125 * i,
+                }},
+            }
+            for i in range(count)
+        ],
+    }
+
+def chunked(payload, size):
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+class StreamResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        return iter(chunked(self.payload, chunk_size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+class StreamingClient:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        self.calls.append(kwargs)
+        return StreamResponse(self.payload)
+
+class TestJsonStream(unittest.TestCase):
+    def test_matches_json_loads_at_any_chunk_size(self):
+        document = make_listings(25)
+        payload = json.dumps(document, ensure_ascii=False).encode("utf-8")
+        for size in (1, 2, 3, 7, 64, len(payload)):
+            with self.subTest(size=size):
+                items = list(iter_json_array(chunked(payload, size), "data"))
+                self.assertEqual(items, document["data"])
+
+    def test_empty_and_missing_arrays(self):
+        self.assertEqual(list(iter_json_array([b'{"data": [ ]}'])), [])
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"status": {"data": [1]}}']))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"data": [1, 2']))
+
+    def test_coinmarketcap_streamed_listings(self):
+        document = make_listings(40)
+        client = StreamingClient(json.dumps(document).encode("utf-8"))
+        scraper = CoinMarketCapScraper(api_key="test", client=client)
+
+        rows = scraper._get_data_from_api(limit=40, stream=True)
+        self.assertTrue(client.calls[-1]["stream"])
+        self.assertEqual(len(rows), 40)
+        self.assertEqual(rows[3], {
+            "name": "Coin é3", "symbol": "C3", "price": 4.5, "market_cap": 2.5e8,
+            "volume_24h": 2.25e6, "change_24h": -0.375, "source": "CoinMarketCap",
+        })
+
+        columns = scraper.get_listing_columns(limit=10, stream=True)
+        self.assertEqual(list(columns["symbol"]), [f"C{i}" for i in range(10)])
+        self.assertEqual(columns["price"].dtype.kind, "f")
+        self.assertEqual(columns["change_24h"][4], -0.5)
+        self.assertTrue(math.isnan(columns["volume_24h"][0]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import time
+import unittest
+import pandas as pd
+from src.analysis.market_analyzer import MarketAnalyzer
+from src.scrapers.http_client import HttpClient
+from src.scrapers.live_quotes import LiveQuoteFeed, QuoteBook, iter_sse_events
+from tests.stand_in_server import StandInServer
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+class TestQuoteBook(unittest.TestCase):
+    def test_deltas_hold_only_changes(self):
+        book = QuoteBook()
+        received = []
+        book.subscribe(received.extend)
+
+        book.apply([{"symbol": "btc", "price": 100.0, "change_24h": 1.0}, {"symbol": "ETH", "price": 10.0}])
+        deltas = book.apply([{"symbol": "BTC", "price": 100.0, "change_24h": 2.0}, {"symbol": "ETH", "price": 10.0}])
+        self.assertEqual(len(deltas), 1)
+        self.assertEqual({k: deltas[0][k] for k in ("symbol", "change_24h", "version")},
+                         {"symbol": "BTC", "change_24h": 2.0, "version": 3})
+        self.assertNotIn("price", deltas[0])
+        self.assertEqual(len(received), 3)
+
+        version, changed = book.changes_since(2)
+        self.assertEqual((version, list(changed)), (3, ["BTC"]))
+        self.assertEqual(changed["BTC"]["price"], 100.0)
+        self.assertEqual(len(book.snapshot()), 2)
+
+    def test_sse_parsing(self):
+        lines = ["retry: 100", ": keep-alive", "", "id: 7", "event: quotes", "data: [1,", "data: 2]", "", "data: x"]
+        events = list(iter_sse_events(lines))
+        self.assertEqual(events, [{"retry": "100"}, {"id": "7", "event": "quotes", "data": "[1,\n2]"}])
+
+        # Blocks without data still move the event id and reconnect delay on
+        lines = ["id: 8", "", "event: quotes", "", "retry: 2500", "id: 9", ""]
+        self.assertEqual(list(iter_sse_events(lines)), [{"id": "8"}, {"retry": "2500", "id": "9"}])
+
+    def test_live_quotes_overlay_market_rows(self):
+        data = pd.DataFrame([
+            {"name": "Bitcoin", "symbol": "BTC", "price": 60000.0, "change_24h": 1.0, "source": "CoinGecko"},
+            {"name": "Bitcoin", "symbol": "BTC", "price": None, "sentiment": 0.8, "source": "Binance Blog"},
+            {"name": "Ethereum", "symbol": "ETH", "price": 3000.0, "change_24h": 2.0, "source": "CoinGecko"},
+        ])
+        updated = MarketAnalyzer().apply_live_quotes(data, {"BTC": {"symbol": "BTC", "price": 61000.0}})
+        self.assertEqual(updated["price"].tolist()[0], 61000.0)
+        self.assertTrue(pd.isna(updated["price"].tolist()[1]))
+        self.assertEqual(updated["price"].tolist()[2], 3000.0)
+        self.assertEqual(data["price"].tolist()[0], 60000.0)
+
+class TestLiveQuoteFeed(unittest.TestCase):
+    def test_feed_reconnects_and_resumes(self):
+        with StandInServer() as server:
+            client = HttpClient(cache=None, rate_limiter=None)
+            feed = LiveQuoteFeed(f"{server.url}/stream/quotes", client=client, reconnect_delay=0.01,
+                                 params={"symbols": "BTC,ETH,SOL,ADA", "interval": "0.01", "events": "5"})
+            feed.start()
+            try:
+                # Each connection ends after 5 events; the feed must reconnect
+                # and pick up the event numbering where it left off
+                self.assertTrue(wait_for(lambda: feed.events >= 12))
+                self.assertGreaterEqual(int(feed.last_event_id), 12)
+                self.assertGreaterEqual(server.stats["/stream/quotes"], 3)
+                self.assertIsNotNone(feed.book.get("BTC") or feed.book.get("ETH"))
+            finally:
+                feed.stop()
+                client.close()
+            self.assertFalse(feed.running)
+
+if __name__ == "__main__":
+    unittest.main()
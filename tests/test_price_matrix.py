@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from src.analysis.price_analytics import (correlation_matrix, log_returns, max_drawdown, realized_volatility,
+                                          rolling_volatility)
+from src.storage.ohlcv_store import OHLCVStore
+from src.storage.price_matrix import PriceMatrix
+
+DAY = 86400
+T0 = 1_700_006_400
+
+def candles(start_day, closes):
+    return [{"time": T0 + (start_day + i) * DAY, "open": c, "high": c, "low": c, "close": c,
+             "volume_from": 1.0, "volume_to": c * 10} for i, c in enumerate(closes)]
+
+class TestPriceMatrix(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = OHLCVStore(os.path.join(self.tmp.name, "ohlcv.sqlite"))
+        self.root = os.path.join(self.tmp.name, "matrix")
+        self.store.write_candles("BTC", "day", candles(0, [100.0, 110.0, 99.0, 120.0, 130.0]))
+        # ETH starts later and misses a day
+        self.store.write_candles("ETH", "day", candles(2, [10.0, 11.0]) + candles(5, [12.0]))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_build_and_slice(self):
+        self.assertIsNone(PriceMatrix.open("day", self.root))
+        self.assertIsNone(PriceMatrix.build(self.store, "hour", self.root))
+
+        matrix = PriceMatrix.build(self.store, "day", self.root)
+        self.assertEqual(matrix.symbols, ["BTC", "ETH"])
+        self.assertEqual(matrix.shape, (2, 6))
+        self.assertEqual(matrix.times[-1], T0 + 5 * DAY)
+
+        close = matrix.field("close")
+        self.assertIsInstance(close, np.memmap)
+        self.assertEqual(close.dtype, np.float32)
+        np.testing.assert_array_equal(close[1], [np.nan, np.nan, 10.0, 11.0, np.nan, 12.0])
+        np.testing.assert_array_equal(matrix.field("volume_to")[0, :2], [1000.0, 1100.0])
+
+        # A time window over the whole universe is a view of the mapped file
+        window = matrix.window("close", start=T0 + DAY, end=T0 + 3 * DAY + 1)
+        self.assertEqual(window.shape, (2, 3))
+        self.assertTrue(np.shares_memory(window, close))
+        np.testing.assert_array_equal(matrix.window("close", ["eth"], start=T0 + 3 * DAY), [[11.0, np.nan, 12.0]])
+        self.assertEqual(matrix.window("close", start=T0 + 9 * DAY).shape, (2, 0))
+
+    def test_rebuild_replaces_matrix(self):
+        first = PriceMatrix.build(self.store, "day", self.root)
+        self.store.write_candles("SOL", "day", candles(6, [20.0]))
+        PriceMatrix.build(self.store, "day", self.root)
+
+        matrix = PriceMatrix.open("day", self.root)
+        self.assertEqual((matrix.symbols, matrix.shape), (["BTC", "ETH", "SOL"], (3, 7)))
+        self.assertEqual(sorted(os.listdir(self.root)), sorted(["day.current", os.path.basename(matrix.directory)]))
+        self.assertFalse(os.path.exists(first.directory))
+
+    def test_interrupted_publish_keeps_old_matrix(self):
+        PriceMatrix.build(self.store, "day", self.root)
+        self.store.write_candles("SOL", "day", candles(6, [20.0]))
+
+        with mock.patch("src.storage.price_matrix.os.replace", side_effect=OSError("interrupted")):
+            with self.assertRaises(OSError):
+                PriceMatrix.build(self.store, "day", self.root)
+
+        self.assertEqual(PriceMatrix.open("day", self.root).symbols, ["BTC", "ETH"])
+        matrix = PriceMatrix.build(self.store, "day", self.root)
+        self.assertEqual(matrix.symbols, ["BTC", "ETH", "SOL"])
+        # The unpublished directory of the interrupted build is cleaned up too
+        self.assertEqual(len([name for name in os.listdir(self.root) if name[4:].isdigit()]), 1)
+
+    def test_candles_written_during_build_are_skipped(self):
+        iter_chunks = self.store.iter_chunks
+
+        def ingest_while_reading(*args, **kwargs):
+            # A sync stores a new coin and a newer candle after the range was read
+            self.store.write_candles("SOL", "day", candles(3, [20.0]))
+            self.store.write_candles("BTC", "day", candles(9, [140.0]))
+            return iter_chunks(*args, **kwargs)
+
+        with mock.patch.object(self.store, "iter_chunks", side_effect=ingest_while_reading):
+            matrix = PriceMatrix.build(self.store, "day", self.root)
+        self.assertEqual((matrix.symbols, matrix.shape), (["BTC", "ETH"], (2, 6)))
+        self.assertEqual(PriceMatrix.build(self.store, "day", self.root).shape, (3, 10))
+
+class TestPriceAnalytics(unittest.TestCase):
+    def test_matches_pandas(self):
+        rng = np.random.default_rng(3)
+        prices = np.exp(np.cumsum(rng.normal(0, 0.03, (6, 200)), axis=1)).astype(np.float32)
+        prices[1, :40] = np.nan
+        prices[2, 90] = np.nan
+        prices[5] = np.nan
+        returns = pd.DataFrame(log_returns(prices).T)
+        frame = pd.DataFrame(prices.T.astype(np.float64))
+
+        np.testing.assert_allclose(realized_volatility(prices, chunk_rows=4), returns.std() * np.sqrt(365))
+        np.testing.assert_allclose(rolling_volatility(prices, 20, min_periods=10).T,
+                                   returns.rolling(20, min_periods=10).std() * np.sqrt(365), atol=1e-9)
+        np.testing.assert_allclose(max_drawdown(prices, chunk_rows=4), (frame / frame.cummax() - 1).min())
+        np.testing.assert_allclose(correlation_matrix(returns.to_numpy().T), returns.corr(), atol=1e-12)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+# tests/test_ranking.py
+# python -m unittest discover tests
+import unittest
+import numpy as np
+import pandas as pd
+from src.analysis.ranking import top_k_indices
+
+class TestTopK(unittest.TestCase):
+    def test_matches_pandas_selection(self):
+        rng = np.random.default_rng(11)
+        for size in (0, 1, 7, 500):
+            # Few distinct values, so ties straddle the cut-off
+            values = rng.integers(-5, 5, size).astype(float)
+            values[rng.random(size) < 0.1] = np.nan
+            if size > 3:
+                values[:2] = [np.inf, -np.inf]
+            # pandas only skips NaN while k is below the row count; top_k_indices always does
+            series = pd.Series(values).dropna()
+            for k in (0, 1, 3, 10, size + 5):
+                with self.subTest(size=size, k=k):
+                    if k < len(series):
+                        largest, smallest = series.nlargest(k), series.nsmallest(k)
+                    else:
+                        # nlargest falls back to an unstable full sort here
+                        largest = series.sort_values(ascending=False, kind="stable")
+                        smallest = series.sort_values(kind="stable")
+                    np.testing.assert_array_equal(top_k_indices(values, k), largest.index.to_numpy())
+                    np.testing.assert_array_equal(top_k_indices(values, k, largest=False), smallest.index.to_numpy())
+
+    def test_rejects_matrices(self):
+        with self.assertRaises(ValueError):
+            top_k_indices(np.zeros((2, 2)), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import time
+import unittest
+from src.scrapers.rate_limiter import RateLimiter, RateLimitTimeout
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmpdir.name, "limits.sqlite")
+        self.limits = {"demo": {"free": (2, 10.0), "pro": (100, 100.0)}}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_burst_then_refill(self):
+        limiter = RateLimiter(self.state_path, self.limits)
+        self.assertEqual(limiter.acquire("demo"), 0.0)
+        self.assertEqual(limiter.acquire("demo"), 0.0)
+        waited = limiter.acquire("demo")
+        self.assertGreater(waited, 0.0)
+        self.assertLess(waited, 0.5)
+
+    def test_state_shared_between_limiters(self):
+        first = RateLimiter(self.state_path, self.limits, max_wait=0.01)
+        second = RateLimiter(self.state_path, self.limits, max_wait=0.01)
+        first.acquire("demo")
+        first.acquire("demo")
+        with self.assertRaises(RateLimitTimeout):
+            second.acquire("demo")
+        # Plans have independent budgets
+        self.assertEqual(second.acquire("demo", "pro"), 0.0)
+
+    def test_retry_after_blocks_bucket(self):
+        limiter = RateLimiter(self.state_path, self.limits)
+        limiter.update_from_response("demo", "free", FakeResponse(429, {"Retry-After": "0.3"}))
+        start = time.monotonic()
+        limiter.acquire("demo")
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+    def test_unknown_provider_is_unlimited(self):
+        limiter = RateLimiter(self.state_path, self.limits)
+        for _ in range(10):
+            self.assertEqual(limiter.acquire("other"), 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# tests/test_reconciliation.py
+# python -m unittest discover tests
+import os
+import tempfile
+import threading
+import unittest
+import numpy as np
+import pandas as pd
+from src.analysis.market_analyzer import MarketAnalyzer
+from src.analysis.reconciliation import AssetIndex, reconcile_sources
+
+FEEDS = pd.DataFrame([
+    {"name": "Binance Coin", "symbol": "BNB", "price": 500.0, "change_24h": 1.0, "source": "CoinMarketCap"},
+    {"name": "BNB", "symbol": "bnb", "price": 510.0, "change_24h": 2.0, "source": "CoinGecko"},
+    {"name": "Polygon", "symbol": "MATIC", "price": 0.50, "change_24h": -1.0, "source": "CoinMarketCap"},
+    {"name": "Polygon Ecosystem Token", "symbol": "POL", "price": 0.60, "change_24h": np.nan, "source": "CoinGecko"},
+    {"name": "Matic Network", "symbol": None, "price": 0.70, "change_24h": 0.0, "source": "CryptoCompare"},
+    {"name": "Newcoin", "symbol": "NEW", "price": 1.0, "change_24h": 5.0, "source": "CoinGecko"},
+    {"name": None, "symbol": None, "price": 9.0, "change_24h": 9.0, "source": "CryptoCompare"},
+])
+
+class TestReconciliation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "assets", "assets.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_provider_names_and_symbols_merge(self):
+        merged = reconcile_sources(FEEDS, AssetIndex(self.path))
+        self.assertEqual(merged["name"].tolist(), ["Binance Coin", "Newcoin", "Polygon"])
+        self.assertEqual(merged["symbol"].tolist(), ["BNB", "NEW", "MATIC"])
+        np.testing.assert_allclose(merged["price"], [505.0, 1.0, 0.6])
+        # Missing values are skipped, not averaged as zero
+        np.testing.assert_allclose(merged["change_24h"], [1.5, 5.0, -0.5])
+
+    def test_index_persists_assets_and_aliases(self):
+        index = AssetIndex(self.path)
+        ids = index.resolve(FEEDS)
+        index.add_alias("BNB", "NEW", source="CoinGecko")
+        self.assertEqual(index.version, 1)
+
+        reopened = AssetIndex(self.path)
+        self.assertEqual(len(reopened), len(index))
+        again = reopened.resolve(FEEDS)
+        np.testing.assert_array_equal(again[:5], ids[:5])
+        self.assertEqual(again[5], ids[0])
+        self.assertEqual(again[6], -1)
+        # A pinned alias only applies to its source
+        other = pd.DataFrame({"name": ["Newcoin"], "symbol": ["NEW"], "source": ["CoinMarketCap"]})
+        self.assertEqual(reopened.resolve(other)[0], ids[5])
+
+    def test_instances_share_one_file(self):
+        first, second = AssetIndex(self.path), AssetIndex(self.path)
+        len(first), len(second)
+        new_a = pd.DataFrame({"name": ["Coin A"], "symbol": ["AAA"]})
+        new_b = pd.DataFrame({"name": ["Coin B"], "symbol": ["BBB"]})
+        a_id = first.resolve(new_a)[0]
+        # The second index's mirror predates AAA: its new asset must not reuse the id
+        b_id = second.resolve(new_b)[0]
+        self.assertNotEqual(a_id, b_id)
+        self.assertEqual(second.resolve(new_a)[0], a_id)
+        self.assertEqual(first.resolve(new_b)[0], b_id)
+        self.assertEqual(first.symbols(np.array([a_id, b_id])).tolist(), ["AAA", "BBB"])
+        self.assertEqual(len(AssetIndex(self.path)), len(first))
+
+    def test_concurrent_seeding(self):
+        indexes = [AssetIndex(self.path) for _ in range(4)]
+        threads = [threading.Thread(target=len, args=(index,)) for index in indexes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        btc = [index.resolve(FEEDS.iloc[:1])[0] for index in indexes]
+        self.assertEqual(len(set(btc)), 1)
+        self.assertEqual({len(index) for index in indexes}, {len(AssetIndex(path=None))})
+
+    def test_fresher_rows_weigh_more(self):
+        now = pd.Timestamp("2024-06-01 12:00", tz="UTC")
+        rows = pd.DataFrame({
+            "name": ["Bitcoin", "Bitcoin", "Bitcoin"],
+            "symbol": ["BTC", "BTC", "BTC"],
+            "price": [100.0, 130.0, 500.0],
+            "fetched_at": [now, now - pd.Timedelta(seconds=300), now - pd.Timedelta(hours=2)],
+        })
+        index = AssetIndex(path=None)
+        # Weights 1, 0.5 and ~0 (two hours at a five-minute half-life)
+        self.assertAlmostEqual(reconcile_sources(rows, index)["price"][0], 110.0, places=3)
+        self.assertAlmostEqual(reconcile_sources(rows, index, max_age=600)["price"][0], 110.0)
+
+    def test_analyzer_groups_by_asset(self):
+        analyzer = MarketAnalyzer()
+        grouped = analyzer._group_market_data(FEEDS)
+        self.assertEqual(len(grouped), 3)
+        sentiment = pd.DataFrame({"name": ["Polygon"], "symbol": ["POL"], "sentiment": [1.0]})
+        self.assertEqual(analyzer._coin_sentiment(grouped, sentiment).tolist()[2], 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from src.scrapers.http_client import HttpClient
+from src.scrapers.response_cache import ResponseCache
+
+class ETagHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        ETagHandler.requests_seen.append(self.path)
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = ('{"path": "%s"}' % self.path).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestResponseCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        ETagHandler.requests_seen.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_fresh_entries_skip_network(self):
+        cache = ResponseCache(self.path, ttls=[("/markets", 60)])
+        client = HttpClient(cache=cache)
+        for _ in range(3):
+            response = client.get(f"{self.base_url}/markets", params={"page": 1})
+            self.assertEqual(response.json(), {"path": "/markets?page=1"})
+        self.assertEqual(len(ETagHandler.requests_seen), 1)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_stale_entries_revalidate_with_etag(self):
+        cache = ResponseCache(self.path, ttls=[], default_ttl=0)
+        client = HttpClient(cache=cache)
+        client.get(f"{self.base_url}/coins/bitcoin")
+        response = client.get(f"{self.base_url}/coins/bitcoin")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"path": "/coins/bitcoin"})
+        self.assertEqual(len(ETagHandler.requests_seen), 2)
+        self.assertEqual(cache.stats()["revalidations"], 1)
+
+    def test_lru_eviction_bounds_size(self):
+        cache = ResponseCache(self.path, max_bytes=40)
+        client = HttpClient(cache=cache)
+        client.get(f"{self.base_url}/a")
+        client.get(f"{self.base_url}/b")
+        client.get(f"{self.base_url}/a")
+        client.get(f"{self.base_url}/c")
+        self.assertGreater(cache.stats()["evictions"], 0)
+        self.assertIsNotNone(cache.get(cache.make_key(f"{self.base_url}/c")))
+        self.assertIsNone(cache.get(cache.make_key(f"{self.base_url}/b")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,71 @@
 # tests/test_scrapers.py
 import unittest
 from src.scrapers.coinmarketcap import CoinMarketCapScraper
-from src.scrapers.coingecko import CoinGeckoScraper
+from src.scrapers.coingecko import FAILED_PAGES_KEY, CoinGeckoScraper
 from src.scrapers.cryptocompare import CryptoCompareScraper
 import os
+import threading
+import time
 
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self.payload
+
+class FakeMarketsClient:
+    """Serves /coins/markets pages from a synthetic ranked universe; fail_pages return HTTP 500."""
+    def __init__(self, universe_size, delay=0.0, fail_pages=()):
+        self.universe_size = universe_size
+        self.delay = delay
+        self.fail_pages = set(fail_pages)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        with self.lock:
+            self.calls.append(dict(params))
+        time.sleep(self.delay)
+        page, per_page = params["page"], params["per_page"]
+        if page in self.fail_pages:
+            return FakeResponse([], status_code=500)
+        first = (page - 1) * per_page
+        ranks = range(first + 1, min(first + per_page, self.universe_size) + 1)
+        return FakeResponse([
+            {"name": f"Coin {rank}", "symbol": f"c{rank}", "current_price": 1.0, "market_cap": 1e9 / rank,
+             "total_volume": 1e6, "price_change_percentage_24h": 0.5}
+            for rank in ranks
+        ])
+
+class FakeDetailsClient:
+    """Serves /coins/{id} payloads; ids starting with 'bad' return HTTP 404."""
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        time.sleep(self.delay)
+        coin_id = url.rsplit("/", 1)[-1]
+        if coin_id.startswith("bad"):
+            return FakeResponse({}, status_code=404)
+        return FakeResponse({
+            "name": coin_id.title(), "symbol": coin_id[:3],
+            "description": {"en": ""}, "links": {"homepage": [], "repos_url": {"github": []}, "subreddit_url": None},
+            "community_data": {"twitter_followers": 10, "reddit_subscribers": 5},
+            "developer_data": {"stars": 1, "commit_count_4_weeks": 2},
+            "sentiment_votes_up_percentage": 60.0, "sentiment_votes_down_percentage": 40.0
+        })
+
+# The live provider checks need network access; TestScrapersOffline in
+# test_stand_in.py runs the same checks against the local stand-in server
+LIVE_API_TESTS = os.getenv("LIVE_API_TESTS") == "1"
+
+@unittest.skipUnless(LIVE_API_TESTS, "set LIVE_API_TESTS=1 to query the live provider APIs")
 class TestScrapers(unittest.TestCase):
     def test_coinmarketcap_scraper(self):
         scraper = CoinMarketCapScraper(api_key=os.getenv("COINMARKETCAP_API_KEY"))
@@ -27,5 +88,44 @@ class TestScrapers(unittest.TestCase):
         self.assertGreater(len(data), 0)
         self.assertIn("symbol", data[0])
 
+class TestCoinGeckoPaging(unittest.TestCase):
+    def test_paged_fetch_merges_in_rank_order(self):
+        client = FakeMarketsClient(universe_size=10_000, delay=0.05)
+        scraper = CoinGeckoScraper(client=client)
+        data = scraper.scrape_top_coins(limit=1100)
+        self.assertEqual(len(data), 1100)
+        self.assertEqual([coin["name"] for coin in data[:2]], ["Coin 1", "Coin 2"])
+        self.assertEqual(data[-1]["name"], "Coin 1100")
+        self.assertEqual(sorted(call["page"] for call in client.calls), [1, 2, 3, 4, 5])
+        self.assertTrue(all(call["per_page"] == 250 for call in client.calls))
+
+    def test_pages_stream_as_they_arrive(self):
+        scraper = CoinGeckoScraper(client=FakeMarketsClient(universe_size=600))
+        pages = list(scraper.iter_top_coin_pages(limit=600, per_page=200))
+        self.assertEqual(sorted(page for page, _ in pages), [1, 2, 3])
+        self.assertEqual(sum(len(coins) for _, coins in pages), 600)
+
+    def test_failed_pages_are_reported(self):
+        scraper = CoinGeckoScraper(client=FakeMarketsClient(universe_size=600, fail_pages={2}))
+        data, failures = scraper.scrape_top_coins_paged(limit=600, per_page=200)
+        self.assertEqual(len(data), 400)
+        self.assertEqual(data[200]["name"], "Coin 401")
+        self.assertEqual(failures, {2: "HTTP 500"})
+
+        table = CoinGeckoScraper(client=FakeMarketsClient(universe_size=1000, fail_pages={2, 4})).scrape_top_coins_table(limit=1000)
+        self.assertEqual(table.num_rows, 500)
+        self.assertEqual(table.schema.metadata, {FAILED_PAGES_KEY: b"2,4"})
+
+class TestCoinGeckoBulkDetails(unittest.TestCase):
+    def test_bulk_details_concurrent_with_failures(self):
+        scraper = CoinGeckoScraper(client=FakeDetailsClient(delay=0.05))
+        coin_ids = [f"coin{i}" for i in range(40)] + ["bad-coin", "coin0"]
+        start = time.monotonic()
+        details, failures = scraper.get_coin_details_bulk(coin_ids, max_workers=20)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(list(details["coin_id"]), [f"coin{i}" for i in range(40)])
+        self.assertIn("github_stars", details.columns)
+        self.assertEqual(list(failures), ["bad-coin"])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.analysis.market_analyzer import MarketAnalyzer
+from src.analysis.sentiment import MentionIndex, SentimentCache, SentimentScorer
+from src.scrapers.blog_scrapers import scrape_kraken_blog
+from src.storage.article_store import ArticleStore
+from tests.stand_in_server import BLOG_POSTS
+
+class TestSentimentScorer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = SentimentCache(os.path.join(self.tmp.name, "sentiment.sqlite"))
+        self.scorer = SentimentScorer(cache=self.cache)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scores_and_mentions(self):
+        results = self.scorer.score_texts([text for _, _, _, text in BLOG_POSTS] + [""])
+        by_slug = {slug: result for (_, slug, _, _), result in zip(BLOG_POSTS, results)}
+
+        self.assertGreater(by_slug["bitcoin-etf-inflows"]["coins"]["BTC"]["sentiment"], 0.8)
+        self.assertLess(by_slug["solana-outage-report"]["coins"]["SOL"]["sentiment"], 0.2)
+        self.assertLess(by_slug["dogecoin-meme-rally"]["coins"]["DOGE"]["sentiment"], 0.5)
+        self.assertEqual(set(by_slug["what-is-polygon"]["coins"]), {"MATIC", "ETH"})
+        self.assertEqual(by_slug["what-is-polygon"]["coins"]["MATIC"]["mentions"], 2)
+        self.assertEqual(results[-1], {"sentiment": 0.5, "coins": {}})
+
+    def test_negation_and_phrases(self):
+        result, = self.scorer.score_texts(["Bitcoin Cash is not bullish. BTC looks strong. The sol rises."])
+        self.assertLess(result["coins"]["BCH"]["sentiment"], 0.5)
+        self.assertGreater(result["coins"]["BTC"]["sentiment"], 0.5)
+        # Lower-case "sol" is a word, not the Solana ticker
+        self.assertEqual(set(result["coins"]), {"BCH", "BTC"})
+
+    def test_batches_match_single_articles(self):
+        texts = [text for _, _, _, text in BLOG_POSTS]
+        batched = SentimentScorer(batch_size=3).score_texts(texts)
+        self.assertEqual(batched, [self.scorer.score_texts([text])[0] for text in texts])
+
+    def test_results_are_cached_by_article_hash(self):
+        articles = [{"text": text, "source": "Kraken Blog"} for _, _, _, text in BLOG_POSTS]
+        first = self.scorer.score_articles(articles)
+
+        calls = []
+        score_texts = self.scorer.score_texts
+        self.scorer.score_texts = lambda texts: calls.append(texts) or score_texts(texts)
+        self.assertEqual(self.scorer.score_articles(articles), first)
+        self.assertEqual(calls, [])
+
+        # A different coin universe is a different model and is not served from the cache
+        other = SentimentScorer(mentions=MentionIndex([("Bitcoin", "BTC", ())]), cache=self.cache)
+        self.assertEqual(set(other.score_articles(articles[:1])[0]["coins"]), {"BTC"})
+        self.assertNotEqual(other.model, self.scorer.model)
+
+    def test_blog_rows_feed_recommendations(self):
+        store = ArticleStore(os.path.join(self.tmp.name, "articles.sqlite"))
+        for _, slug, title, text in BLOG_POSTS:
+            store.save({"url": f"https://blog.kraken.com/{slug}", "source": "Kraken Blog", "title": title, "text": text})
+
+        rows = scrape_kraken_blog(store, self.scorer)
+        self.assertEqual({row["source"] for row in rows}, {"Kraken Blog"})
+        solana = next(row for row in rows if row["symbol"] == "SOL")
+        self.assertEqual((solana["name"], solana["trend"]), ("Solana", "very bearish"))
+
+        market = pd.DataFrame({"name": ["Bitcoin", "Solana"], "symbol": ["BTC", "SOL"], "score": [1.0, 1.0]})
+        factor = MarketAnalyzer()._sentiment_factor(market, pd.DataFrame(rows))
+        self.assertGreater(factor[0], 1.0)
+        self.assertLess(factor[1], 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from src.scrapers.columnar import concat_market_tables, rows_to_table
+from src.storage.snapshot_store import SnapshotStore
+
+DAY = 86400
+START = datetime(2024, 6, 1, 12, tzinfo=timezone.utc).timestamp()
+
+def snapshot(day, source, symbols):
+    rows = [{"name": f"Coin {s}", "symbol": s, "price": 100.0 * day + i, "market_cap": 1e9}
+            for i, s in enumerate(symbols)]
+    return rows_to_table(rows, source=source, fetched_at=START + day * DAY)
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(os.path.join(self.tmp.name, "snapshots"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_empty_store(self):
+        self.assertEqual(self.store.query(symbols=["BTC"]).num_rows, 0)
+        self.assertEqual(self.store.latest().num_rows, 0)
+
+    def test_append_partitions_and_encoding(self):
+        written = self.store.append(concat_market_tables([
+            snapshot(0, "CoinGecko", ["ETH", "BTC"]), snapshot(0, "Kraken Blog / News", ["BTC"]),
+        ]))
+        self.assertEqual(written, 3)
+        self.store.append(snapshot(0, "CoinGecko", ["BTC"]))
+
+        files = sorted(os.path.relpath(path, self.store.root) for path in self.store.dataset().files)
+        self.assertEqual(len(files), 3)
+        self.assertTrue(all(path.startswith("date=2024-06-01" + os.sep) for path in files))
+        self.assertEqual(sum("source=CoinGecko" in path for path in files), 2)
+
+        # Files hold dictionary-encoded names/symbols sorted by symbol; source is the directory
+        path = next(path for path in self.store.dataset().files if "CoinGecko" in path)
+        stored = pq.read_table(path, partitioning=None)
+        self.assertNotIn("source", stored.column_names)
+        self.assertTrue(pa.types.is_dictionary(stored.schema.field("symbol").type))
+        self.assertIn("RLE_DICTIONARY", pq.ParquetFile(path).metadata.row_group(0).column(1).encodings)
+
+        table = self.store.query(sources=["Kraken Blog / News"])
+        self.assertEqual(table.column("source").to_pylist(), ["Kraken Blog / News"])
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("source").type))
+
+    def test_query_filters_and_prunes(self):
+        for day in range(5):
+            self.store.append(concat_market_tables([
+                snapshot(day, "CoinGecko", ["BTC", "ETH", "SOL"]), snapshot(day, "CryptoCompare", ["BTC", "LINK"]),
+            ]))
+
+        table = self.store.query(symbols=["btc", "LINK"], start=START + DAY, end=START + 3 * DAY)
+        self.assertEqual(table.num_rows, 6)
+        self.assertEqual(set(table.column("symbol").to_pylist()), {"BTC", "LINK"})
+        self.assertEqual(table.column("price").to_pylist()[0], 100.0)
+
+        # The time range only touches the matching date directories
+        dataset = self.store.dataset()
+        condition = (ds.field("date") >= "2024-06-02") & (ds.field("date") <= "2024-06-04")
+        self.assertEqual(len(list(dataset.get_fragments(filter=condition))), 6)
+
+        frame = self.store.query(symbols=["SOL"], sources=["CoinGecko"], columns=["symbol", "price"]).to_pandas()
+        self.assertEqual(sorted(frame["price"]), [2.0, 102.0, 202.0, 302.0, 402.0])
+
+    def test_latest_returns_newest_fetch_per_source(self):
+        self.store.append(snapshot(0, "CoinGecko", ["BTC", "ETH"]))
+        self.store.append(snapshot(0.5, "CoinGecko", ["BTC"]))
+        self.store.append(snapshot(-3, "CryptoCompare", ["LINK"]))
+
+        latest = self.store.latest().to_pandas()
+        self.assertEqual(sorted(zip(latest["source"], latest["symbol"])), [("CoinGecko", "BTC"), ("CryptoCompare", "LINK")])
+        self.assertEqual(self.store.latest(sources=["CryptoCompare"]).num_rows, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from functools import partial
+from unittest import mock
+from src.scrapers import http_client
+from src.scrapers.coingecko import CoinGeckoScraper
+from src.scrapers.coinmarketcap import CoinMarketCapScraper
+from src.scrapers.cryptocompare import CryptoCompareScraper
+from src.scrapers.http_client import HttpClient
+from src.scrapers.rate_limiter import RateLimiter, RateLimitTimeout
+from src.scrapers.response_cache import ResponseCache
+from tests.stand_in_server import StandInServer
+
+class TestScrapersOffline(unittest.TestCase):
+    """The live TestScrapers checks, run against the local stand-in server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer().start()
+        cls.client = HttpClient(cache=None, rate_limiter=None, backoff_factor=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+        cls.server.stop()
+
+    def scraper(self, cls, **kwargs):
+        scraper = cls(client=self.client, **kwargs)
+        self.server.point_scrapers(scraper)
+        return scraper
+
+    def test_coinmarketcap_api(self):
+        scraper = self.scraper(CoinMarketCapScraper, api_key="stand-in")
+        data = scraper.scrape_top_coins(limit=5)
+        self.assertEqual([coin["symbol"] for coin in data], ["BTC", "ETH", "USDT", "BNB", "SOL"])
+        streamed = scraper._get_data_from_api(limit=300, stream=True)
+        self.assertEqual(len(streamed), 300)
+        self.assertEqual(streamed[:5], data)
+
+    def test_coinmarketcap_web(self):
+        data = self.scraper(CoinMarketCapScraper).scrape_top_coins(limit=5)
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data[0]["market_cap"], 1.27e12)
+
+    def test_coingecko(self):
+        scraper = self.scraper(CoinGeckoScraper)
+        data = scraper.scrape_top_coins(limit=5)
+        self.assertEqual(data[0]["price"], 67123.45)
+        self.assertEqual(len(scraper.scrape_top_coins(limit=300)), 300)
+        self.assertEqual(scraper._scrape_from_web(limit=5)[0]["name"], "Bitcoin")
+
+    def test_cryptocompare(self):
+        data = self.scraper(CryptoCompareScraper).get_top_coins(limit=5)
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data[0]["symbol"], "BTC")
+
+class TestFaultInjection(unittest.TestCase):
+    def test_retries_absorb_server_errors(self):
+        with StandInServer(error_rate=0.5, seed=1) as server:
+            client = HttpClient(cache=None, rate_limiter=None, backoff_factor=0, max_retries=10)
+            scraper = CryptoCompareScraper(client=client)
+            server.point_scrapers(scraper)
+            for _ in range(10):
+                self.assertEqual(len(scraper.get_top_coins(limit=3)), 3)
+            client.close()
+            self.assertGreater(server.stats[500], 0)
+
+    def test_429_blocks_the_provider_budget(self):
+        with tempfile.TemporaryDirectory() as state_dir, \
+                StandInServer(rate_limit_rate=1.0, retry_after=60) as server:
+            limiter = RateLimiter(state_path=os.path.join(state_dir, "limits.sqlite"), max_wait=0)
+            client = HttpClient(cache=None, rate_limiter=limiter)
+
+            # The first 429 blocks the budget instead of being retried in the session
+            with self.assertRaises(RateLimitTimeout):
+                client.get(f"{server.url}/api/v3/coins/markets", provider="coingecko")
+            with self.assertRaises(RateLimitTimeout):
+                limiter.acquire("coingecko")
+            self.assertEqual(server.stats[429], 1)
+            client.close()
+
+    def test_429_retries_wait_for_the_budget(self):
+        with tempfile.TemporaryDirectory() as state_dir, \
+                StandInServer(rate_limit_rate=1.0, retry_after=1) as server:
+            limiter = RateLimiter(state_path=os.path.join(state_dir, "limits.sqlite"),
+                                  limits={"coingecko": {"free": (5, 50.0)}})
+            client = HttpClient(cache=None, rate_limiter=limiter, backoff_factor=0)
+            response = client.get(f"{server.url}/api/v3/coins/markets", provider="coingecko")
+            self.assertEqual(response.status_code, 429)
+            # Default policy: three retries, each after a token and the Retry-After pause
+            self.assertEqual(server.stats[429], 4)
+            client.close()
+
+    def test_untagged_requests_retry_429(self):
+        with tempfile.TemporaryDirectory() as state_dir, \
+                StandInServer(rate_limit_first=1, retry_after=1) as server, \
+                mock.patch.object(http_client, "_shared_client", None), \
+                mock.patch.object(http_client, "RateLimiter",
+                                  partial(RateLimiter, state_path=os.path.join(state_dir, "limits.sqlite"))), \
+                mock.patch.object(http_client, "ResponseCache",
+                                  partial(ResponseCache, path=os.path.join(state_dir, "cache.sqlite"))):
+            client = http_client.get_http_client()
+            self.assertIsNotNone(client.rate_limiter)
+            # Web fallbacks are not tagged with a provider; urllib3 still waits out the 429
+            response = client.get(f"{server.url}/en/coins")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual((server.stats[429], server.stats["requests"]), (1, 2))
+            client.close()
+
+if __name__ == "__main__":
+    unittest.main()
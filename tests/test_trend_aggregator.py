@@ -0,0 +1,85 @@
+# tests/test_trend_aggregator.py
+# python -m unittest discover tests
+import unittest
+import numpy as np
+import pandas as pd
+from src.analysis.market_analyzer import MarketAnalyzer
+from src.analysis.trend_aggregator import TrendAggregator
+from tests.test_analysis import random_market
+
+class TestTrendAggregator(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = MarketAnalyzer()
+
+    def assertMatchesFullScan(self, aggregator, data):
+        expected = self.analyzer.analyze_market_trends(data)
+        summary = aggregator.summary()
+        for key in ("avg_change_24h", "median_change_24h", "positive_ratio"):
+            self.assertAlmostEqual(summary[key], expected[key], places=9, msg=key)
+        for key in ("status", "positive_performers", "negative_performers", "neutral_performers",
+                    "market_sentiment", "top_gainers", "top_losers"):
+            self.assertEqual(summary[key], expected[key], msg=key)
+
+    def test_updates_match_full_scan(self):
+        rng = np.random.default_rng(3)
+        data = random_market(60, seed=3)
+        # Ties, zeros and a second source for some symbols
+        data.loc[5:9, "change_24h"] = 4.0
+        data.loc[10:12, "change_24h"] = 0.0
+        data = pd.concat([data, data.iloc[:10].assign(change_24h=data["change_24h"].iloc[:10] + 1)], ignore_index=True)
+
+        aggregator = TrendAggregator.from_frame(data)
+        self.assertMatchesFullScan(aggregator, data)
+
+        # Enough quote rounds to force several heap rebuilds
+        for _ in range(300):
+            symbols = rng.choice(data["symbol"].unique(), size=3, replace=False)
+            quotes = {symbol: {"change_24h": float(rng.choice([rng.normal(0, 8), 4.0, 0.0]))} for symbol in symbols}
+            aggregator.apply_quotes(quotes)
+            data = self.analyzer.apply_live_quotes(data, quotes)
+        self.assertMatchesFullScan(aggregator, data)
+
+        # Rows can also be removed or cleared
+        aggregator.remove(0)
+        aggregator.update(1, None)
+        data = data.drop(index=0)
+        data.loc[1, "change_24h"] = np.nan
+        self.assertMatchesFullScan(aggregator, data)
+        self.assertEqual(len(aggregator), len(data))
+
+    def test_heaps_stay_bounded_when_top_gainers_update(self):
+        rng = np.random.default_rng(5)
+        data = random_market(1000, seed=5)
+        hot = list(data["symbol"].iloc[:3])
+        aggregator = TrendAggregator.from_frame(data)
+
+        # Reading the summary drops the hot rows' stale gainer entries as they
+        # surface, but every update still leaves one in the losers and median heaps
+        latest = {}
+        for _ in range(20_000):
+            symbol = hot[rng.integers(3)]
+            latest[symbol] = {"change_24h": float(rng.uniform(100, 200))}
+            aggregator.apply_quotes({symbol: latest[symbol]})
+            aggregator.summary()
+        data = self.analyzer.apply_live_quotes(data, latest)
+
+        bound = 2 * aggregator._count + 64
+        self.assertLessEqual(len(aggregator._gainers), bound)
+        self.assertLessEqual(len(aggregator._losers), bound)
+        self.assertLessEqual(len(aggregator._lower) + len(aggregator._upper), bound)
+        self.assertMatchesFullScan(aggregator, data)
+
+    def test_quotes_skip_rows_without_change(self):
+        data = pd.DataFrame([
+            {"name": "Bitcoin", "symbol": "BTC", "change_24h": 2.0},
+            {"name": "Bitcoin", "symbol": "BTC", "change_24h": np.nan, "sentiment": 0.8},
+            {"name": "Ethereum", "symbol": "ETH", "change_24h": -1.0},
+        ])
+        aggregator = TrendAggregator.from_frame(data)
+        self.assertEqual(aggregator.apply_deltas([{"symbol": "BTC", "change_24h": -3.0, "version": 1}]), 1)
+        self.assertEqual(aggregator.median(), -2.0)
+        self.assertEqual(aggregator.top(1)[0]["symbol"], "ETH")
+        self.assertEqual(TrendAggregator().summary()["status"], "error")
+
+if __name__ == "__main__":
+    unittest.main()